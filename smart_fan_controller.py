@@ -3,29 +3,104 @@ import sys
 import logging
 import json
 import math
+import random
 import time
 import asyncio
 import threading
-import queue
-import copy
 import signal
 import atexit
 import socket
-from collections import deque
+import struct
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from functools import partial
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 __version__ = "1.3.0"
-from openant.easy.node import Node
-from openant.devices import ANTPLUS_NETWORK_KEY
-from openant.devices.power_meter import PowerMeter, PowerData
-from openant.devices.heart_rate import HeartRate, HeartRateData
-from bleak import BleakClient, BleakScanner
 
 logger = logging.getLogger('smart_fan_controller')
 
+# Az openant és bleak csomagok lusta betöltése: a modul importja nem húzza be
+# őket, csak az első tényleges használat (_load_antplus / _load_bleak).
+Node = None
+ANTPLUS_NETWORK_KEY = None
+PowerMeter = None
+PowerData = None
+HeartRate = None
+HeartRateData = None
+BleakClient = None
+BleakScanner = None
+
+
+def _load_antplus():
+    """Betölti az openant osztályokat a modul szintű nevekbe (első híváskor).
+
+    A már beállított (pl. tesztben lecserélt) neveket nem írja felül.
+    """
+    global Node, ANTPLUS_NETWORK_KEY, PowerMeter, PowerData, HeartRate, HeartRateData
+    if None not in (Node, ANTPLUS_NETWORK_KEY, PowerMeter, PowerData, HeartRate, HeartRateData):
+        return
+    try:
+        from openant.easy.node import Node as _Node
+        from openant.devices import ANTPLUS_NETWORK_KEY as _NETWORK_KEY
+        from openant.devices.power_meter import PowerMeter as _PowerMeter, PowerData as _PowerData
+        from openant.devices.heart_rate import HeartRate as _HeartRate, HeartRateData as _HeartRateData
+    except ImportError as e:
+        logger.error("Az openant csomag nem elérhető (pip install openant): %s", e)
+        raise
+    if Node is None:
+        Node = _Node
+    if ANTPLUS_NETWORK_KEY is None:
+        ANTPLUS_NETWORK_KEY = _NETWORK_KEY
+    if PowerMeter is None:
+        PowerMeter = _PowerMeter
+    if PowerData is None:
+        PowerData = _PowerData
+    if HeartRate is None:
+        HeartRate = _HeartRate
+    if HeartRateData is None:
+        HeartRateData = _HeartRateData
+
+
+def _load_bleak():
+    """Betölti a bleak osztályokat a modul szintű nevekbe (első híváskor).
+
+    A már beállított (pl. tesztben lecserélt) neveket nem írja felül.
+    """
+    global BleakClient, BleakScanner
+    if BleakClient is not None and BleakScanner is not None:
+        return
+    try:
+        from bleak import BleakClient as _BleakClient, BleakScanner as _BleakScanner
+    except ImportError as e:
+        logger.error("A bleak csomag nem elérhető (pip install bleak): %s", e)
+        raise
+    if BleakClient is None:
+        BleakClient = _BleakClient
+    if BleakScanner is None:
+        BleakScanner = _BleakScanner
+
+# Érvényes ventilátor szintek (LEVEL:0 … LEVEL:3)
+_VALID_LEVELS = frozenset((0, 1, 2, 3))
+
+# Python 3.11+: az asyncio.timeout() a futó taskon belül időzít, nem csomagolja
+# külön Task-ba a korutint (mint az asyncio.wait_for); régebbi Pythonon None.
+_asyncio_timeout = getattr(asyncio, 'timeout', None)
+
+# BLE notification mezők: előre fordított struct formátumok, az unpack_from
+# szeletelés (ideiglenes bytes) nélkül olvas a megadott eltolásról.
+_CPM_POWER = struct.Struct('<h')   # Cycling Power Measurement: int16 LE teljesítmény
+_HRM_UINT16 = struct.Struct('<H')  # Heart Rate Measurement: uint16 LE HR érték
+
 # ============================================================
 # Alapértelmezett beállítások
 # ============================================================
-# FONTOS: NE módosítsd közvetlenül! Mindig copy.deepcopy()-val használd.
+# FONTOS: NE módosítsd közvetlenül! Módosítható példányt a default_settings() ad.
 DEFAULT_SETTINGS = {
     "ftp": 180,                    # Funkcionális küszöbteljesítmény wattban (100–500)
     "min_watt": 0,                 # Minimális érvényes teljesítmény (0 vagy több)
@@ -83,10 +158,272 @@ DEFAULT_SETTINGS = {
     }
 }
 
+# A DEFAULT_SETTINGS tömör JSON alakja – a másolás így a C-ben implementált
+# json parseren megy át, ami jóval gyorsabb a copy.deepcopy()-nál.
+_DEFAULT_SETTINGS_JSON = json.dumps(DEFAULT_SETTINGS, separators=(",", ":"))
+
+
+def _freeze(d):
+    """Rekurzívan csak olvasható MappingProxyType nézetté alakít egy dict-et."""
+    return MappingProxyType({k: _freeze(v) if isinstance(v, dict) else v for k, v in d.items()})
+
+
+# Módosítási kísérlet azonnal TypeError-t dob; olvasáshoz nem kell másolat.
+DEFAULT_SETTINGS = _freeze(DEFAULT_SETTINGS)
+
+
+# A beállításfájl (bájtok) parse-olása: orjson, ha telepítve van, különben a
+# stdlib json. Az orjson.JSONDecodeError a json.JSONDecodeError leszármazottja.
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def default_settings():
+    """Visszaadja az alapértelmezett beállítások egy független, módosítható másolatát.
+
+    Visszaad:
+        dict: A DEFAULT_SETTINGS mély másolata.
+    """
+    return _json_loads(_DEFAULT_SETTINGS_JSON)
+
+
+# ============================================================
+# Beállítás-séma
+# ============================================================
+# Mezőnkénti szabályok a load_and_validate_settings számára. Kulcsok:
+#   type:  'number' (int/float, egészre kerekítve), 'integer', 'bool',
+#          'str' (nem üres), 'optional_str' (None vagy nem üres str),
+#          'enum' (values), 'pin' (PIN kód, lásd _check_setting)
+#   min / max:       zárt tartomány határai
+#   exclusive_min:   nyílt alsó határ
+#   hint:            a hibaüzenet zárójeles része (None = nincs)
+#   show_value:      False esetén a hibaüzenet nem írja ki az értéket
+#   label:           a hibaüzenetben megjelenő név (alapértelmezett: a kulcs)
+SETTINGS_SCHEMA = {
+    'ftp': {'type': 'number', 'min': 100, 'max': 500, 'hint': "100-500 között kell lennie"},
+    'min_watt': {'type': 'number', 'min': 0, 'hint': "0 vagy nagyobb kell legyen"},
+    'max_watt': {'type': 'number', 'exclusive_min': 0, 'hint': "0-nál nagyobb kell legyen"},
+    'cooldown_seconds': {'type': 'number', 'min': 0, 'max': 300, 'hint': "0-300 között kell lennie"},
+    'buffer_seconds': {'type': 'number', 'min': 1, 'max': 10, 'hint': "1-10 között kell lennie"},
+    'minimum_samples': {'type': 'number', 'exclusive_min': 0, 'hint': "0-nál nagyobb kell legyen"},
+    'dropout_timeout': {'type': 'number', 'exclusive_min': 0, 'hint': "0-nál nagyobb kell legyen"},
+    'zero_power_immediate': {'type': 'bool', 'hint': "true vagy false kell legyen"},
+}
+
+SETTINGS_SECTION_SCHEMAS = {
+    'zone_thresholds': {
+        'z1_max_percent': {'type': 'number', 'min': 1, 'max': 100, 'hint': "1-100 között kell lennie"},
+        'z2_max_percent': {'type': 'number', 'min': 1, 'max': 100, 'hint': "1-100 között kell lennie"},
+    },
+    'ble': {
+        'device_name': {'type': 'str', 'hint': None, 'show_value': False},
+        'scan_timeout': {'type': 'number', 'min': 1, 'max': 60, 'hint': "1-60 között kell lennie"},
+        'connection_timeout': {'type': 'number', 'min': 1, 'max': 60, 'hint': "1-60 között kell lennie"},
+        'reconnect_interval': {'type': 'number', 'min': 1, 'max': 60, 'hint': "1-60 között kell lennie"},
+        'max_retries': {'type': 'number', 'min': 1, 'max': 100, 'hint': "1-100 között kell lennie"},
+        'command_timeout': {'type': 'number', 'min': 1, 'max': 30, 'hint': "1-30 között kell lennie"},
+        'service_uuid': {'type': 'str', 'hint': None, 'show_value': False},
+        'characteristic_uuid': {'type': 'str', 'hint': None, 'show_value': False},
+        'pin_code': {'type': 'pin', 'hint': "0-999999 közötti egész szám, számjegyekből álló szöveg, vagy null kell legyen"},
+    },
+    'data_source': {
+        'power_source': {'type': 'enum', 'values': ('antplus', 'ble', 'zwift_udp'), 'hint': "'antplus', 'ble' vagy 'zwift_udp' kell legyen"},
+        'hr_source': {'type': 'enum', 'values': ('antplus', 'ble', 'zwift_udp'), 'hint': "'antplus', 'ble' vagy 'zwift_udp' kell legyen"},
+        'ble_power_device_name': {'type': 'optional_str', 'hint': None, 'show_value': False},
+        'ble_hr_device_name': {'type': 'optional_str', 'hint': None, 'show_value': False},
+        'ble_power_scan_timeout': {'type': 'integer', 'min': 1, 'max': 60, 'hint': "1-60 között kell lennie"},
+        'ble_power_reconnect_interval': {'type': 'integer', 'min': 1, 'max': 60, 'hint': "1-60 között kell lennie"},
+        'ble_power_max_retries': {'type': 'integer', 'min': 1, 'max': 100, 'hint': "1-100 között kell lennie"},
+        'ble_hr_scan_timeout': {'type': 'integer', 'min': 1, 'max': 60, 'hint': "1-60 között kell lennie"},
+        'ble_hr_reconnect_interval': {'type': 'integer', 'min': 1, 'max': 60, 'hint': "1-60 között kell lennie"},
+        'ble_hr_max_retries': {'type': 'integer', 'min': 1, 'max': 100, 'hint': "1-100 között kell lennie"},
+        'zwift_udp_port': {'type': 'integer', 'min': 1024, 'max': 65535, 'hint': "1024-65535 közötti egész szám kell legyen"},
+        'zwift_udp_host': {'type': 'str', 'hint': "nem üres szöveg kell legyen"},
+        'zwift_udp_buffer_seconds': {'type': 'integer', 'min': 1, 'max': 60, 'hint': "1-60 közötti egész szám kell legyen"},
+        'zwift_udp_minimum_samples': {'type': 'integer', 'min': 1, 'max': 20, 'hint': "1-20 közötti egész szám kell legyen"},
+        'zwift_udp_dropout_timeout': {'type': 'integer', 'min': 1, 'max': 120, 'hint': "1-120 közötti egész szám kell legyen"},
+    },
+    'heart_rate_zones': {
+        'enabled': {'type': 'bool', 'label': 'heart_rate_zones.enabled', 'hint': "true vagy false kell legyen", 'show_value': False},
+        'max_hr': {'type': 'integer', 'min': 100, 'max': 220, 'hint': "100-220 közötti egész szám kell legyen"},
+        'resting_hr': {'type': 'integer', 'min': 30, 'max': 100, 'hint': "30-100 közötti egész szám kell legyen"},
+        'zone_mode': {'type': 'enum', 'values': ('hr_only', 'higher_wins', 'power_only'), 'hint': "'hr_only', 'higher_wins' vagy 'power_only' kell legyen"},
+        'z1_max_percent': {'type': 'integer', 'min': 1, 'max': 100, 'label': 'heart_rate_zones.z1_max_percent', 'hint': "1-100 között kell lennie"},
+        'z2_max_percent': {'type': 'integer', 'min': 1, 'max': 100, 'label': 'heart_rate_zones.z2_max_percent', 'hint': "1-100 között kell lennie"},
+    },
+}
+
+_KNOWN_SETTINGS_KEYS = frozenset(SETTINGS_SCHEMA) | frozenset(SETTINGS_SECTION_SCHEMAS)
+_KNOWN_DATA_SOURCE_KEYS = frozenset(SETTINGS_SECTION_SCHEMAS['data_source'])
+
+
+def _is_real_number(value, integer_only=False):
+    """Igaz, ha az érték valódi (véges) szám.
+
+    A type() azonosság-ellenőrzés kizárja a bool-t (type(True) is bool, nem int),
+    és olcsóbb az isinstance tuple-bejárásánál. NaN/Inf float nem fogadható el.
+
+    Paraméterek:
+        value: Az ellenőrizendő érték.
+        integer_only (bool): Ha True, csak int fogadható el.
+
+    Visszaad:
+        bool: True, ha int, vagy (integer_only=False esetén) véges float.
+    """
+    t = type(value)
+    if t is int:
+        return True
+    return t is float and not integer_only and math.isfinite(value)
+
+
+def _check_setting(value, rule):
+    """Egyetlen beállítás érték ellenőrzése és normalizálása a séma szabálya alapján.
+
+    Paraméterek:
+        value: A fájlból betöltött érték.
+        rule (dict): A mező szabálya (SETTINGS_SCHEMA / SETTINGS_SECTION_SCHEMAS).
+
+    Visszaad:
+        tuple: (érvényes-e, normalizált érték).
+    """
+    kind = rule['type']
+    if kind == 'number' or kind == 'integer':
+        if not _is_real_number(value, kind == 'integer'):
+            return False, None
+        if 'min' in rule and value < rule['min']:
+            return False, None
+        if 'max' in rule and value > rule['max']:
+            return False, None
+        if 'exclusive_min' in rule and value <= rule['exclusive_min']:
+            return False, None
+        return True, int(value)
+    if kind == 'bool':
+        return isinstance(value, bool), value
+    if kind == 'str':
+        return isinstance(value, str) and len(value) > 0, value
+    if kind == 'optional_str':
+        return value is None or (isinstance(value, str) and len(value) > 0), value
+    if kind == 'enum':
+        return value in rule['values'], value
+    if kind == 'pin':
+        if value is None:
+            return True, None
+        if type(value) is int and 0 <= value <= 999999:
+            return True, str(value)
+        if isinstance(value, str) and 0 < len(value) <= 20 and value.isdigit():
+            return True, value
+        return False, None
+    raise ValueError(f"Ismeretlen séma típus: {kind}")
+
+
+def _apply_settings_rules(source, target, rules):
+    """A source dict sémában szereplő mezőit ellenőrzi és átmásolja a target dict-be.
+
+    Érvénytelen mezőnél figyelmeztetést ír ki és a target-ben lévő
+    (alapértelmezett) értéket hagyja meg. Az elfogadott értékek a végén
+    egyetlen update() hívással kerülnek a target-be.
+
+    Paraméterek:
+        source (dict): A fájlból betöltött (al)beállítások.
+        target (dict): Az alapértelmezettekkel feltöltött cél dict.
+        rules (dict): Mezőnév → szabály.
+
+    Visszaad:
+        bool: True, ha minden jelen lévő mező érvényes volt.
+    """
+    all_valid = True
+    accepted = {}
+    for key, rule in rules.items():
+        if key not in source:
+            continue
+        value = source[key]
+        valid, normalized = _check_setting(value, rule)
+        if valid:
+            accepted[key] = normalized
+        else:
+            _warn_invalid_setting(key, value, rule)
+            all_valid = False
+    target.update(accepted)
+    return all_valid
+
+
+def _warn_invalid_setting(key, value, rule):
+    """Kiírja az érvénytelen beállítás figyelmeztetését.
+
+    Külön függvényben van, hogy az érvényes (gyakori) ágon ne kelljen
+    a szöveg összeállításával foglalkozni; a tényleges formázást a logger
+    csak engedélyezett WARNING szint esetén végzi el.
+
+    Paraméterek:
+        key (str): A mező neve.
+        value: A fájlban talált (érvénytelen) érték.
+        rule (dict): A mezőhöz tartozó szabály.
+    """
+    fmt = "Érvénytelen '%s' érték"
+    args = [rule.get('label', key)]
+    if rule.get('show_value', True):
+        fmt += ": %s"
+        args.append(value)
+    if rule['hint'] is not None:
+        fmt += " (%s)"
+        args.append(rule['hint'])
+    logger.warning(fmt, *args)
+
 
 # ============================================================
 # BLEController
 # ============================================================
+@dataclass(frozen=True)
+class BLEConfig:
+    """A BLEController beállításai, egyszer kiolvasva a settings dict-ből.
+
+    Csak olvasható; a mezők elérése attribútum elérés, nem dict keresés.
+
+    Attribútumok:
+        device_name (str): A keresett BLE eszköz neve.
+        scan_timeout (float): Keresési időkorlát másodpercben.
+        connection_timeout (float): Csatlakozási időkorlát másodpercben.
+        reconnect_interval (float): Várakozás két újracsatlakozás között.
+        max_retries (int): Újracsatlakozási kísérletek maximális száma.
+        command_timeout (float): Parancsküldési időkorlát másodpercben.
+        service_uuid (str): A BLE szolgáltatás UUID-ja.
+        characteristic_uuid (str): A parancs karakterisztika UUID-ja.
+        pin_code (str|int|None): Opcionális PIN kód az autentikációhoz.
+    """
+
+    device_name: str
+    scan_timeout: float
+    connection_timeout: float
+    reconnect_interval: float
+    max_retries: int
+    command_timeout: float
+    service_uuid: str
+    characteristic_uuid: str
+    pin_code: object = None
+
+    @classmethod
+    def from_dict(cls, settings):
+        """BLEConfig létrehozása a teljes beállítások dict 'ble' részéből.
+
+        Paraméterek:
+            settings (dict): A teljes beállítások dict.
+
+        Visszaad:
+            BLEConfig: Az új konfigurációs objektum.
+        """
+        ble = settings['ble']
+        return cls(
+            device_name=ble['device_name'],
+            scan_timeout=ble['scan_timeout'],
+            connection_timeout=ble['connection_timeout'],
+            reconnect_interval=ble['reconnect_interval'],
+            max_retries=ble['max_retries'],
+            command_timeout=ble['command_timeout'],
+            service_uuid=ble['service_uuid'],
+            characteristic_uuid=ble['characteristic_uuid'],
+            pin_code=ble.get('pin_code', None),
+        )
+
+
 class BLEController:
     """BLE (Bluetooth Low Energy) kapcsolat kezelője az ESP32 ventilátor vezérlőhöz.
 
@@ -96,48 +433,70 @@ class BLEController:
     a kapcsolat felépítése után (AUTH:<pin_code> üzenet a GATT karakterisztikára).
 
     Attribútumok:
-        device_name (str): A keresett BLE eszköz neve.
-        command_queue (queue.Queue): A BLE parancsok várakozási sora (max 1 elem).
+        cfg (BLEConfig): A BLE beállítások (eszköznév, időkorlátok, UUID-k, PIN).
+        _pending_level (int|None): A legutóbb kért, még el nem küldött zóna szint
+            (egyelemes "slot": mindig csak a legfrissebb érték számít).
         running (bool): True, ha a háttérszál fut.
         is_connected (bool): True, ha a BLE kapcsolat aktív.
+
+    Az állapotmezők (is_connected, client, last_sent_command, auth_failed,
+    retry_*) egyszerű értékadással módosulnak, zár nélkül: egy attribútum
+    írása/olvasása CPython alatt a GIL miatt atomi, és egyik olvasó sem
+    igényli több mező együttes, konzisztens pillanatképét.
     """
 
-    QUEUE_POLL_TIMEOUT = 0.5
     DISCONNECT_TIMEOUT = 5.0
     RETRY_RESET_SECONDS = 30
     STOP_JOIN_TIMEOUT = 5
+    RECONNECT_BACKOFF_MAX = 30.0
 
     def __init__(self, settings):
         """Inicializálja a BLEController-t a megadott beállításokkal.
 
         Paraméterek:
-            settings (dict): A teljes beállítások dict, amelyből a 'ble' kulcs
-                             alatt lévő értékeket olvassa ki.
+            settings (dict|BLEConfig): A teljes beállítások dict (ebből a 'ble'
+                             kulcs alatti értékeket olvassa ki), vagy egy kész
+                             BLEConfig objektum.
         """
-        self.device_name = settings['ble']['device_name']
-        self.scan_timeout = settings['ble']['scan_timeout']
-        self.connection_timeout = settings['ble']['connection_timeout']
-        self.reconnect_interval = settings['ble']['reconnect_interval']
-        self.max_retries = settings['ble']['max_retries']
-        self.command_timeout = settings['ble']['command_timeout']
-        self.service_uuid = settings['ble']['service_uuid']
-        self.characteristic_uuid = settings['ble']['characteristic_uuid']
-        self.pin_code = settings['ble'].get('pin_code', None)
+        if isinstance(settings, BLEConfig):
+            self.cfg = settings
+        else:
+            self.cfg = BLEConfig.from_dict(settings)
+
+        # A 4 lehetséges parancs előre elkészítve – küldéskor csak indexelünk
+        self._cmd_strs = tuple(f"LEVEL:{i}" for i in range(4))
+        self._cmd_bytes = tuple(cmd.encode('utf-8') for cmd in self._cmd_strs)
 
         self.client = None
+        # A kliens write_gatt_char metódusa, csatlakozáskor egyszer kötve
+        self._write_gatt = None
+        # Az írás célja: csatlakozáskor feloldott karakterisztika objektum
+        # (a bleak így nem keresi ki küldésenként az UUID alapján), különben az UUID.
+        # Bontás után nem kell visszaállítani: _write_gatt nélkül nincs küldés,
+        # a következő csatlakozás pedig újra feloldja.
+        self._write_char = self.cfg.characteristic_uuid
         self.device_address = None
         self.is_connected = False
         self.auth_failed = False
         self.retry_count = 0
         self.retry_reset_time = None
         self.last_sent_command = None
-        self._state_lock = threading.Lock()
 
-        self.command_queue = queue.Queue(maxsize=1)
-        self._queue_lock = threading.Lock()
+        # Egyelemes parancs slot + ébresztő Event: az értékadás a GIL alatt
+        # atomi, így nincs szükség sorra és zárra – mindig a legfrissebb szint nyer.
+        # Az asyncio.Event a BLE szál loop-jához kötődik, más szálból csak
+        # call_soon_threadsafe-en keresztül állítható (lásd _wake_worker).
+        self._pending_level = None
+        self._last_requested_level = None
+        self._cmd_event = asyncio.Event()
+        # Sikeres csatlakozáskor beállítva, a disconnected_callback törli –
+        # így a kapcsolat állapotához nem kell a BLE backendet lekérdezni.
+        self._connected_event = asyncio.Event()
         self.running = threading.Event()
         self.thread = None
         self.loop = None
+        # A loop-ot futtató szál azonosítója (a _ble_loop állítja be)
+        self._loop_thread_id = None
         self.ready_event = threading.Event()
 
     def start(self):
@@ -159,42 +518,112 @@ class BLEController:
         """A BLE háttérszál fő ciklusa.
 
         Egy új asyncio event loop-ot hoz létre, elvégzi az inicializálást,
-        majd várakozik a command_queue-ból érkező parancsokra, és elküldi
-        azokat a BLE eszköznek.
+        majd a loop-ot folyamatosan futtatja a _command_worker korutinnal.
+        Tétlen állapotban a szál nem ébred fel (nincs időzített lekérdezés).
         A szál leállításakor bontja a kapcsolatot és lezárja az event loop-ot.
         """
         try:
             self.loop = asyncio.new_event_loop()
             asyncio.set_event_loop(self.loop)
+            self._loop_thread_id = threading.get_ident()
 
             logger.info("BLE inicializálás...")
             self.loop.run_until_complete(self._initial_connect())
 
             self.ready_event.set()
 
-            while self.running.is_set():
-                try:
-                    try:
-                        level = self.command_queue.get(timeout=self.QUEUE_POLL_TIMEOUT)
-
-                        self.loop.run_until_complete(self._send_command_async(level))
-                    except queue.Empty:
-                        continue
-                except Exception as e:
-                    logger.error(f"BLE loop hiba: {e}")
-                    time.sleep(1)
+            if self.running.is_set():
+                self.loop.run_until_complete(self._command_worker())
 
             logger.info("BLE kapcsolat lezárása...")
             self.loop.run_until_complete(self._disconnect_async())
 
         except Exception as e:
-            logger.error(f"BLE thread kritikus hiba: {e}")
+            logger.error("BLE thread kritikus hiba: %s", e)
         finally:
             self.ready_event.set()
             if self.loop:
                 self.loop.close()
             logger.info("BLE thread leállt")
 
+    async def _command_worker(self):
+        """A parancsokat feldolgozó, a loop-on folyamatosan futó korutin.
+
+        A _cmd_event jelzésére ébred, kiolvassa a _pending_level slotból
+        a legfrissebb szintet, és elküldi. Egyszerre mindig csak egy küldés
+        fut, így az újracsatlakozási logika nem fut párhuzamosan önmagával.
+        Leállításkor (running törölve) a stop() ébreszti fel és kilép.
+        """
+        if self._pending_level is not None:
+            self._cmd_event.set()
+        while self.running.is_set():
+            await self._cmd_event.wait()
+            self._cmd_event.clear()
+            if not self.running.is_set():
+                break
+            level = self._pending_level
+            if level is None:
+                continue
+            try:
+                sent = await self._send_command_async(level)
+            except Exception as e:
+                logger.error("BLE loop hiba: %s", e)
+                sent = False
+                await asyncio.sleep(1)
+            if not sent and self._pending_level == level:
+                # Sikertelen küldés: a következő azonos kérés ne szűrődjön ki
+                self._last_requested_level = None
+
+    def _reconnect_delay(self, retry_count):
+        """Exponenciális várakozási idő a sikertelen újracsatlakozás után.
+
+        Az első kísérlet után reconnect_interval, majd kísérletenként duplázódik
+        RECONNECT_BACKOFF_MAX-ig (ha a beállított reconnect_interval ennél
+        nagyobb, az a felső korlát); a véletlen ráhagyás (legfeljebb fél
+        reconnect_interval) széthúzza az egyszerre újrapróbálkozó klienseket.
+
+        Paraméterek:
+            retry_count (int): Az eddigi újracsatlakozási kísérletek száma (1-től).
+
+        Visszaad:
+            float: A várakozás másodpercben.
+        """
+        interval = self.cfg.reconnect_interval
+        delay = min(interval * (2 ** max(0, retry_count - 1)), max(self.RECONNECT_BACKOFF_MAX, interval))
+        return delay + random.uniform(0, interval / 2)
+
+    async def _backoff_sleep(self, delay):
+        """Újracsatlakozás előtti várakozás, amit egy új parancs megszakít.
+
+        A _cmd_event-re vár legfeljebb delay másodpercig. Az eseményt nem
+        törli, így a _command_worker az új parancsot azonnal feldolgozza
+        (leállításkor a stop() ébresztése is itt szakítja meg a várakozást).
+
+        Paraméterek:
+            delay (float): A várakozás felső korlátja másodpercben.
+        """
+        try:
+            await asyncio.wait_for(self._cmd_event.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+    def _wake_worker(self):
+        """Szálbiztosan felébreszti a _command_worker korutint.
+
+        A loop saját szálán közvetlenül állítja az eseményt; más szálból
+        call_soon_threadsafe-fel (ez a loop önpipe-ján is felébreszti a szálat).
+        """
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            return
+        if threading.get_ident() == self._loop_thread_id:
+            self._cmd_event.set()
+            return
+        try:
+            loop.call_soon_threadsafe(self._cmd_event.set)
+        except RuntimeError:
+            pass
+
     async def _initial_connect(self):
         """Kezdeti BLE kapcsolat felépítése indításkor.
 
@@ -209,23 +638,24 @@ class BLEController:
     async def _scan_and_connect_async(self):
         """BLE eszköz keresése és csatlakozás.
 
-        A scan_timeout másodpercig keres BLE eszközöket, majd megkeresi
-        a device_name nevűt és megpróbál csatlakozni.
+        Legfeljebb scan_timeout másodpercig keresi a device_name nevű eszközt;
+        a keresés azonnal véget ér, amint az eszköz hirdetése megérkezik
+        (nem várja ki a teljes időkorlátot), majd megpróbál csatlakozni.
 
         Visszaad:
             bool: True, ha a csatlakozás sikeres; False egyébként.
         """
         try:
-            devices = await BleakScanner.discover(timeout=self.scan_timeout)
-            for device in devices:
-                if device.name == self.device_name:
-                    logger.info(f"Eszköz megtalálva: {device.name} ({device.address})")
-                    self.device_address = device.address
-                    return await self._connect_async()
-            logger.error(f"Nem található: {self.device_name}")
-            return False
+            _load_bleak()
+            device = await BleakScanner.find_device_by_name(self.cfg.device_name, timeout=self.cfg.scan_timeout)
+            if device is None:
+                logger.error("Nem található: %s", self.cfg.device_name)
+                return False
+            logger.info("Eszköz megtalálva: %s (%s)", device.name, device.address)
+            self.device_address = device.address
+            return await self._connect_async()
         except Exception as e:
-            logger.error(f"Keresési hiba: {e}")
+            logger.error("Keresési hiba: %s", e)
             return False
 
     async def _connect_async(self):
@@ -241,17 +671,18 @@ class BLEController:
         if not self.device_address:
             return False
         try:
-            if self.client and await self._is_connected_async():
+            if self.client and self._is_connected():
                 return True
+            _load_bleak()
             self.client = BleakClient(
                 self.device_address,
-                timeout=self.connection_timeout,
+                timeout=self.cfg.connection_timeout,
                 disconnected_callback=self._on_disconnect
             )
             client = self.client
             await client.connect()
-            if self.pin_code is not None:
-                logger.info(f"BLE PIN autentikáció folyamatban: {self.device_address}")
+            if self.cfg.pin_code is not None:
+                logger.info("BLE PIN autentikáció folyamatban: %s", self.device_address)
                 try:
                     auth_event = asyncio.Event()
                     auth_response = [None]
@@ -261,19 +692,19 @@ class BLEController:
                         auth_response[0] = response
                         auth_event.set()
 
-                    await client.start_notify(self.characteristic_uuid, _auth_notify_callback)
+                    await client.start_notify(self.cfg.characteristic_uuid, _auth_notify_callback)
                     try:
-                        auth_message = f"AUTH:{str(self.pin_code)}"
+                        auth_message = f"AUTH:{str(self.cfg.pin_code)}"
                         await asyncio.wait_for(
                             client.write_gatt_char(
-                                self.characteristic_uuid,
+                                self.cfg.characteristic_uuid,
                                 auth_message.encode('utf-8')
                             ),
-                            timeout=self.command_timeout
+                            timeout=self.cfg.command_timeout
                         )
-                        logger.info(f"BLE PIN elküldve: {self.device_address}")
+                        logger.info("BLE PIN elküldve: %s", self.device_address)
                         try:
-                            await asyncio.wait_for(auth_event.wait(), timeout=self.command_timeout)
+                            await asyncio.wait_for(auth_event.wait(), timeout=self.cfg.command_timeout)
                         except asyncio.TimeoutError:
                             logger.warning("BLE AUTH válasz timeout - folytatás autentikáció nélkül")
                         else:
@@ -286,10 +717,11 @@ class BLEController:
                                     await client.disconnect()
                                 except Exception:
                                     pass
-                                with self._state_lock:
-                                    self.is_connected = False
-                                    self.auth_failed = True
-                                    self.client = None
+                                self.is_connected = False
+                                self.auth_failed = True
+                                self.client = None
+                                self._connected_event.clear()
+                                self._write_gatt = None
                                 return False
                             elif response == "AUTH_LOCKED":
                                 logger.error("BLE AUTH LOCKOUT - az ESP32 ideiglenesen blokkolva! Ellenőrizd a PIN-t a settings.json-ban!")
@@ -297,68 +729,109 @@ class BLEController:
                                     await client.disconnect()
                                 except Exception:
                                     pass
-                                with self._state_lock:
-                                    self.is_connected = False
-                                    self.auth_failed = True
-                                    self.client = None
+                                self.is_connected = False
+                                self.auth_failed = True
+                                self.client = None
+                                self._connected_event.clear()
+                                self._write_gatt = None
                                 return False
                     finally:
                         try:
-                            await client.stop_notify(self.characteristic_uuid)
+                            await client.stop_notify(self.cfg.characteristic_uuid)
                         except Exception:
                             pass
                 except Exception as auth_err:
-                    logger.error(f"BLE PIN küldési hiba: {auth_err} → kapcsolat bontása")
+                    logger.error("BLE PIN küldési hiba: %s → kapcsolat bontása", auth_err)
                     try:
                         await client.disconnect()
                     except Exception:
                         pass
-                    with self._state_lock:
-                        self.is_connected = False
-                        self.client = None
+                    self.is_connected = False
+                    self.client = None
+                    self._connected_event.clear()
+                    self._write_gatt = None
                     return False
-            with self._state_lock:
-                self.is_connected = True
-                self.retry_count = 0
-                self.retry_reset_time = None
-                self.last_sent_command = None
-            logger.info(f"Csatlakozva: {self.device_address}")
+            self.is_connected = True
+            self._write_char = self._resolve_characteristic(client)
+            self._write_gatt = self._bind_write(client, self._write_char)
+            self._connected_event.set()
+            self.retry_count = 0
+            self.retry_reset_time = None
+            self.last_sent_command = None
+            logger.info("Csatlakozva: %s", self.device_address)
             return True
         except Exception as e:
-            logger.error(f"Csatlakozási hiba: {e}")
-            with self._state_lock:
-                self.is_connected = False
-                self.client = None
+            logger.error("Csatlakozási hiba: %s", e)
+            self.is_connected = False
+            self.client = None
+            self._connected_event.clear()
+            self._write_gatt = None
             return False
 
-    async def _is_connected_async(self):
-        """Ellenőrzi, hogy a BLE kapcsolat aktív-e.
+    def _resolve_characteristic(self, client):
+        """Kikeresi a parancs karakterisztikát a kliens feltérképezett szolgáltatásaiból.
+
+        Paraméterek:
+            client: A csatlakoztatott BleakClient példány.
 
         Visszaad:
-            bool: True, ha a kliens csatlakoztatva van; False egyébként.
+            A BleakGATTCharacteristic objektum, vagy ha nem található,
+            a beállított UUID szöveg (ilyenkor a bleak küldéskor keresi ki).
         """
+        uuid = self.cfg.characteristic_uuid
         try:
-            with self._state_lock:
-                client = self.client
-            if client:
-                return client.is_connected
+            char = client.services.get_characteristic(uuid)
         except Exception:
-            pass
-        return False
+            char = None
+        return uuid if char is None else char
+
+    @staticmethod
+    def _bind_write(client, char):
+        """Összeállítja a parancsküldéshez használt write függvényt.
+
+        Ha a karakterisztika támogatja a válasz nélküli írást
+        ('write-without-response'), a LEVEL parancsok azzal mennek: nem kell
+        kivárni a nyugtázást (egy teljes connection interval). Egyébként –
+        vagy ha a karakterisztika nem volt feloldható – marad a bleak
+        alapértelmezése.
+
+        Paraméterek:
+            client: A csatlakoztatott BleakClient példány.
+            char: A _resolve_characteristic eredménye (objektum vagy UUID).
+
+        Visszaad:
+            callable: write(char, data) korutin függvény.
+        """
+        properties = getattr(char, 'properties', None) or ()
+        if 'write-without-response' in properties:
+            return partial(client.write_gatt_char, response=False)
+        return client.write_gatt_char
+
+    def _is_connected(self):
+        """Ellenőrzi, hogy a BLE kapcsolat aktív-e.
+
+        A _connected_event állapotát olvassa (a disconnected_callback tartja
+        karban), a BLE backendet nem kérdezi le.
+
+        Visszaad:
+            bool: True, ha a kliens csatlakoztatva van; False egyébként.
+        """
+        return self.client is not None and self._connected_event.is_set()
 
     def _on_disconnect(self, client):
         """Callback: BLE kapcsolat váratlan megszakadásakor hívódik meg."""
         logger.warning("BLE kapcsolat váratlanul megszakadt")
-        with self._state_lock:
-            self.is_connected = False
-            self.last_sent_command = None
-            self.client = None
-            self.auth_failed = False
+        self.is_connected = False
+        self.last_sent_command = None
+        self.client = None
+        self._connected_event.clear()
+        self._write_gatt = None
+        self.auth_failed = False
+        self._last_requested_level = None
 
     async def _disconnect_async(self):
         """Bontja a BLE kapcsolatot és felszabadítja a klienst."""
-        with self._state_lock:
-            client = self.client
+        client = self.client
         if client:
             try:
                 await asyncio.wait_for(client.disconnect(), timeout=self.DISCONNECT_TIMEOUT)
@@ -368,9 +841,10 @@ class BLEController:
             except Exception:
                 pass
             finally:
-                with self._state_lock:
-                    self.is_connected = False
-                    self.client = None
+                self.is_connected = False
+                self.client = None
+                self._connected_event.clear()
+                self._write_gatt = None
 
     async def _send_command_async(self, level):
         """Parancs aszinkron elküldése BLE-n, szükség esetén újracsatlakozással.
@@ -385,57 +859,53 @@ class BLEController:
         Visszaad:
             bool: True, ha a parancs elküldése sikeres; False egyébként.
         """
-        with self._state_lock:
-            last_cmd = self.last_sent_command
-            auth_failed = self.auth_failed
+        last_cmd = self.last_sent_command
+        auth_failed = self.auth_failed
         if auth_failed:
             logger.error("BLE parancs elutasítva - AUTH hiba! Javítsd a PIN-t a settings.json-ban és indítsd újra!")
             return False
-        if last_cmd == level and await self._is_connected_async():
+        connected = self._is_connected()
+        if last_cmd == level and connected:
             return True
 
-        if not await self._is_connected_async():
-            with self._state_lock:
-                retry_reset_time = self.retry_reset_time
-                retry_count = self.retry_count
+        if not connected:
+            retry_reset_time = self.retry_reset_time
+            retry_count = self.retry_count
 
             if retry_reset_time is not None:
-                elapsed = time.time() - retry_reset_time
+                elapsed = time.monotonic() - retry_reset_time
                 if elapsed >= self.RETRY_RESET_SECONDS:
-                    logger.info(f"Retry count reset ({elapsed:.0f}s telt el), újrapróbálkozás...")
-                    with self._state_lock:
-                        self.retry_count = 0
-                        self.retry_reset_time = None
+                    logger.info("Retry count reset (%.0fs telt el), újrapróbálkozás...", elapsed)
+                    self.retry_count = 0
+                    self.retry_reset_time = None
                     retry_count = 0
                 else:
                     remaining = self.RETRY_RESET_SECONDS - elapsed
-                    logger.info(f"Újrapróbálkozás {remaining:.0f}s múlva...")
-                    await asyncio.sleep(min(remaining, self.reconnect_interval))
+                    logger.info("Újrapróbálkozás %.0fs múlva...", remaining)
+                    await self._backoff_sleep(min(remaining, self.cfg.reconnect_interval))
                     return False
 
-            if retry_count < self.max_retries:
-                with self._state_lock:
-                    self.retry_count += 1
-                    retry_count = self.retry_count
-                logger.info(f"Újracsatlakozás... ({retry_count}/{self.max_retries})")
+            if retry_count < self.cfg.max_retries:
+                self.retry_count += 1
+                retry_count = self.retry_count
+                logger.info("Újracsatlakozás... (%s/%s)", retry_count, self.cfg.max_retries)
                 if self.device_address:
                     if await self._connect_async():
                         return await self._send_immediate(level)
                 else:
                     if await self._scan_and_connect_async():
                         return await self._send_immediate(level)
-                await asyncio.sleep(self.reconnect_interval)
+                await self._backoff_sleep(self._reconnect_delay(retry_count))
                 return False
             else:
-                with self._state_lock:
-                    if self.retry_reset_time is None:
-                        self.retry_reset_time = time.time()
-                        logger.warning(f"Max újracsatlakozási kísérletek elérve ({self.max_retries})! {self.RETRY_RESET_SECONDS}s múlva újrapróbálkozik...")
+                if self.retry_reset_time is None:
+                    self.retry_reset_time = time.monotonic()
+                    logger.warning("Max újracsatlakozási kísérletek elérve (%s)! %ss múlva újrapróbálkozik...", self.cfg.max_retries, self.RETRY_RESET_SECONDS)
                 return False
 
-        return await self._send_immediate(level)
+        return await self._send_immediate(level, already_connected=True)
 
-    async def _send_immediate(self, level):
+    async def _send_immediate(self, level, already_connected=False):
         """Azonnal elküldi a parancsot a BLE GATT karakterisztikára.
 
         A parancs formátuma: "LEVEL:<n>" (pl. "LEVEL:2").
@@ -443,66 +913,60 @@ class BLEController:
 
         Paraméterek:
             level (int): A ventilátor zóna szintje (0–3).
+            already_connected (bool): True, ha a hívó már ellenőrizte a
+                kapcsolatot – ilyenkor a kapcsolat-ellenőrzés kimarad.
 
         Visszaad:
             bool: True, ha a küldés sikeres; False egyébként.
         """
-        with self._state_lock:
-            client = self.client
-        if not client or not await self._is_connected_async():
-            with self._state_lock:
-                self.is_connected = False
+        write_gatt = self._write_gatt
+        if write_gatt is None or (not already_connected and not self._is_connected()):
+            self.is_connected = False
             return False
         try:
-            message = f"LEVEL:{level}"
-            await asyncio.wait_for(
-                client.write_gatt_char(
-                    self.characteristic_uuid,
-                    message.encode('utf-8')
-                ),
-                timeout=self.command_timeout
-            )
-            with self._state_lock:
-                self.last_sent_command = level
-            logger.info(f"Parancs elküldve: {message}")
+            if _asyncio_timeout is not None:
+                async with _asyncio_timeout(self.cfg.command_timeout):
+                    await write_gatt(self._write_char, self._cmd_bytes[level])
+            else:
+                await asyncio.wait_for(
+                    write_gatt(self._write_char, self._cmd_bytes[level]),
+                    timeout=self.cfg.command_timeout
+                )
+            self.last_sent_command = level
+            logger.info("Parancs elküldve: %s", self._cmd_strs[level])
             return True
-        except asyncio.TimeoutError:
-            logger.error(f"Parancs küldés timeout ({self.command_timeout}s)")
-            with self._state_lock:
-                self.is_connected = False
+        except (asyncio.TimeoutError, TimeoutError):
+            logger.error("Parancs küldés timeout (%ss)", self.cfg.command_timeout)
+            self.is_connected = False
             return False
         except Exception as e:
-            logger.error(f"Küldési hiba: {e}")
-            with self._state_lock:
-                self.is_connected = False
+            logger.error("Küldési hiba: %s", e)
+            self.is_connected = False
             return False
 
     def send_command_sync(self, level):
         """Ventilátor szint parancs szinkron küldése a BLE szálnak.
 
-        A parancsot a command_queue-ba teszi, amelyből a BLE háttérszál
-        veszi ki és küldi el. A sor mérete 1; ha teli van, a régi parancsot
-        elveti és az újat teszi be.
+        A parancsot a _pending_level slotba írja (felülírva a még el nem
+        küldött régebbit), majd a BLE szál loop-ján futó _command_worker
+        korutint szálbiztosan felébreszti. Ha a szint megegyezik a legutóbb
+        kért szinttel, már itt visszatér (nincs szálváltás, nincs ébresztés).
 
         Paraméterek:
             level (int): A ventilátor zóna szintje (0–3). Más érték esetén
                          figyelmeztetést ír ki és visszatér.
         """
-        if isinstance(level, bool) or not isinstance(level, int) or level < 0 or level > 3:
-            logger.warning(f"Érvénytelen parancs szint: {level} (egész számnak kell lennie, 0-3 között)")
+        if type(level) is not int or level not in _VALID_LEVELS:
+            logger.warning("Érvénytelen parancs szint: %s (egész számnak kell lennie, 0-3 között)", level)
             return
         if not self.running.is_set():
             logger.warning("BLE thread nem fut, parancs elvetve")
             return
-        with self._queue_lock:
-            try:
-                self.command_queue.get_nowait()
-            except queue.Empty:
-                pass
-            try:
-                self.command_queue.put_nowait(level)
-            except queue.Full:
-                logger.warning(f"Queue hiba, parancs elvetve: LEVEL:{level}")
+        if level == self._last_requested_level:
+            return
+        self._last_requested_level = level
+        self._pending_level = level
+        self._wake_worker()
 
     def stop(self):
         """Leállítja a BLE háttérszálat.
@@ -514,6 +978,7 @@ class BLEController:
             return
         logger.info("BLE thread leállítása...")
         self.running.clear()
+        self._wake_worker()
         if self.thread and self.thread.is_alive():
             self.thread.join(timeout=self.STOP_JOIN_TIMEOUT)
             if self.thread.is_alive():
@@ -522,6 +987,169 @@ class BLEController:
                 logger.info("BLE thread leállítva")
 
 
+# ============================================================
+# RollingBuffer
+# ============================================================
+class RollingBuffer:
+    """Fix méretű, előre lefoglalt gyűrűpuffer folyamatosan karbantartott összeggel.
+
+    A deque(maxlen=N) helyett használjuk az átlagoláshoz: a beszúrás O(1),
+    és az átlag a tárolt összegből számolódik, nem kell minden döntésnél
+    végigösszegezni a puffert.
+
+    Attribútumok:
+        maxlen (int): A puffer kapacitása (mintaszám).
+        total (int|float): A pufferben lévő minták összege.
+    """
+
+    __slots__ = ('maxlen', 'total', '_data', '_head', '_count')
+
+    def __init__(self, maxlen):
+        """Inicializálja az üres puffert.
+
+        Paraméterek:
+            maxlen (int): A puffer kapacitása (legalább 1).
+        """
+        self.maxlen = max(1, int(maxlen))
+        self._data = [0] * self.maxlen
+        self._head = 0
+        self._count = 0
+        self.total = 0
+
+    def append(self, value):
+        """Új minta hozzáadása; tele puffer esetén a legrégebbit írja felül.
+
+        Paraméterek:
+            value (int|float): Az új minta.
+        """
+        head = self._head
+        if self._count == self.maxlen:
+            self.total -= self._data[head]
+        else:
+            self._count += 1
+        self._data[head] = value
+        self.total += value
+        head += 1
+        self._head = 0 if head == self.maxlen else head
+
+    def clear(self):
+        """Kiüríti a puffert."""
+        self._head = 0
+        self._count = 0
+        self.total = 0
+
+    def mean(self):
+        """A pufferben lévő minták átlaga.
+
+        Visszaad:
+            float: Az átlag (üres puffer esetén 0.0).
+        """
+        if not self._count:
+            return 0.0
+        return self.total / self._count
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        """A mintákat a legrégebbitől a legújabbig adja vissza."""
+        start = self._head - self._count
+        for i in range(start, self._head):
+            yield self._data[i]
+
+
+# ============================================================
+# SettingsView
+# ============================================================
+@dataclass(frozen=True)
+class ZoneThresholdsConfig:
+    """Teljesítmény zóna határok az FTP százalékában."""
+
+    z1_max_percent: int
+    z2_max_percent: int
+
+
+@dataclass(frozen=True)
+class DataSourceConfig:
+    """Az adatforrás beállítások ('data_source') csak olvasható nézete."""
+
+    power_source: str
+    hr_source: str
+    ble_power_device_name: object
+    ble_power_scan_timeout: int
+    ble_power_reconnect_interval: int
+    ble_power_max_retries: int
+    ble_hr_device_name: object
+    ble_hr_scan_timeout: int
+    ble_hr_reconnect_interval: int
+    ble_hr_max_retries: int
+    zwift_udp_port: int
+    zwift_udp_host: str
+    zwift_udp_buffer_seconds: int
+    zwift_udp_minimum_samples: int
+    zwift_udp_dropout_timeout: int
+
+
+@dataclass(frozen=True)
+class HrZoneConfig:
+    """A HR zóna beállítások ('heart_rate_zones') csak olvasható nézete."""
+
+    enabled: bool
+    max_hr: int
+    resting_hr: int
+    zone_mode: str
+    z1_max_percent: int
+    z2_max_percent: int
+
+
+@dataclass(frozen=True)
+class SettingsView:
+    """A validált beállítások csak olvasható, attribútum alapú nézete.
+
+    A load_and_validate_settings() eredményéből egyszer épül fel; a gyakran
+    olvasott mezők így egyetlen attribútum eléréssel érhetők el, láncolt
+    dict keresés nélkül.
+    """
+
+    ftp: int
+    min_watt: int
+    max_watt: int
+    cooldown_seconds: int
+    buffer_seconds: int
+    minimum_samples: int
+    dropout_timeout: int
+    zero_power_immediate: bool
+    zone_thresholds: ZoneThresholdsConfig
+    ble: BLEConfig
+    data_source: DataSourceConfig
+    heart_rate_zones: HrZoneConfig
+
+    @classmethod
+    def from_dict(cls, settings):
+        """SettingsView létrehozása a validált beállítások dict-ből.
+
+        Paraméterek:
+            settings (dict): A load_and_validate_settings() által visszaadott dict.
+
+        Visszaad:
+            SettingsView: Az új, csak olvasható nézet.
+        """
+        return cls(
+            ftp=settings['ftp'],
+            min_watt=settings['min_watt'],
+            max_watt=settings['max_watt'],
+            cooldown_seconds=settings['cooldown_seconds'],
+            buffer_seconds=settings['buffer_seconds'],
+            minimum_samples=settings['minimum_samples'],
+            dropout_timeout=settings['dropout_timeout'],
+            zero_power_immediate=settings['zero_power_immediate'],
+            zone_thresholds=ZoneThresholdsConfig(**settings['zone_thresholds']),
+            ble=BLEConfig.from_dict(settings),
+            data_source=DataSourceConfig(**settings['data_source']),
+            heart_rate_zones=HrZoneConfig(**settings['heart_rate_zones']),
+        )
+
+
 # ============================================================
 # PowerZoneController
 # ============================================================
@@ -544,7 +1172,7 @@ class PowerZoneController:
         Zóna növelésekor nincs cooldown – azonnal reagál.
 
     Buffer/átlagolás:
-        Az adatokat egy deque pufferbe gyűjti (buffer_seconds × 4 mintahely).
+        Az adatokat egy RollingBuffer gyűrűpufferbe gyűjti (buffer_seconds × 4 mintahely).
         A zónadöntés az átlagos teljesítmény alapján történik, nem az azonnali
         értékek alapján. Legalább minimum_samples minta kell a döntéshez.
 
@@ -554,12 +1182,32 @@ class PowerZoneController:
 
     Attribútumok:
         ftp (int): Funkcionális küszöbteljesítmény wattban.
-        zones (dict): A kiszámított zóna határok {0: (min, max), ...} formátumban.
+        zones (Mapping): A kiszámított zóna határok {0: (min, max), ...} formátumban
+            (csak olvasható).
         current_zone (int|None): Aktuálisan aktív zóna (None = még nincs döntés).
-        cooldown_active (bool): True, ha a cooldown timer fut.
+        cooldown_deadline (float): A cooldown lejárati ideje (time.monotonic() skálán);
+            0.0, ha nincs aktív cooldown.
         ble (BLEController): A BLE kommunikációs réteg.
     """
 
+    # Az állapot slotokban él; a '__dict__' csak akkor jön létre, ha valaki
+    # (pl. teszt) a listán kívüli attribútumot állít be a példányon.
+    __slots__ = (
+        'settings', 'cfg',
+        'ftp', 'min_watt', 'max_watt', 'cooldown_seconds', 'buffer_seconds',
+        'minimum_samples', 'dropout_timeout', 'zero_power_immediate',
+        'zone_thresholds', '_hr_zone_settings', '_zones', '_zone_hi', '_hr_cuts', '_hr_enabled', '_zone_mode',
+        'current_zone', 'last_zone_change', 'cooldown_deadline',
+        'pending_zone', 'can_halve', 'can_double',
+        'last_data_time', 'power_buffer', 'state_lock', 'last_cooldown_print',
+        'current_heart_rate', 'current_hr_zone', 'current_power_zone', 'current_avg_power',
+        'hr_buffer', 'last_hr_print_time', 'last_power_print_time', 'last_avg_power_print_time',
+        'last_hr_zone_print_time', 'last_hr_data_time',
+        'last_invalid_power_print_time', 'invalid_power_count',
+        '_ble', '_hr_zones', 'running', '_stop_event', 'dropout_thread',
+        '__dict__',
+    )
+
     BUFFER_RATE_HZ = 4
     COOLDOWN_PRINT_INTERVAL = 10
     PRINT_THROTTLE_SECONDS = 1.0
@@ -575,40 +1223,53 @@ class PowerZoneController:
                                  Alapértelmezett: "settings.json"
         """
         self.settings = self.load_and_validate_settings(settings_file)
-
-        self.ftp = self.settings['ftp']
-        self.min_watt = self.settings['min_watt']
-        self.max_watt = self.settings['max_watt']
-        self.cooldown_seconds = self.settings['cooldown_seconds']
-        self.buffer_seconds = self.settings['buffer_seconds']
-        self.minimum_samples = self.settings['minimum_samples']
-        self.dropout_timeout = self.settings['dropout_timeout']
-        self.zero_power_immediate = self.settings['zero_power_immediate']
+        self.cfg = SettingsView.from_dict(self.settings)
+        cfg = self.cfg
+
+        self.ftp = cfg.ftp
+        self.min_watt = cfg.min_watt
+        self.max_watt = cfg.max_watt
+        self.cooldown_seconds = cfg.cooldown_seconds
+        self.buffer_seconds = cfg.buffer_seconds
+        self.minimum_samples = cfg.minimum_samples
+        self.dropout_timeout = cfg.dropout_timeout
+        self.zero_power_immediate = cfg.zero_power_immediate
         self.zone_thresholds = self.settings['zone_thresholds']
-        self.hr_zone_settings = self.settings.get('heart_rate_zones', copy.deepcopy(DEFAULT_SETTINGS['heart_rate_zones']))
-
-        ds = self.settings.get('data_source', {})
-        uses_zwift_udp = (ds.get('power_source') == 'zwift_udp' or
-                          ds.get('hr_source') == 'zwift_udp')
+        # Csak olvasható másolat: a _hr_cuts és a mód jelzők ebből épülnek
+        self._hr_zone_settings = _freeze(self.settings['heart_rate_zones'])
+        # HR zóna alsó határai (Z1, Z2, Z3) – a zónát bisect adja meg
+        hrz = cfg.heart_rate_zones
+        # A mintánként vizsgált HR beállítások egyszer kiolvasva
+        self._hr_enabled = hrz.enabled
+        self._zone_mode = hrz.zone_mode if hrz.enabled else 'power_only'
+        self._hr_cuts = (hrz.resting_hr,
+                         hrz.max_hr * hrz.z1_max_percent / 100,
+                         hrz.max_hr * hrz.z2_max_percent / 100)
+
+        ds = cfg.data_source
+        uses_zwift_udp = (ds.power_source == 'zwift_udp' or
+                          ds.hr_source == 'zwift_udp')
         if uses_zwift_udp:
-            self.buffer_seconds = ds.get('zwift_udp_buffer_seconds', 10)
-            self.minimum_samples = ds.get('zwift_udp_minimum_samples', 2)
-            self.dropout_timeout = ds.get('zwift_udp_dropout_timeout', 15)
+            self.buffer_seconds = ds.zwift_udp_buffer_seconds
+            self.minimum_samples = ds.zwift_udp_minimum_samples
+            self.dropout_timeout = ds.zwift_udp_dropout_timeout
 
-        self.zones = self.calculate_zones()
+        # Csak olvasható: a _zone_hi ebből épül, egy módosítás nem hatna rá
+        self._zones = MappingProxyType(self.calculate_zones())
+        # Z0..Z2 felső határai növekvő sorrendben – a zónát bisect adja meg
+        self._zone_hi = tuple(self._zones[z][1] for z in range(3))
 
         self.current_zone = None
-        self.last_zone_change = time.time()
-        self.cooldown_active = False
-        self.cooldown_start_time = 0
+        self.last_zone_change = time.monotonic()
+        self.cooldown_deadline = 0.0
         self.pending_zone = None
         self.can_halve = True
         self.can_double = False
 
-        self.last_data_time = time.time()
+        self.last_data_time = time.monotonic()
 
         buffer_size = int(self.buffer_seconds * self.BUFFER_RATE_HZ)
-        self.power_buffer = deque(maxlen=buffer_size)
+        self.power_buffer = RollingBuffer(buffer_size)
 
         self.state_lock = threading.Lock()
         self.last_cooldown_print = 0
@@ -617,45 +1278,56 @@ class PowerZoneController:
         self.current_hr_zone = None
         self.current_power_zone = None
         self.current_avg_power = None
-        hr_buffer_size = int(self.buffer_seconds * self.BUFFER_RATE_HZ)
-        self.hr_buffer = deque(maxlen=hr_buffer_size)
+        self.hr_buffer = RollingBuffer(buffer_size)
         self.last_hr_print_time = 0
         self.last_power_print_time = 0
+        self.last_avg_power_print_time = 0
         self.last_hr_zone_print_time = 0
         self.last_hr_data_time = None
+        self.last_invalid_power_print_time = 0
+        self.invalid_power_count = 0
 
-        self.ble = BLEController(self.settings)
+        # A BLEController és a HR zóna határok első használatkor jönnek létre
+        self._ble = None
+        self._hr_zones = None
 
         self.running = threading.Event()
+        # A stop_dropout_checker() jelzi – a várakozó szálat azonnal felébreszti
+        self._stop_event = threading.Event()
         self.dropout_thread = None
 
-        print(f"FTP: {self.ftp}W")
-        print(f"Érvényes watt tartomány: 0W - {self.max_watt}W")
-        print(f"Zóna határok: {self.zones}")
-        print(f"Buffer méret: {buffer_size} adat ({self.buffer_seconds}s)")
-        print(f"Minimum minták: {self.minimum_samples}")
-        print(f"Dropout timeout: {self.dropout_timeout}s")
-        print(f"Cooldown: {self.cooldown_seconds}s")
-        print(f"0W azonnali: {'Igen' if self.zero_power_immediate else 'Nem'}")
-        print(f"BLE eszköz: {self.settings['ble']['device_name']}")
+        # Az indítási összefoglaló egyetlen kiírással megy ki
+        lines = [
+            f"FTP: {self.ftp}W",
+            f"Érvényes watt tartomány: 0W - {self.max_watt}W",
+            f"Zóna határok: {dict(self.zones)}",
+            f"Buffer méret: {buffer_size} adat ({self.buffer_seconds}s)",
+            f"Minimum minták: {self.minimum_samples}",
+            f"Dropout timeout: {self.dropout_timeout}s",
+            f"Cooldown: {self.cooldown_seconds}s",
+            f"0W azonnali: {'Igen' if self.zero_power_immediate else 'Nem'}",
+            f"BLE eszköz: {self.settings['ble']['device_name']}",
+        ]
         pin_code = self.settings['ble'].get('pin_code', None)
         if pin_code is not None:
-            print(f"BLE PIN: {'*' * len(str(pin_code))}")
-        print(f"Power forrás: {self.settings['data_source']['power_source']}")
-        print(f"HR forrás: {self.settings['data_source']['hr_source']}")
+            lines.append(f"BLE PIN: {'*' * len(str(pin_code))}")
+        lines.append(f"Power forrás: {self.settings['data_source']['power_source']}")
+        lines.append(f"HR forrás: {self.settings['data_source']['hr_source']}")
         if uses_zwift_udp:
-            print(f"🔄 Zwift UDP mód: buffer={self.buffer_seconds}s, min_samples={self.minimum_samples}, dropout={self.dropout_timeout}s")
-        if self.hr_zone_settings.get('enabled', False):
+            lines.append(f"🔄 Zwift UDP mód: buffer={self.buffer_seconds}s, min_samples={self.minimum_samples}, dropout={self.dropout_timeout}s")
+        if cfg.heart_rate_zones.enabled:
             hr_z = self.hr_zones
-            print(f"HR zóna mód: {self.hr_zone_settings.get('zone_mode', 'power_only')}")
-            print(f"HR zóna határok: Z0 < {self.hr_zone_settings['resting_hr']} bpm, Z1 < {hr_z['z1_max']} bpm, Z2 < {hr_z['z2_max']} bpm")
+            lines.append(f"HR zóna mód: {cfg.heart_rate_zones.zone_mode}")
+            lines.append(f"HR zóna határok: Z0 < {hr_z['resting_hr']} bpm, Z1 < {hr_z['z1_max']} bpm, Z2 < {hr_z['z2_max']} bpm")
+        print("\n".join(lines))
 
     def start_dropout_checker(self):
         """Elindítja a dropout ellenőrző háttérszálat.
 
-        Másodpercenként meghívja a check_dropout metódust, hogy detektálja
-        az adatforrás kiesését és szükség esetén Z0-ra kapcsoljon.
+        A check_dropout metódust a kiesési határidő lejártakor hívja meg,
+        hogy detektálja az adatforrás kiesését és szükség esetén Z0-ra kapcsoljon.
         """
+        self._stop_event.clear()
         self.running.set()
         self.dropout_thread = threading.Thread(
             target=self._dropout_check_loop,
@@ -666,14 +1338,27 @@ class PowerZoneController:
         logger.info("Dropout ellenőrző thread elindítva")
 
     def _dropout_check_loop(self):
-        """A dropout ellenőrző szál ciklusa – másodpercenként fut."""
-        while self.running.is_set():
-            self.check_dropout()
-            time.sleep(1)
+        """A dropout ellenőrző szál ciklusa – határidőig alszik.
+
+        Nem pollingol másodpercenként: a következő ébredés a
+        last_data_time + dropout_timeout határidőre esik. Ha közben új adat
+        jött, a határidő kitolódott, és a szál újra elalszik a maradék időre;
+        lejárt határidő után a check_dropout fut, majd egy teljes
+        dropout_timeout-ot vár. A várakozás a _stop_event-en történik, így
+        leállításkor a szál azonnal kilép.
+        """
+        while True:
+            remaining = self.last_data_time + self.dropout_timeout - time.monotonic()
+            if remaining <= 0:
+                self.check_dropout()
+                remaining = self.dropout_timeout
+            if self._stop_event.wait(remaining):
+                break
 
     def stop_dropout_checker(self):
         """Leállítja a dropout ellenőrző háttérszálat."""
         self.running.clear()
+        self._stop_event.set()
         if self.dropout_thread and self.dropout_thread.is_alive():
             self.dropout_thread.join(timeout=3)
             logger.info("Dropout ellenőrző thread leállítva")
@@ -694,361 +1379,94 @@ class PowerZoneController:
         Visszaad:
             dict: A validált beállítások dict-je.
         """
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
 
         try:
-            with open(settings_file, 'r', encoding='utf-8') as f:
-                loaded_settings = json.load(f)
+            with open(settings_file, 'rb') as f:
+                loaded_settings = _json_loads(f.read())
         except FileNotFoundError:
-            print(f"⚠ FIGYELMEZTETÉS: '{settings_file}' nem található! Alapértelmezett beállítások használata.")
+            logger.warning("'%s' nem található! Alapértelmezett beállítások használata.", settings_file)
             self.save_default_settings(settings_file)
             return settings
         except json.JSONDecodeError as e:
-            print(f"⚠ FIGYELMEZTETÉS: '{settings_file}' hibás JSON formátum! ({e})")
+            logger.warning("'%s' hibás JSON formátum! (%s)", settings_file, e)
             return settings
         except Exception as e:
-            print(f"⚠ FIGYELMEZTETÉS: Hiba a beállítások betöltésekor! ({e})")
+            logger.warning("Hiba a beállítások betöltésekor! (%s)", e)
             return settings
 
-        validation_failed = False
-
-        if 'ftp' in loaded_settings:
-            if isinstance(loaded_settings['ftp'], (int, float)) and not isinstance(loaded_settings['ftp'], bool) and 100 <= loaded_settings['ftp'] <= 500:
-                settings['ftp'] = int(loaded_settings['ftp'])
-            else:
-                print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'ftp' érték: {loaded_settings['ftp']} (100-500 között kell lennie)")
-                validation_failed = True
-
-        if 'min_watt' in loaded_settings:
-            if isinstance(loaded_settings['min_watt'], (int, float)) and not isinstance(loaded_settings['min_watt'], bool) and loaded_settings['min_watt'] >= 0:
-                settings['min_watt'] = int(loaded_settings['min_watt'])
-            else:
-                print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'min_watt' érték: {loaded_settings['min_watt']} (0 vagy nagyobb kell legyen)")
-                validation_failed = True
-
-        if 'max_watt' in loaded_settings:
-            if isinstance(loaded_settings['max_watt'], (int, float)) and not isinstance(loaded_settings['max_watt'], bool) and loaded_settings['max_watt'] > 0:
-                settings['max_watt'] = int(loaded_settings['max_watt'])
-            else:
-                print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'max_watt' érték: {loaded_settings['max_watt']} (0-nál nagyobb kell legyen)")
-                validation_failed = True
-
-        if 'cooldown_seconds' in loaded_settings:
-            if isinstance(loaded_settings['cooldown_seconds'], (int, float)) and not isinstance(loaded_settings['cooldown_seconds'], bool) and 0 <= loaded_settings['cooldown_seconds'] <= 300:
-                settings['cooldown_seconds'] = int(loaded_settings['cooldown_seconds'])
-            else:
-                print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'cooldown_seconds' érték: {loaded_settings['cooldown_seconds']} (0-300 között kell lennie)")
-                validation_failed = True
-
-        if 'buffer_seconds' in loaded_settings:
-            if isinstance(loaded_settings['buffer_seconds'], (int, float)) and not isinstance(loaded_settings['buffer_seconds'], bool) and 1 <= loaded_settings['buffer_seconds'] <= 10:
-                settings['buffer_seconds'] = int(loaded_settings['buffer_seconds'])
-            else:
-                print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'buffer_seconds' érték: {loaded_settings['buffer_seconds']} (1-10 között kell lennie)")
-                validation_failed = True
-
-        if 'minimum_samples' in loaded_settings:
-            if isinstance(loaded_settings['minimum_samples'], (int, float)) and not isinstance(loaded_settings['minimum_samples'], bool) and loaded_settings['minimum_samples'] > 0:
-                settings['minimum_samples'] = int(loaded_settings['minimum_samples'])
-            else:
-                print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'minimum_samples' érték: {loaded_settings['minimum_samples']} (0-nál nagyobb kell legyen)")
-                validation_failed = True
-
-        if 'dropout_timeout' in loaded_settings:
-            if isinstance(loaded_settings['dropout_timeout'], (int, float)) and not isinstance(loaded_settings['dropout_timeout'], bool) and loaded_settings['dropout_timeout'] > 0:
-                settings['dropout_timeout'] = int(loaded_settings['dropout_timeout'])
-            else:
-                print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'dropout_timeout' érték: {loaded_settings['dropout_timeout']} (0-nál nagyobb kell legyen)")
-                validation_failed = True
-
-        if 'zero_power_immediate' in loaded_settings:
-            if isinstance(loaded_settings['zero_power_immediate'], bool):
-                settings['zero_power_immediate'] = loaded_settings['zero_power_immediate']
-            else:
-                print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'zero_power_immediate' érték: {loaded_settings['zero_power_immediate']} (true vagy false kell legyen)")
-                validation_failed = True
+        validation_failed = not _apply_settings_rules(loaded_settings, settings, SETTINGS_SCHEMA)
 
-        if 'zone_thresholds' in loaded_settings:
-            if isinstance(loaded_settings['zone_thresholds'], dict):
-                z_thresholds = loaded_settings['zone_thresholds']
-                if 'z1_max_percent' in z_thresholds:
-                    if isinstance(z_thresholds['z1_max_percent'], (int, float)) and 1 <= z_thresholds['z1_max_percent'] <= 100:
-                        settings['zone_thresholds']['z1_max_percent'] = int(z_thresholds['z1_max_percent'])
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'z1_max_percent' érték: {z_thresholds['z1_max_percent']} (1-100 között kell lennie)")
-                        validation_failed = True
-                if 'z2_max_percent' in z_thresholds:
-                    if isinstance(z_thresholds['z2_max_percent'], (int, float)) and 1 <= z_thresholds['z2_max_percent'] <= 100:
-                        settings['zone_thresholds']['z2_max_percent'] = int(z_thresholds['z2_max_percent'])
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'z2_max_percent' érték: {z_thresholds['z2_max_percent']} (1-100 között kell lennie)")
-                        validation_failed = True
-                if settings['zone_thresholds']['z1_max_percent'] >= settings['zone_thresholds']['z2_max_percent']:
-                    print(f"⚠ FIGYELMEZTETÉS: z1_max_percent >= z2_max_percent! Alapértelmezett zóna határok használata.")
-                    settings['zone_thresholds'] = copy.deepcopy(DEFAULT_SETTINGS['zone_thresholds'])
+        for section, rules in SETTINGS_SECTION_SCHEMAS.items():
+            if section not in loaded_settings:
+                continue
+            if isinstance(loaded_settings[section], dict):
+                if not _apply_settings_rules(loaded_settings[section], settings[section], rules):
                     validation_failed = True
             else:
-                print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'zone_thresholds' formátum")
+                logger.warning("Érvénytelen '%s' formátum", section)
                 validation_failed = True
 
-        if 'ble' in loaded_settings:
-            if isinstance(loaded_settings['ble'], dict):
-                ble_settings = loaded_settings['ble']
-                
-                if 'device_name' in ble_settings:
-                    if isinstance(ble_settings['device_name'], str) and len(ble_settings['device_name']) > 0:
-                        settings['ble']['device_name'] = ble_settings['device_name']
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'device_name' érték")
-                        validation_failed = True
-                if 'scan_timeout' in ble_settings:
-                    if isinstance(ble_settings['scan_timeout'], (int, float)) and 1 <= ble_settings['scan_timeout'] <= 60:
-                        settings['ble']['scan_timeout'] = int(ble_settings['scan_timeout'])
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'scan_timeout' érték: {ble_settings['scan_timeout']} (1-60 között kell lennie)")
-                        validation_failed = True
-                if 'connection_timeout' in ble_settings:
-                    if isinstance(ble_settings['connection_timeout'], (int, float)) and 1 <= ble_settings['connection_timeout'] <= 60:
-                        settings['ble']['connection_timeout'] = int(ble_settings['connection_timeout'])
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'connection_timeout' érték: {ble_settings['connection_timeout']} (1-60 között kell lennie)")
-                        validation_failed = True
-                if 'reconnect_interval' in ble_settings:
-                    if isinstance(ble_settings['reconnect_interval'], (int, float)) and 1 <= ble_settings['reconnect_interval'] <= 60:
-                        settings['ble']['reconnect_interval'] = int(ble_settings['reconnect_interval'])
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'reconnect_interval' érték: {ble_settings['reconnect_interval']} (1-60 között kell lennie)")
-                        validation_failed = True
-                if 'max_retries' in ble_settings:
-                    if isinstance(ble_settings['max_retries'], (int, float)) and 1 <= ble_settings['max_retries'] <= 100:
-                        settings['ble']['max_retries'] = int(ble_settings['max_retries'])
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'max_retries' érték: {ble_settings['max_retries']} (1-100 között kell lennie)")
-                        validation_failed = True
-                if 'command_timeout' in ble_settings:
-                    if isinstance(ble_settings['command_timeout'], (int, float)) and 1 <= ble_settings['command_timeout'] <= 30:
-                        settings['ble']['command_timeout'] = int(ble_settings['command_timeout'])
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'command_timeout' érték: {ble_settings['command_timeout']} (1-30 között kell lennie)")
-                        validation_failed = True
-                if 'service_uuid' in ble_settings:
-                    if isinstance(ble_settings['service_uuid'], str) and len(ble_settings['service_uuid']) > 0:
-                        settings['ble']['service_uuid'] = ble_settings['service_uuid']
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'service_uuid' érték")
-                        validation_failed = True
-                if 'characteristic_uuid' in ble_settings:
-                    if isinstance(ble_settings['characteristic_uuid'], str) and len(ble_settings['characteristic_uuid']) > 0:
-                        settings['ble']['characteristic_uuid'] = ble_settings['characteristic_uuid']
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'characteristic_uuid' érték")
-                        validation_failed = True
-                if 'pin_code' in ble_settings:
-                    if ble_settings['pin_code'] is None:
-                        settings['ble']['pin_code'] = None
-                    elif isinstance(ble_settings['pin_code'], int) and not isinstance(ble_settings['pin_code'], bool) and 0 <= ble_settings['pin_code'] <= 999999:
-                        settings['ble']['pin_code'] = str(ble_settings['pin_code'])
-                    elif isinstance(ble_settings['pin_code'], str) and len(ble_settings['pin_code']) > 0 and len(ble_settings['pin_code']) <= 20 and ble_settings['pin_code'].isdigit():
-                        settings['ble']['pin_code'] = ble_settings['pin_code']
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'pin_code' érték: {ble_settings['pin_code']} (0-999999 közötti egész szám, számjegyekből álló szöveg, vagy null kell legyen)")
-                        validation_failed = True
-            else:
-                print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'ble' formátum")
+        # Mezők közötti összefüggések – ezek nem fejezhetők ki mezőnkénti sémával
+        if isinstance(loaded_settings.get('zone_thresholds'), dict):
+            if settings['zone_thresholds']['z1_max_percent'] >= settings['zone_thresholds']['z2_max_percent']:
+                logger.warning("z1_max_percent >= z2_max_percent! Alapértelmezett zóna határok használata.")
+                settings['zone_thresholds'] = default_settings()['zone_thresholds']
                 validation_failed = True
 
-        if 'data_source' in loaded_settings:
-            if isinstance(loaded_settings['data_source'], dict):
-                ds = loaded_settings['data_source']
-
-                if 'power_source' in ds:
-                    if ds['power_source'] in ('antplus', 'ble', 'zwift_udp'):
-                        settings['data_source']['power_source'] = ds['power_source']
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'power_source' érték: {ds['power_source']} ('antplus', 'ble' vagy 'zwift_udp' kell legyen)")
-                        validation_failed = True
-
-                if 'hr_source' in ds:
-                    if ds['hr_source'] in ('antplus', 'ble', 'zwift_udp'):
-                        settings['data_source']['hr_source'] = ds['hr_source']
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'hr_source' érték: {ds['hr_source']} ('antplus', 'ble' vagy 'zwift_udp' kell legyen)")
-                        validation_failed = True
-
-                if 'ble_power_device_name' in ds:
-                    if ds['ble_power_device_name'] is None or (isinstance(ds['ble_power_device_name'], str) and len(ds['ble_power_device_name']) > 0):
-                        settings['data_source']['ble_power_device_name'] = ds['ble_power_device_name']
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'ble_power_device_name' érték")
-                        validation_failed = True
-
-                if 'ble_hr_device_name' in ds:
-                    if ds['ble_hr_device_name'] is None or (isinstance(ds['ble_hr_device_name'], str) and len(ds['ble_hr_device_name']) > 0):
-                        settings['data_source']['ble_hr_device_name'] = ds['ble_hr_device_name']
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'ble_hr_device_name' érték")
-                        validation_failed = True
-
-                for field in [
-                    'ble_power_scan_timeout',
-                    'ble_power_reconnect_interval',
-                    'ble_power_max_retries',
-                    'ble_hr_scan_timeout',
-                    'ble_hr_reconnect_interval',
-                    'ble_hr_max_retries',
-                ]:
-                    if field in ds:
-                        max_val = 100 if 'max_retries' in field else 60
-                        if isinstance(ds[field], int) and not isinstance(ds[field], bool) and 1 <= ds[field] <= max_val:
-                            settings['data_source'][field] = ds[field]
-                        else:
-                            print(f"⚠ FIGYELMEZTETÉS: Érvénytelen '{field}' érték: {ds[field]} (1-{max_val} között kell lennie)")
-                            validation_failed = True
-
-                if 'zwift_udp_buffer_seconds' in ds:
-                    if isinstance(ds['zwift_udp_buffer_seconds'], int) and not isinstance(ds['zwift_udp_buffer_seconds'], bool) and 1 <= ds['zwift_udp_buffer_seconds'] <= 60:
-                        settings['data_source']['zwift_udp_buffer_seconds'] = ds['zwift_udp_buffer_seconds']
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'zwift_udp_buffer_seconds' érték: {ds['zwift_udp_buffer_seconds']} (1-60 közötti egész szám kell legyen)")
-                        validation_failed = True
-
-                if 'zwift_udp_minimum_samples' in ds:
-                    if isinstance(ds['zwift_udp_minimum_samples'], int) and not isinstance(ds['zwift_udp_minimum_samples'], bool) and 1 <= ds['zwift_udp_minimum_samples'] <= 20:
-                        settings['data_source']['zwift_udp_minimum_samples'] = ds['zwift_udp_minimum_samples']
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'zwift_udp_minimum_samples' érték: {ds['zwift_udp_minimum_samples']} (1-20 közötti egész szám kell legyen)")
-                        validation_failed = True
-
-                if 'zwift_udp_dropout_timeout' in ds:
-                    if isinstance(ds['zwift_udp_dropout_timeout'], int) and not isinstance(ds['zwift_udp_dropout_timeout'], bool) and 1 <= ds['zwift_udp_dropout_timeout'] <= 120:
-                        settings['data_source']['zwift_udp_dropout_timeout'] = ds['zwift_udp_dropout_timeout']
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'zwift_udp_dropout_timeout' érték: {ds['zwift_udp_dropout_timeout']} (1-120 közötti egész szám kell legyen)")
-                        validation_failed = True
-
-                zwift_buf_size = settings['data_source']['zwift_udp_buffer_seconds'] * self.BUFFER_RATE_HZ
-                if settings['data_source']['zwift_udp_minimum_samples'] > zwift_buf_size:
-                    print(f"⚠ FIGYELMEZTETÉS: 'zwift_udp_minimum_samples' ({settings['data_source']['zwift_udp_minimum_samples']}) nagyobb mint Zwift UDP buffer méret ({zwift_buf_size})!")
-                    settings['data_source']['zwift_udp_minimum_samples'] = zwift_buf_size
-                    validation_failed = True
-
-                ds_known_keys = {
-                    'power_source', 'hr_source',
-                    'ble_power_device_name', 'ble_power_scan_timeout',
-                    'ble_power_reconnect_interval', 'ble_power_max_retries',
-                    'ble_hr_device_name', 'ble_hr_scan_timeout',
-                    'ble_hr_reconnect_interval', 'ble_hr_max_retries',
-                    'zwift_udp_port', 'zwift_udp_host',
-                    'zwift_udp_buffer_seconds', 'zwift_udp_minimum_samples', 'zwift_udp_dropout_timeout',
-                }
-                ds_unknown = set(ds.keys()) - ds_known_keys
-                if ds_unknown:
-                    print(f"⚠ FIGYELMEZTETÉS: Ismeretlen data_source mező(k): {', '.join(ds_unknown)}")
-
-                # Figyelmeztetés ha BLE forrás van beállítva de nincs eszköznév
-                if settings['data_source']['power_source'] == 'ble' and not settings['data_source'].get('ble_power_device_name'):
-                    print(f"⚠ FIGYELMEZTETÉS: power_source='ble' de 'ble_power_device_name' nincs megadva!")
-                if settings['data_source']['hr_source'] == 'ble' and not settings['data_source'].get('ble_hr_device_name'):
-                    print(f"⚠ FIGYELMEZTETÉS: hr_source='ble' de 'ble_hr_device_name' nincs megadva!")
-
-                # Zwift UDP port validáció
-                if 'zwift_udp_port' in ds:
-                    if isinstance(ds['zwift_udp_port'], int) and not isinstance(ds['zwift_udp_port'], bool) and 1024 <= ds['zwift_udp_port'] <= 65535:
-                        settings['data_source']['zwift_udp_port'] = ds['zwift_udp_port']
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'zwift_udp_port' érték: {ds['zwift_udp_port']} (1024-65535 közötti egész szám kell legyen)")
-                        validation_failed = True
-
-                # Zwift UDP host validáció
-                if 'zwift_udp_host' in ds:
-                    if isinstance(ds['zwift_udp_host'], str) and len(ds['zwift_udp_host']) > 0:
-                        settings['data_source']['zwift_udp_host'] = ds['zwift_udp_host']
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'zwift_udp_host' érték: {ds['zwift_udp_host']} (nem üres szöveg kell legyen)")
-                        validation_failed = True
-            else:
-                print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'data_source' formátum")
+        if isinstance(loaded_settings.get('data_source'), dict):
+            ds = loaded_settings['data_source']
+            zwift_buf_size = settings['data_source']['zwift_udp_buffer_seconds'] * self.BUFFER_RATE_HZ
+            if settings['data_source']['zwift_udp_minimum_samples'] > zwift_buf_size:
+                logger.warning("'zwift_udp_minimum_samples' (%s) nagyobb mint Zwift UDP buffer méret (%s)!",
+                               settings['data_source']['zwift_udp_minimum_samples'], zwift_buf_size)
+                settings['data_source']['zwift_udp_minimum_samples'] = zwift_buf_size
                 validation_failed = True
 
-        if 'heart_rate_zones' in loaded_settings:
-            if isinstance(loaded_settings['heart_rate_zones'], dict):
-                hrz = loaded_settings['heart_rate_zones']
-                if 'enabled' in hrz:
-                    if isinstance(hrz['enabled'], bool):
-                        settings['heart_rate_zones']['enabled'] = hrz['enabled']
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'heart_rate_zones.enabled' érték (true vagy false kell legyen)")
-                        validation_failed = True
-                if 'max_hr' in hrz:
-                    if isinstance(hrz['max_hr'], int) and not isinstance(hrz['max_hr'], bool) and 100 <= hrz['max_hr'] <= 220:
-                        settings['heart_rate_zones']['max_hr'] = hrz['max_hr']
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'max_hr' érték: {hrz['max_hr']} (100-220 közötti egész szám kell legyen)")
-                        validation_failed = True
-                if 'resting_hr' in hrz:
-                    if isinstance(hrz['resting_hr'], int) and not isinstance(hrz['resting_hr'], bool) and 30 <= hrz['resting_hr'] <= 100:
-                        settings['heart_rate_zones']['resting_hr'] = hrz['resting_hr']
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'resting_hr' érték: {hrz['resting_hr']} (30-100 közötti egész szám kell legyen)")
-                        validation_failed = True
-                if 'zone_mode' in hrz:
-                    if hrz['zone_mode'] in ('hr_only', 'higher_wins', 'power_only'):
-                        settings['heart_rate_zones']['zone_mode'] = hrz['zone_mode']
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'zone_mode' érték: {hrz['zone_mode']} ('hr_only', 'higher_wins' vagy 'power_only' kell legyen)")
-                        validation_failed = True
-                if 'z1_max_percent' in hrz:
-                    if isinstance(hrz['z1_max_percent'], int) and not isinstance(hrz['z1_max_percent'], bool) and 1 <= hrz['z1_max_percent'] <= 100:
-                        settings['heart_rate_zones']['z1_max_percent'] = hrz['z1_max_percent']
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'heart_rate_zones.z1_max_percent' érték: {hrz['z1_max_percent']} (1-100 között kell lennie)")
-                        validation_failed = True
-                if 'z2_max_percent' in hrz:
-                    if isinstance(hrz['z2_max_percent'], int) and not isinstance(hrz['z2_max_percent'], bool) and 1 <= hrz['z2_max_percent'] <= 100:
-                        settings['heart_rate_zones']['z2_max_percent'] = hrz['z2_max_percent']
-                    else:
-                        print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'heart_rate_zones.z2_max_percent' érték: {hrz['z2_max_percent']} (1-100 között kell lennie)")
-                        validation_failed = True
-                if settings['heart_rate_zones']['z1_max_percent'] >= settings['heart_rate_zones']['z2_max_percent']:
-                    print(f"⚠ FIGYELMEZTETÉS: HR z1_max_percent >= z2_max_percent! Alapértelmezett HR zóna határok használata.")
-                    settings['heart_rate_zones']['z1_max_percent'] = DEFAULT_SETTINGS['heart_rate_zones']['z1_max_percent']
-                    settings['heart_rate_zones']['z2_max_percent'] = DEFAULT_SETTINGS['heart_rate_zones']['z2_max_percent']
-                    validation_failed = True
-                max_hr = settings['heart_rate_zones']['max_hr']
-                resting_hr = settings['heart_rate_zones']['resting_hr']
-                z1_max = max_hr * settings['heart_rate_zones']['z1_max_percent'] / 100
-                if resting_hr >= z1_max:
-                    print(f"⚠ FIGYELMEZTETÉS: 'resting_hr' ({resting_hr}) >= z1_max ({z1_max:.0f})! Alapértelmezett HR zóna határok használata.")
-                    settings['heart_rate_zones']['resting_hr'] = DEFAULT_SETTINGS['heart_rate_zones']['resting_hr']
-                    settings['heart_rate_zones']['z1_max_percent'] = DEFAULT_SETTINGS['heart_rate_zones']['z1_max_percent']
-                    settings['heart_rate_zones']['z2_max_percent'] = DEFAULT_SETTINGS['heart_rate_zones']['z2_max_percent']
-                    validation_failed = True
-            else:
-                print(f"⚠ FIGYELMEZTETÉS: Érvénytelen 'heart_rate_zones' formátum")
+            ds_unknown = ds.keys() - _KNOWN_DATA_SOURCE_KEYS
+            if ds_unknown:
+                logger.warning("Ismeretlen data_source mező(k): %s", ', '.join(ds_unknown))
+
+            # Figyelmeztetés ha BLE forrás van beállítva de nincs eszköznév
+            if settings['data_source']['power_source'] == 'ble' and not settings['data_source'].get('ble_power_device_name'):
+                logger.warning("power_source='ble' de 'ble_power_device_name' nincs megadva!")
+            if settings['data_source']['hr_source'] == 'ble' and not settings['data_source'].get('ble_hr_device_name'):
+                logger.warning("hr_source='ble' de 'ble_hr_device_name' nincs megadva!")
+
+        if isinstance(loaded_settings.get('heart_rate_zones'), dict):
+            if settings['heart_rate_zones']['z1_max_percent'] >= settings['heart_rate_zones']['z2_max_percent']:
+                logger.warning("HR z1_max_percent >= z2_max_percent! Alapértelmezett HR zóna határok használata.")
+                settings['heart_rate_zones']['z1_max_percent'] = DEFAULT_SETTINGS['heart_rate_zones']['z1_max_percent']
+                settings['heart_rate_zones']['z2_max_percent'] = DEFAULT_SETTINGS['heart_rate_zones']['z2_max_percent']
+                validation_failed = True
+            max_hr = settings['heart_rate_zones']['max_hr']
+            resting_hr = settings['heart_rate_zones']['resting_hr']
+            z1_max = max_hr * settings['heart_rate_zones']['z1_max_percent'] / 100
+            if resting_hr >= z1_max:
+                logger.warning("'resting_hr' (%s) >= z1_max (%.0f)! Alapértelmezett HR zóna határok használata.", resting_hr, z1_max)
+                settings['heart_rate_zones']['resting_hr'] = DEFAULT_SETTINGS['heart_rate_zones']['resting_hr']
+                settings['heart_rate_zones']['z1_max_percent'] = DEFAULT_SETTINGS['heart_rate_zones']['z1_max_percent']
+                settings['heart_rate_zones']['z2_max_percent'] = DEFAULT_SETTINGS['heart_rate_zones']['z2_max_percent']
                 validation_failed = True
 
         if settings['min_watt'] >= settings['max_watt']:
-            print(f"⚠ FIGYELMEZTETÉS: 'min_watt' >= 'max_watt'! Alapértelmezett értékek használata.")
+            logger.warning("'min_watt' >= 'max_watt'! Alapértelmezett értékek használata.")
             settings['min_watt'] = DEFAULT_SETTINGS['min_watt']
             settings['max_watt'] = DEFAULT_SETTINGS['max_watt']
             validation_failed = True
 
         buffer_size = settings['buffer_seconds'] * self.BUFFER_RATE_HZ
         if settings['minimum_samples'] > buffer_size:
-            print(f"⚠ FIGYELMEZTETÉS: 'minimum_samples' ({settings['minimum_samples']}) nagyobb mint buffer méret ({buffer_size})!")
+            logger.warning("'minimum_samples' (%s) nagyobb mint buffer méret (%s)!", settings['minimum_samples'], buffer_size)
             settings['minimum_samples'] = buffer_size
             validation_failed = True
 
-        known_keys = {'ftp', 'min_watt', 'max_watt', 'cooldown_seconds', 'buffer_seconds',
-                      'minimum_samples', 'dropout_timeout', 'zero_power_immediate',
-                      'zone_thresholds', 'ble', 'data_source',
-                      'heart_rate_zones'}
-        unknown_keys = set(loaded_settings.keys()) - known_keys
+        unknown_keys = loaded_settings.keys() - _KNOWN_SETTINGS_KEYS
         if unknown_keys:
-            print(f"⚠ FIGYELMEZTETÉS: Ismeretlen mező(k): {', '.join(unknown_keys)}")
+            logger.warning("Ismeretlen mező(k): %s", ', '.join(unknown_keys))
 
         if validation_failed:
-            print("\n⚠ HIBÁS BEÁLLÍTÁSOK! Érvényes értékek használata.")
+            logger.warning("HIBÁS BEÁLLÍTÁSOK! Érvényes értékek használata.")
 
         return settings
 
@@ -1060,7 +1478,7 @@ class PowerZoneController:
         """
         try:
             with open(settings_file, 'w', encoding='utf-8') as f:
-                json.dump(copy.deepcopy(DEFAULT_SETTINGS), f, indent=2, ensure_ascii=False)
+                json.dump(default_settings(), f, indent=2, ensure_ascii=False)
             print(f"✓ Alapértelmezett '{settings_file}' létrehozva.")
             print(f"  Szerkeszd a fájlt a beállítások módosításához: {os.path.abspath(settings_file)}")
         except PermissionError:
@@ -1102,21 +1520,61 @@ class PowerZoneController:
             3: (z2_max + 1, self.max_watt)
         }
 
+    @property
+    def zones(self):
+        """A teljesítmény zóna határok csak olvasható nézete.
+
+        Az inicializáláskor kiszámított _zone_hi ebből épül, ezért nem módosítható.
+
+        Visszaad:
+            Mapping: {0: (min, max), ...} formátumú zóna határok.
+        """
+        return self._zones
+
+    @property
+    def hr_zone_settings(self):
+        """A HR zóna beállítások csak olvasható nézete.
+
+        Az inicializáláskor kiolvasott _hr_cuts, _hr_enabled és _zone_mode
+        ebből épül, ezért nem módosítható.
+
+        Visszaad:
+            Mapping: A 'heart_rate_zones' beállítások.
+        """
+        return self._hr_zone_settings
+
+    # A functools.cached_property a példány-'__dict__'-be írna, és így minden
+    # példányon létrehozná azt; a lusta értékek ezért a _ble és _hr_zones slotokban élnek.
+    @property
+    def ble(self):
+        """A BLE kommunikációs réteg, első hozzáféréskor létrehozva.
+
+        Visszaad:
+            BLEController: A ventilátor vezérlő BLE kapcsolata.
+        """
+        ble = self._ble
+        if ble is None:
+            ble = self._ble = BLEController(self.cfg.ble)
+        return ble
+
     @property
     def hr_zones(self):
-        """Kiszámítja a HR zóna határokat bpm-ben.
+        """A HR zóna határok bpm-ben (első hozzáféréskor kiszámítva).
+
+        A cfg nem módosítható, így az eredmény gyorsítótárazható.
 
         Visszaad:
             dict: {'resting_hr': int, 'z1_max': int, 'z2_max': int}
         """
-        max_hr = self.hr_zone_settings['max_hr']
-        z1_max = int(max_hr * self.hr_zone_settings['z1_max_percent'] / 100)
-        z2_max = int(max_hr * self.hr_zone_settings['z2_max_percent'] / 100)
-        return {
-            'resting_hr': self.hr_zone_settings['resting_hr'],
-            'z1_max': z1_max,
-            'z2_max': z2_max,
-        }
+        zones = self._hr_zones
+        if zones is None:
+            hrz = self.cfg.heart_rate_zones
+            zones = self._hr_zones = {
+                'resting_hr': hrz.resting_hr,
+                'z1_max': int(hrz.max_hr * hrz.z1_max_percent / 100),
+                'z2_max': int(hrz.max_hr * hrz.z2_max_percent / 100),
+            }
+        return zones
 
     def get_hr_zone(self, hr):
         """Meghatározza a HR zónát (0–3) a megadott szívfrekvencia alapján.
@@ -1132,16 +1590,7 @@ class PowerZoneController:
         Visszaad:
             int: A zóna szintje (0–3).
         """
-        if hr == 0 or hr < self.hr_zone_settings['resting_hr']:
-            return 0
-        max_hr = self.hr_zone_settings['max_hr']
-        z1_boundary = max_hr * self.hr_zone_settings['z1_max_percent'] / 100
-        z2_boundary = max_hr * self.hr_zone_settings['z2_max_percent'] / 100
-        if hr < z1_boundary:
-            return 1
-        if hr < z2_boundary:
-            return 2
-        return 3
+        return bisect_right(self._hr_cuts, hr)
 
     def is_valid_power(self, power):
         """Ellenőrzi, hogy az érték érvényes teljesítmény adat-e.
@@ -1152,22 +1601,13 @@ class PowerZoneController:
         Visszaad:
             bool: True, ha szám, nem bool, nem NaN/Inf, nem negatív, és nem haladja meg a max_watt-ot.
         """
-        try:
-            if not isinstance(power, (int, float)):
+        t = type(power)
+        if t is not int and t is not float:
+            if t is bool or not isinstance(power, (int, float)):
                 return False
-            if isinstance(power, bool):
-                return False
-            if math.isnan(power) or math.isinf(power):
-                return False
-            if power < 0:
-                return False
-            if 0 < power < self.min_watt:
-                return False
-            if power > self.max_watt:
-                return False
-            return True
-        except Exception:
-            return False
+        # NaN-nal minden összehasonlítás hamis, ±Inf pedig kívül esik a
+        # [min_watt, max_watt] tartományon, így külön vizsgálat nem kell.
+        return power == 0 or self.min_watt <= power <= self.max_watt
 
     def get_zone_for_power(self, power):
         """Meghatározza a teljesítmény zónát (0–3) a megadott wattérték alapján.
@@ -1176,14 +1616,9 @@ class PowerZoneController:
             power (int|float): A teljesítmény wattban.
 
         Visszaad:
-            int: A zóna szintje (0–3). Ha egyik határon sem belül, Z3-at ad vissza.
+            int: A zóna szintje (0–3). A Z2 felső határa feletti érték Z3.
         """
-        if power == 0:
-            return 0
-        for zone, (min_p, max_p) in self.zones.items():
-            if min_p <= power <= max_p:
-                return zone
-        return 3
+        return bisect_left(self._zone_hi, power)
 
     def check_dropout(self):
         """Adatforrás kiesés detektálása és Z0-ra kapcsolás.
@@ -1191,9 +1626,9 @@ class PowerZoneController:
         Ha a legutóbbi adat óta eltelt idő eléri a dropout_timeout-ot,
         és az aktuális zóna nem 0, akkor Z0-ra vált és elküldi a BLE parancsot.
         Ez megakadályozza, hogy az utolsó zónán maradjon végtelen ideig.
-        Másodpercenként hívja a _dropout_check_loop.
+        A kiesési határidő lejártakor hívja a _dropout_check_loop.
         """
-        current_time = time.time()
+        current_time = time.monotonic()
         send_needed = False
         with self.state_lock:
             time_since_last_data = current_time - self.last_data_time
@@ -1201,7 +1636,7 @@ class PowerZoneController:
                 if self.current_zone is not None and self.current_zone != 0:
                     print(f"⚠ Adatforrás kiesett ({time_since_last_data:.1f}s) → LEVEL:0")
                     self.current_zone = 0
-                    self.cooldown_active = False
+                    self.cooldown_deadline = 0.0
                     self.pending_zone = None
                     self.power_buffer.clear()
                     self.hr_buffer.clear()
@@ -1210,7 +1645,28 @@ class PowerZoneController:
         if send_needed:
             self.ble.send_command_sync(0)
 
-    def check_cooldown_and_apply(self, new_zone):
+    @property
+    def cooldown_active(self):
+        """True, ha a cooldown timer fut (cooldown_deadline be van állítva)."""
+        return self.cooldown_deadline != 0.0
+
+    @cooldown_active.setter
+    def cooldown_active(self, active):
+        if not active:
+            self.cooldown_deadline = 0.0
+        elif not self.cooldown_deadline:
+            self.cooldown_deadline = time.monotonic() + self.cooldown_seconds
+
+    @property
+    def cooldown_start_time(self):
+        """A cooldown (esetleg felezéssel/duplázással eltolt) kezdete, a határidőből visszaszámolva."""
+        return self.cooldown_deadline - self.cooldown_seconds
+
+    @cooldown_start_time.setter
+    def cooldown_start_time(self, start_time):
+        self.cooldown_deadline = start_time + self.cooldown_seconds
+
+    def check_cooldown_and_apply(self, new_zone, now=None):
         """Ellenőrzi, hogy a cooldown lejárt-e, és szükség esetén alkalmazza az új zónát.
 
         Ha a cooldown_seconds idő eltelt, végrehajtja a zónaváltást.
@@ -1220,32 +1676,35 @@ class PowerZoneController:
 
         Paraméterek:
             new_zone (int): Az alkalmazni kívánt célzóna (0–3).
+            now (float|None): A hívó által már lekért time.monotonic() érték;
+                None esetén itt kérdezi le.
 
         Visszaad:
             int|None: A küldendő zóna szintje, ha zónaváltás történt; None egyébként.
         """
-        current_time = time.time()
+        current_time = time.monotonic() if now is None else now
         send_zone = None
+        # Mintánként többször olvasott mezők lokálisba emelve
+        current_zone = self.current_zone
+        deadline = self.cooldown_deadline
 
         # Zone increase during cooldown: cancel immediately
-        if new_zone >= self.current_zone:
-            self.cooldown_active = False
+        if new_zone >= current_zone:
+            self.cooldown_deadline = 0.0
             self.pending_zone = None
-            if new_zone > self.current_zone:
-                print(f"✓ Teljesítmény emelkedés: cooldown törölve (új zóna: {new_zone} >= jelenlegi: {self.current_zone})")
+            if new_zone > current_zone:
+                print(f"✓ Teljesítmény emelkedés: cooldown törölve (új zóna: {new_zone} >= jelenlegi: {current_zone})")
                 self.current_zone = new_zone
                 self.last_zone_change = current_time
                 return new_zone
             return None
 
-        time_elapsed = current_time - self.cooldown_start_time
-
-        if time_elapsed >= self.cooldown_seconds:
-            self.cooldown_active = False
+        if current_time >= deadline:
+            self.cooldown_deadline = 0.0
             target_zone = new_zone
 
-            if target_zone != self.current_zone:
-                print(f"✓ Cooldown lejárt! Zóna váltás: {self.current_zone} → {target_zone}")
+            if target_zone != current_zone:
+                print(f"✓ Cooldown lejárt! Zóna váltás: {current_zone} → {target_zone}")
                 self.current_zone = target_zone
                 self.last_zone_change = current_time
                 send_zone = target_zone
@@ -1254,27 +1713,26 @@ class PowerZoneController:
 
             self.pending_zone = None
         else:
-            remaining = self.cooldown_seconds - time_elapsed
-            should_print = (current_time - self.last_cooldown_print) >= self.COOLDOWN_PRINT_INTERVAL
+            remaining = deadline - current_time
+            old_pending = self.pending_zone
 
-            if new_zone != self.pending_zone and new_zone < self.current_zone:
-                old_pending = self.pending_zone
+            if new_zone != old_pending:
                 self.pending_zone = new_zone
 
                 if old_pending is not None and new_zone > old_pending:
                     # Pending zone increased → doubling
                     if self.can_double:
                         new_remaining = min(remaining * 2, self.cooldown_seconds)
-                        self.cooldown_start_time = current_time - (self.cooldown_seconds - new_remaining)
+                        self.cooldown_deadline = current_time + new_remaining
                         self.can_double = False
                         self.can_halve = True
                         print(f"🕐 Cooldown duplázva: {remaining:.0f}s → {new_remaining:.0f}s (pending zóna emelkedett: {old_pending} → {new_zone})")
                         remaining = new_remaining
-                elif new_zone == 0 or (self.current_zone - new_zone >= 2):
+                elif new_zone == 0 or (current_zone - new_zone >= 2):
                     # Big drop or zero → halving
                     if self.can_halve:
                         new_remaining = remaining / 2
-                        self.cooldown_start_time = current_time - (self.cooldown_seconds - new_remaining)
+                        self.cooldown_deadline = current_time + new_remaining
                         self.can_halve = False
                         self.can_double = True
                         print(f"🕐 Cooldown felezve: {remaining:.0f}s → {new_remaining:.0f}s (nagy zónaesés: {old_pending} → {new_zone})")
@@ -1282,13 +1740,14 @@ class PowerZoneController:
 
                 print(f"🕐 Cooldown aktív: még {remaining:.0f}s (várakozó zóna frissítve: {new_zone})")
                 self.last_cooldown_print = current_time
-            elif should_print and new_zone < self.current_zone:
-                print(f"🕐 Cooldown aktív: még {remaining:.0f}s (várakozó zóna: {self.pending_zone})")
+            elif current_time - self.last_cooldown_print >= self.COOLDOWN_PRINT_INTERVAL:
+                # Periodikus sor: a szöveg csak akkor készül el, ha ki is írjuk
+                print(f"🕐 Cooldown aktív: még {remaining:.0f}s (várakozó zóna: {old_pending})")
                 self.last_cooldown_print = current_time
 
         return send_zone
 
-    def should_change_zone(self, new_zone):
+    def should_change_zone(self, new_zone, now=None):
         """Eldönti, hogy szükséges-e zónaváltás, és kezeli a cooldown logikát.
 
         Zónaváltás szabályai:
@@ -1300,38 +1759,39 @@ class PowerZoneController:
 
         Paraméterek:
             new_zone (int): Az új célzóna (0–3).
+            now (float|None): A hívó által már lekért time.monotonic() érték;
+                None esetén itt kérdezi le.
 
         Visszaad:
             bool: True, ha azonnali zónaváltás szükséges; False, ha cooldown indul
                   vagy nincs szükség változtatásra.
         """
-        current_time = time.time()
+        current_time = time.monotonic() if now is None else now
+        current_zone = self.current_zone
 
         # --- 0W (leállás) kezelés explicit ---
-        # Megjegyzés: a new_zone == 0 ágat itt kezeljük le, mielőtt a cooldown_active
-        # vizsgálathoz érnénk. Ezért zero_power_immediate=True + cooldown_active=True
+        # Megjegyzés: a new_zone == 0 ágat itt kezeljük le, mielőtt a cooldown_deadline
+        # vizsgálathoz érnénk. Ezért zero_power_immediate=True + aktív cooldown
         # esetén is ez az ág fut le, és törli a cooldown-t (azonnali leállás).
         if new_zone == 0:
             if self.zero_power_immediate:
                 # Azonnali leállás (cooldown nélkül)
-                if self.current_zone != 0:
+                if current_zone != 0:
                     print(f"✓ 0W detektálva: azonnali leállás (cooldown nélkül)")
-                    self.cooldown_active = False
+                    self.cooldown_deadline = 0.0
                     self.pending_zone = None
                     return True
                 return False
             else:
                 # Normál leállás (cooldown szükséges)
-                if self.current_zone != 0:
-                    if not self.cooldown_active:
-                        self.cooldown_active = True
-                        self.cooldown_start_time = current_time
+                if current_zone != 0:
+                    if not self.cooldown_deadline:
                         self.can_halve = True
                         self.can_double = False
                         # Immediate halving at cooldown start: new_zone==0 is always a big drop
                         remaining = self.cooldown_seconds
                         new_remaining = remaining / 2
-                        self.cooldown_start_time = current_time - (self.cooldown_seconds - new_remaining)
+                        self.cooldown_deadline = current_time + new_remaining
                         self.can_halve = False
                         self.can_double = True
                         print(f"🕐 0W detektálva: cooldown indítva {self.cooldown_seconds}s (cél: 0)")
@@ -1340,9 +1800,9 @@ class PowerZoneController:
                         # Már aktív cooldown, de jött 0W (pending_zone váltás)
                         old_pending = self.pending_zone
                         if old_pending is not None and old_pending != 0 and self.can_halve:
-                            remaining = self.cooldown_seconds - (current_time - self.cooldown_start_time)
+                            remaining = self.cooldown_deadline - current_time
                             new_remaining = remaining / 2
-                            self.cooldown_start_time = current_time - (self.cooldown_seconds - new_remaining)
+                            self.cooldown_deadline = current_time + new_remaining
                             self.can_halve = False
                             self.can_double = True
                             print(f"🕐 Cooldown felezve: ... (nagy zónaesés: {old_pending} → 0)")
@@ -1353,35 +1813,34 @@ class PowerZoneController:
                     # Már 0-ban vagyunk, nincs teendő
                     return False
 
-        if self.cooldown_active:
-            if new_zone >= self.current_zone:
-                print(f"✓ Teljesítmény emelkedés: cooldown törölve (új zóna: {new_zone} >= jelenlegi: {self.current_zone})")
-                self.cooldown_active = False
+        if self.cooldown_deadline:
+            if new_zone >= current_zone:
+                print(f"✓ Teljesítmény emelkedés: cooldown törölve (új zóna: {new_zone} >= jelenlegi: {current_zone})")
+                self.cooldown_deadline = 0.0
                 self.pending_zone = None
-                if new_zone > self.current_zone:
+                if new_zone > current_zone:
                     return True
                 else:
                     return False
             return False
 
-        if new_zone == self.current_zone:
+        if new_zone == current_zone:
             return False
 
-        if new_zone > self.current_zone:
+        if new_zone > current_zone:
             return True
 
-        if new_zone < self.current_zone:
-            self.cooldown_active = True
-            self.cooldown_start_time = current_time
+        if new_zone < current_zone:
+            self.cooldown_deadline = current_time + self.cooldown_seconds
             self.pending_zone = new_zone
             self.can_halve = True
             self.can_double = False
             print(f"🕐 Cooldown indítva: {self.cooldown_seconds}s várakozás (cél: {new_zone})")
             # Immediate halving at cooldown start if big drop
-            if self.current_zone - new_zone >= 2:
+            if current_zone - new_zone >= 2:
                 remaining = self.cooldown_seconds
                 new_remaining = remaining / 2
-                self.cooldown_start_time = current_time - (self.cooldown_seconds - new_remaining)
+                self.cooldown_deadline = current_time + new_remaining
                 self.can_halve = False
                 self.can_double = True
                 print(f"🕐 Cooldown felezve: {remaining:.0f}s → {new_remaining:.0f}s (nagy zónaesés: None → {new_zone})")
@@ -1407,60 +1866,89 @@ class PowerZoneController:
         Paraméterek:
             power (int|float): Az azonnali teljesítmény wattban.
         """
-        send_zone = None
-        with self.state_lock:
-            if not self.is_valid_power(power):
-                print("⚠ FIGYELMEZTETÉS: Érvénytelen adat!")
-                return
-
-            current_time = time.time()
-            self.last_data_time = current_time
-
-            power = int(power)
-            self.power_buffer.append(power)
-
-            # minden módban (kivéve higher_wins) a bejövő adat kiírása (throttle-ölve, zóna nélkül)
-            zone_mode = self.hr_zone_settings.get('zone_mode', 'power_only') if self.hr_zone_settings.get('enabled', False) else 'power_only'
-            hr_is_fresh = (self.last_hr_data_time is not None and
-                           current_time - self.last_hr_data_time < self.dropout_timeout)
-
-            if zone_mode != 'higher_wins':
-                if current_time - self.last_power_print_time >= self.PRINT_THROTTLE_SECONDS:
-                    print(f"⚡ Teljesítmény: {power} watt")
-                    self.last_power_print_time = current_time
-
-            if len(self.power_buffer) < self.minimum_samples:
-                print(f"📊 Adatok gyűjtése: {len(self.power_buffer)}/{self.minimum_samples}")
-                return
+        # A validálás, a konverzió és a kiírás-throttle csak a hívó szál
+        # (egyetlen teljesítmény-forrás) saját adatát érinti, ezért lock nélkül fut.
+        if not self.is_valid_power(power):
+            # Hibás szenzor se árassza el a konzolt: legfeljebb másodpercenként
+            # egy sor, a közben eldobott minták számával.
+            self.invalid_power_count += 1
+            now = time.monotonic()
+            if now - self.last_invalid_power_print_time >= self.PRINT_THROTTLE_SECONDS:
+                if self.invalid_power_count > 1:
+                    print(f"⚠ FIGYELMEZTETÉS: Érvénytelen adat! ({self.invalid_power_count} minta)")
+                else:
+                    print("⚠ FIGYELMEZTETÉS: Érvénytelen adat!")
+                self.invalid_power_count = 0
+                self.last_invalid_power_print_time = now
+            return
 
-            avg_power = round(sum(self.power_buffer) / len(self.power_buffer))
-            new_power_zone = self.get_zone_for_power(avg_power)
-            self.current_power_zone = new_power_zone
-            self.current_avg_power = avg_power
+        power = int(power)
+        current_time = time.monotonic()
 
-            if zone_mode == 'hr_only':
-                return  # nincs átlag power kiírás, nincs zónaváltás
+        # minden módban (kivéve higher_wins) a bejövő adat kiírása (throttle-ölve, zóna nélkül)
+        zone_mode = self._zone_mode
+        if zone_mode != 'higher_wins':
+            if current_time - self.last_power_print_time >= self.PRINT_THROTTLE_SECONDS:
+                print(f"⚡ Teljesítmény: {power} watt")
+                self.last_power_print_time = current_time
 
-            if zone_mode == 'higher_wins':
-                if self.current_hr_zone is None or not hr_is_fresh:
-                    # HR nem elérhető/friss, power egyedül vezérli a ventilátort
-                    print(f"⚡ Átlag teljesítmény: {avg_power} watt | Power zóna: {new_power_zone} | Higher Wins!")
-                    new_zone = new_power_zone
+        # A puffert a dropout checker is üríti, a zóna/cooldown állapotot a HR
+        # szál is írja – ezek több mezős átmenetek, maradnak a lock alatt.
+        # A konzolra írás viszont a lock elengedése után történik (a stdout blokkolhat).
+        messages = []
+        try:
+            with self.state_lock:
+                self.last_data_time = current_time
+                self.power_buffer.append(power)
+
+                hr_is_fresh = (self.last_hr_data_time is not None and
+                               current_time - self.last_hr_data_time < self.dropout_timeout)
+
+                if len(self.power_buffer) < self.minimum_samples:
+                    messages.append(f"📊 Adatok gyűjtése: {len(self.power_buffer)}/{self.minimum_samples}")
+                    return
+
+                avg_power = round(self.power_buffer.mean())
+                new_power_zone = self.get_zone_for_power(avg_power)
+                self.current_power_zone = new_power_zone
+                self.current_avg_power = avg_power
+
+                if zone_mode == 'hr_only':
+                    return  # nincs átlag power kiírás, nincs zónaváltás
+
+                # Az átlag sor is throttle-ölve: a szöveg csak akkor készül el, ha ki is írjuk
+                show_avg = current_time - self.last_avg_power_print_time >= self.PRINT_THROTTLE_SECONDS
+                if zone_mode == 'higher_wins':
+                    if self.current_hr_zone is None or not hr_is_fresh:
+                        # HR nem elérhető/friss, power egyedül vezérli a ventilátort
+                        if show_avg:
+                            messages.append(f"⚡ Átlag teljesítmény: {avg_power} watt | Power zóna: {new_power_zone} | Higher Wins!")
+                            self.last_avg_power_print_time = current_time
+                        new_zone = new_power_zone
+                    else:
+                        # HR elérhető, a combined sor a process_heart_rate_data-ból jön
+                        new_zone = max(new_power_zone, self.current_hr_zone)
                 else:
-                    # HR elérhető, a combined sor a process_heart_rate_data-ból jön
-                    new_zone = max(new_power_zone, self.current_hr_zone)
-            else:
-                print(f"⚡ Átlag teljesítmény: {avg_power} watt | Power zóna: {new_power_zone}")
-                new_zone = new_power_zone
-
-            cooldown_send_zone = None
-            zone_change_send = None
-            if self.cooldown_active:
-                cooldown_send_zone = self.check_cooldown_and_apply(new_zone)
-            elif self.current_zone is None or self.should_change_zone(new_zone):
-                self.current_zone = new_zone
-                self.last_zone_change = current_time
-                zone_change_send = new_zone
+                    if show_avg:
+                        messages.append(f"⚡ Átlag teljesítmény: {avg_power} watt | Power zóna: {new_power_zone}")
+                        self.last_avg_power_print_time = current_time
+                    new_zone = new_power_zone
+
+                cooldown_send_zone = None
+                zone_change_send = None
+                if self.cooldown_deadline:
+                    cooldown_send_zone = self.check_cooldown_and_apply(new_zone, current_time)
+                elif new_zone == self.current_zone:
+                    # Állandósult állapot (a leggyakoribb eset): cooldown nélkül azonos
+                    # zónánál a should_change_zone úgyis False-t adna, mellékhatás nélkül.
+                    pass
+                elif self.current_zone is None or self.should_change_zone(new_zone, current_time):
+                    self.current_zone = new_zone
+                    self.last_zone_change = current_time
+                    zone_change_send = new_zone
+        finally:
+            for message in messages:
+                print(message)
 
         send_zone = cooldown_send_zone if cooldown_send_zone is not None else zone_change_send
         if send_zone is not None:
@@ -1480,73 +1968,92 @@ class PowerZoneController:
         Paraméterek:
             hr (int|float): A szívfrekvencia bpm-ben (érvényes: 1–220).
         """
-        try:
-            hr = int(hr)
-        except (TypeError, ValueError):
-            return
+        # Típusellenőrzés kivételkezelés helyett: a gyakori int eset egyetlen
+        # azonosság-vizsgálat. NaN/Inf és nem szám (pl. str, bool) elutasítva.
+        t = type(hr)
+        if t is not int:
+            if t is float or (t is not bool and isinstance(hr, (int, float))):
+                if not math.isfinite(hr):
+                    return
+                hr = int(hr)
+            else:
+                return
         if hr <= 0 or hr > 220:
             return
 
-        with self.state_lock:
-            self.current_heart_rate = hr
-            current_time = time.time()
-            self.last_hr_data_time = current_time
-
-            # hr_only módban az HR adat is frissítse a last_data_time-ot,
-            # különben a dropout checker Z0-ra kapcsol
-            zone_mode = self.hr_zone_settings.get('zone_mode', 'power_only') if self.hr_zone_settings.get('enabled', False) else 'power_only'
-            if zone_mode == 'hr_only':
-                self.last_data_time = current_time
-
-            if not self.hr_zone_settings.get('enabled', False):
-                if current_time - self.last_hr_print_time >= self.PRINT_THROTTLE_SECONDS:
-                    print(f"❤ Szívfrekvencia: {hr} bpm")
-                    self.last_hr_print_time = current_time
-                return
-
-            self.hr_buffer.append(hr)
-
-            # hr_only és power_only módban a bejövő adat kiírása (throttle-ölve, zóna nélkül)
-            if zone_mode in ('hr_only', 'power_only'):
-                if current_time - self.last_hr_print_time >= self.PRINT_THROTTLE_SECONDS:
-                    print(f"❤ HR: {hr} bpm")
-                    self.last_hr_print_time = current_time
-
-            if len(self.hr_buffer) < self.minimum_samples:
-                print(f"📊 HR adatok gyűjtése: {len(self.hr_buffer)}/{self.minimum_samples}")
-                return
-            avg_hr = round(sum(self.hr_buffer) / len(self.hr_buffer))
-            new_hr_zone = self.get_hr_zone(avg_hr)
-            self.current_hr_zone = new_hr_zone
-
-            # zone_mode already computed above – reuse instead of re-querying
-            if zone_mode == 'power_only':
-                return  # nincs átlag HR kiírás, nincs zónaváltás
-
-
-            if zone_mode == 'hr_only':
-                print(f"❤ Átlag HR: {avg_hr} bpm | HR zóna: {new_hr_zone}")
-                target_zone = new_hr_zone
-            else:  # higher_wins
-                power_is_fresh = (self.last_data_time is not None and
-                                  current_time - self.last_data_time < self.dropout_timeout)
-                if self.current_power_zone is not None and self.current_avg_power is not None and power_is_fresh:
-                    avg_power = self.current_avg_power
-                    power_zone = self.current_power_zone
-                    target_zone = max(power_zone, new_hr_zone)
-                    print(f"⚡ Átlag teljesítmény: {avg_power} watt | Power zóna: {power_zone} | ❤ Átlag HR: {avg_hr} bpm | HR zóna: {new_hr_zone} | Higher Wins!")
-                else:
+        # A konzolra írás a lock elengedése után történik (a stdout blokkolhat).
+        messages = []
+        try:
+            with self.state_lock:
+                self.current_heart_rate = hr
+                current_time = time.monotonic()
+                self.last_hr_data_time = current_time
+
+                # hr_only módban az HR adat is frissítse a last_data_time-ot,
+                # különben a dropout checker Z0-ra kapcsol
+                zone_mode = self._zone_mode
+                if zone_mode == 'hr_only':
+                    self.last_data_time = current_time
+
+                if not self._hr_enabled:
+                    if current_time - self.last_hr_print_time >= self.PRINT_THROTTLE_SECONDS:
+                        messages.append(f"❤ Szívfrekvencia: {hr} bpm")
+                        self.last_hr_print_time = current_time
+                    return
+
+                self.hr_buffer.append(hr)
+
+                # hr_only és power_only módban a bejövő adat kiírása (throttle-ölve, zóna nélkül)
+                if zone_mode in ('hr_only', 'power_only'):
+                    if current_time - self.last_hr_print_time >= self.PRINT_THROTTLE_SECONDS:
+                        messages.append(f"❤ HR: {hr} bpm")
+                        self.last_hr_print_time = current_time
+
+                if len(self.hr_buffer) < self.minimum_samples:
+                    messages.append(f"📊 HR adatok gyűjtése: {len(self.hr_buffer)}/{self.minimum_samples}")
+                    return
+                avg_hr = round(self.hr_buffer.mean())
+                new_hr_zone = self.get_hr_zone(avg_hr)
+                self.current_hr_zone = new_hr_zone
+
+                # zone_mode already computed above – reuse instead of re-querying
+                if zone_mode == 'power_only':
+                    return  # nincs átlag HR kiírás, nincs zónaváltás
+
+
+                # Az átlag sor is throttle-ölve: a szöveg csak akkor készül el, ha ki is írjuk
+                show_avg = current_time - self.last_hr_zone_print_time >= self.PRINT_THROTTLE_SECONDS
+                if show_avg:
+                    self.last_hr_zone_print_time = current_time
+                if zone_mode == 'hr_only':
+                    if show_avg:
+                        messages.append(f"❤ Átlag HR: {avg_hr} bpm | HR zóna: {new_hr_zone}")
                     target_zone = new_hr_zone
-                    print(f"❤ Átlag HR: {avg_hr} bpm | HR zóna: {new_hr_zone} | Higher Wins!")
-
-            cooldown_send_zone = None
-            zone_change_send = None
-            if self.cooldown_active:
-                cooldown_send_zone = self.check_cooldown_and_apply(target_zone)
-            elif self.current_zone is None or self.should_change_zone(target_zone):
-                self.current_zone = target_zone
-                self.last_zone_change = current_time
-                zone_change_send = target_zone
+                else:  # higher_wins
+                    power_is_fresh = (self.last_data_time is not None and
+                                      current_time - self.last_data_time < self.dropout_timeout)
+                    if self.current_power_zone is not None and self.current_avg_power is not None and power_is_fresh:
+                        avg_power = self.current_avg_power
+                        power_zone = self.current_power_zone
+                        target_zone = max(power_zone, new_hr_zone)
+                        if show_avg:
+                            messages.append(f"⚡ Átlag teljesítmény: {avg_power} watt | Power zóna: {power_zone} | ❤ Átlag HR: {avg_hr} bpm | HR zóna: {new_hr_zone} | Higher Wins!")
+                    else:
+                        target_zone = new_hr_zone
+                        if show_avg:
+                            messages.append(f"❤ Átlag HR: {avg_hr} bpm | HR zóna: {new_hr_zone} | Higher Wins!")
+
+                cooldown_send_zone = None
+                zone_change_send = None
+                if self.cooldown_deadline:
+                    cooldown_send_zone = self.check_cooldown_and_apply(target_zone, current_time)
+                elif self.current_zone is None or self.should_change_zone(target_zone, current_time):
+                    self.current_zone = target_zone
+                    self.last_zone_change = current_time
+                    zone_change_send = target_zone
+        finally:
+            for message in messages:
+                print(message)
 
         send_zone = cooldown_send_zone if cooldown_send_zone is not None else zone_change_send
         if send_zone is not None:
@@ -1655,20 +2162,18 @@ class BLEPowerReceiver:
             return
 
         logger.info(f"BLE Power keresés: {self.device_name}...")
-        devices = await BleakScanner.discover(timeout=self.scan_timeout)
-        device_addr = None
-        for d in devices:
-            if d.name == self.device_name:
-                device_addr = d.address
-                logger.info(f"BLE Power eszköz megtalálva: {d.name} ({d.address})")
-                break
-
-        if not device_addr:
+        _load_bleak()
+        # A keresés az első hirdetésnél véget ér, nem várja ki a scan_timeout-ot
+        device = await BleakScanner.find_device_by_name(self.device_name, timeout=self.scan_timeout)
+        if device is None:
             logger.error(f"BLE Power eszköz nem található: {self.device_name}")
             raise Exception(f"Device not found: {self.device_name}")
+        device_addr = device.address
+        logger.info(f"BLE Power eszköz megtalálva: {device.name} ({device_addr})")
 
         self._stop_event.clear()
-        async with BleakClient(device_addr) as client:
+        # Bontáskor a _stop_event ébreszti a várakozást (nincs periodikus lekérdezés)
+        async with BleakClient(device_addr, disconnected_callback=self._on_disconnect) as client:
             self.is_connected = True
             self._retry_count = 0
             logger.info(f"BLE Power csatlakozva: {device_addr}")
@@ -1678,14 +2183,14 @@ class BLEPowerReceiver:
                     if len(data) < 4:
                         return
                     # flags: 2 bytes LE; instantaneous power: 2 bytes LE signed int16
-                    power = int.from_bytes(data[2:4], byteorder='little', signed=True)
+                    power = _CPM_POWER.unpack_from(data, 2)[0]
                     self.controller.process_power_data(power)
                 except Exception as e:
-                    logger.warning(f"BLE Power notification hiba: {e}")
+                    logger.warning("BLE Power notification hiba: %s", e)
 
             await client.start_notify(self.CYCLING_POWER_MEASUREMENT_UUID, notification_handler)
-            while self.running.is_set() and client.is_connected and not self._stop_event.is_set():
-                await asyncio.sleep(1)
+            if self.running.is_set() and client.is_connected:
+                await self._stop_event.wait()
             try:
                 await client.stop_notify(self.CYCLING_POWER_MEASUREMENT_UUID)
             except Exception:
@@ -1693,6 +2198,17 @@ class BLEPowerReceiver:
 
         self.is_connected = False
 
+    def _on_disconnect(self, client):
+        """Bleak disconnected_callback: felébreszti a kapcsolatra váró ciklust.
+
+        A BLE szál loop-ján hívódik, ezért az asyncio.Event közvetlenül állítható.
+
+        Paraméterek:
+            client: A bontott BleakClient példány.
+        """
+        if self._stop_event is not None:
+            self._stop_event.set()
+
     def stop(self):
         """Leállítja a BLE power háttérszálat."""
         if not self.running.is_set():
@@ -1810,20 +2326,18 @@ class BLEHeartRateReceiver:
             return
 
         logger.info(f"BLE HR keresés: {self.device_name}...")
-        devices = await BleakScanner.discover(timeout=self.scan_timeout)
-        device_addr = None
-        for d in devices:
-            if d.name == self.device_name:
-                device_addr = d.address
-                logger.info(f"BLE HR eszköz megtalálva: {d.name} ({d.address})")
-                break
-
-        if not device_addr:
+        _load_bleak()
+        # A keresés az első hirdetésnél véget ér, nem várja ki a scan_timeout-ot
+        device = await BleakScanner.find_device_by_name(self.device_name, timeout=self.scan_timeout)
+        if device is None:
             logger.error(f"BLE HR eszköz nem található: {self.device_name}")
             raise Exception(f"Device not found: {self.device_name}")
+        device_addr = device.address
+        logger.info(f"BLE HR eszköz megtalálva: {device.name} ({device_addr})")
 
         self._stop_event.clear()
-        async with BleakClient(device_addr) as client:
+        # Bontáskor a _stop_event ébreszti a várakozást (nincs periodikus lekérdezés)
+        async with BleakClient(device_addr, disconnected_callback=self._on_disconnect) as client:
             self.is_connected = True
             self._retry_count = 0
             logger.info(f"BLE HR csatlakozva: {device_addr}")
@@ -1837,16 +2351,16 @@ class BLEHeartRateReceiver:
                     if flags & 0x01:
                         if len(data) < 3:
                             return
-                        hr = int.from_bytes(data[1:3], byteorder='little')
+                        hr = _HRM_UINT16.unpack_from(data, 1)[0]
                     else:
                         hr = data[1]
                     self.controller.process_heart_rate_data(hr)
                 except Exception as e:
-                    logger.warning(f"BLE HR notification hiba: {e}")
+                    logger.warning("BLE HR notification hiba: %s", e)
 
             await client.start_notify(self.HEART_RATE_MEASUREMENT_UUID, notification_handler)
-            while self.running.is_set() and client.is_connected and not self._stop_event.is_set():
-                await asyncio.sleep(1)
+            if self.running.is_set() and client.is_connected:
+                await self._stop_event.wait()
             try:
                 await client.stop_notify(self.HEART_RATE_MEASUREMENT_UUID)
             except Exception:
@@ -1854,6 +2368,17 @@ class BLEHeartRateReceiver:
 
         self.is_connected = False
 
+    def _on_disconnect(self, client):
+        """Bleak disconnected_callback: felébreszti a kapcsolatra váró ciklust.
+
+        A BLE szál loop-ján hívódik, ezért az asyncio.Event közvetlenül állítható.
+
+        Paraméterek:
+            client: A bontott BleakClient példány.
+        """
+        if self._stop_event is not None:
+            self._stop_event.set()
+
     def stop(self):
         """Leállítja a BLE HR háttérszálat."""
         if not self.running.is_set():
@@ -1883,6 +2408,8 @@ class ZwiftUDPReceiver:
 
     RECV_BUFFER = 4096
     SOCKET_TIMEOUT = 2.0
+    SOCKET_RCVBUF = 1 << 20
+    MAX_DRAIN = 64
 
     def __init__(self, settings, controller):
         ds = settings['data_source']
@@ -1922,6 +2449,10 @@ class ZwiftUDPReceiver:
     def _receive_loop(self):
         sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.SOCKET_RCVBUF)
+        except OSError as e:
+            logger.debug("Zwift UDP: SO_RCVBUF nem állítható: %s", e)
         sock.settimeout(self.SOCKET_TIMEOUT)
         try:
             sock.bind((self.host, self.port))
@@ -1934,7 +2465,7 @@ class ZwiftUDPReceiver:
             while self.running.is_set():
                 try:
                     raw, addr = sock.recvfrom(self.RECV_BUFFER)
-                    self._process_packet(raw)
+                    self._process_packet(self._latest_packet(sock, raw))
                 except socket.timeout:
                     continue
                 except Exception as e:
@@ -1944,6 +2475,37 @@ class ZwiftUDPReceiver:
             sock.close()
             logger.info("Zwift UDP socket lezárva")
 
+    def _latest_packet(self, sock, raw):
+        """Kiolvassa a socketben már várakozó csomagokat, és a legfrissebbet adja vissza.
+
+        A Zwift csomagok abszolút állapotot (aktuális power/HR) tartalmaznak,
+        nem változást, így torlódáskor a régebbiek feldolgozása felesleges.
+        Legfeljebb MAX_DRAIN csomagot olvas ki, hogy folyamatos forgalom mellett
+        is sorra kerüljön a feldolgozás. Az üres soron kívüli socket hibát
+        naplózza, és a legutolsó sikeresen fogadott csomagot adja vissza.
+
+        Paraméterek:
+            sock (socket.socket): A Zwift UDP socket.
+            raw (bytes): Az éppen fogadott csomag.
+
+        Visszaad:
+            bytes: A legutóbb beérkezett csomag.
+        """
+        sock.setblocking(False)
+        try:
+            for _ in range(self.MAX_DRAIN):
+                raw, _addr = sock.recvfrom(self.RECV_BUFFER)
+        except BlockingIOError:
+            # Kiürült a sor
+            pass
+        except OSError as e:
+            # A már fogadott csomag nem vész el a hiba miatt
+            if self.running.is_set():
+                logger.warning(f"Zwift UDP fogadási hiba: {e}")
+        finally:
+            sock.settimeout(self.SOCKET_TIMEOUT)
+        return raw
+
     def _process_packet(self, raw):
         """JSON csomag feldolgozása – validáció + controller értesítés.
 
@@ -1952,9 +2514,11 @@ class ZwiftUDPReceiver:
         Érvénytelen adatok nem kerülnek be az átlagolásba.
         """
         try:
-            data = json.loads(raw.decode('utf-8'))
+            # A bájtokat közvetlenül a (modul szinten egyszer kiválasztott)
+            # parser kapja, csomagonkénti str dekódolás nélkül.
+            data = _json_loads(raw)
         except (json.JSONDecodeError, UnicodeDecodeError) as e:
-            logger.debug(f"Zwift UDP: érvénytelen JSON: {e}")
+            logger.debug("Zwift UDP: érvénytelen JSON: %s", e)
             return
 
         if not isinstance(data, dict):
@@ -1964,31 +2528,31 @@ class ZwiftUDPReceiver:
 
         if self.process_power and 'power' in data:
             power = data['power']
-            if isinstance(power, (int, float)) and not isinstance(power, bool):
+            if _is_real_number(power):
                 power = int(power)
                 if 0 <= power <= 2500:
                     self.controller.process_power_data(power)
                     had_valid_data = True
                 else:
-                    logger.debug(f"Zwift UDP: power tartományon kívül: {power}")
+                    logger.debug("Zwift UDP: power tartományon kívül: %s", power)
             else:
-                logger.debug(f"Zwift UDP: érvénytelen power típus: {type(power)}")
+                logger.debug("Zwift UDP: érvénytelen power típus: %s", type(power))
 
         if self.process_hr and 'heartrate' in data:
             hr = data['heartrate']
-            if isinstance(hr, (int, float)) and not isinstance(hr, bool):
+            if _is_real_number(hr):
                 hr = int(hr)
                 if 0 <= hr <= 250:
                     self.controller.process_heart_rate_data(hr)
                     had_valid_data = True
                 else:
-                    logger.debug(f"Zwift UDP: heartrate tartományon kívül: {hr}")
+                    logger.debug("Zwift UDP: heartrate tartományon kívül: %s", hr)
             else:
-                logger.debug(f"Zwift UDP: érvénytelen heartrate típus: {type(hr)}")
+                logger.debug("Zwift UDP: érvénytelen heartrate típus: %s", type(hr))
 
         if had_valid_data:
             with self._state_lock:
-                self.last_data_time = time.time()
+                self.last_data_time = time.monotonic()
 
     def stop(self):
         if not self.running.is_set():
@@ -2011,11 +2575,15 @@ class DataSourceManager:
     Osztályváltozók:
         ANTPLUS_RECONNECT_DELAY (int): ANT+ újracsatlakozási várakozás (s).
         ANTPLUS_MAX_RETRIES (int): ANT+ maximális újracsatlakozási kísérletek.
+        MONITOR_CHECK_INTERVAL (float): A monitor szál ellenőrzési periódusa (s).
+        MONITOR_PRINT_INTERVAL (float): Az adatforrás státusz kiírási periódusa (s).
     """
 
     ANTPLUS_RECONNECT_DELAY = 5
     ANTPLUS_MAX_RETRIES = 10
     ANTPLUS_MAX_RETRY_COOLDOWN = 30    # ← ÚJ
+    MONITOR_CHECK_INTERVAL = 5.0
+    MONITOR_PRINT_INTERVAL = 30.0
 
     def __init__(self, settings, controller):
         """Inicializálja a DataSourceManager-t.
@@ -2032,12 +2600,16 @@ class DataSourceManager:
         self.antplus_node = None
         self.antplus_devices = []
         self.antplus_last_data = 0
+        # Adat típus → kezelő metódus; az openant betöltése után töltődik fel
+        self._antplus_handlers = {}
 
         self.ble_power_receiver = None
         self.ble_hr_receiver = None
         self.zwift_udp_receiver = None
 
         self.running = threading.Event()
+        # stop() állítja be: a monitor szál várakozása azonnal megszakad
+        self._stop_event = threading.Event()
         self.monitor_thread = None
         self.antplus_thread = None
 
@@ -2047,7 +2619,7 @@ class DataSourceManager:
         Paraméterek:
             device: Az ANT+ eszköz objektuma.
         """
-        self.antplus_last_data = time.time()
+        self.antplus_last_data = time.monotonic()
 
     def _on_antplus_data(self, page, page_name, data):
         """Callback: ANT+ adatcsomag érkezésekor hívódik meg.
@@ -2060,14 +2632,26 @@ class DataSourceManager:
             page_name (str): ANT+ adatlap neve.
             data (PowerData|HeartRateData): Az ANT+ adat objektuma.
         """
-        if isinstance(data, PowerData):
-            self.antplus_last_data = time.time()
-            power = data.instantaneous_power
-            self.controller.process_power_data(power)
-        elif isinstance(data, HeartRateData):
-            self.antplus_last_data = time.time()
-            hr = data.heart_rate
-            self.controller.process_heart_rate_data(hr)
+        handler = self._antplus_handlers.get(type(data))
+        if handler is not None:
+            self.antplus_last_data = time.monotonic()
+            handler(data)
+
+    def _on_antplus_power(self, data):
+        """ANT+ PowerData kezelése: a pillanatnyi teljesítményt adja át a controllernek.
+
+        Paraméterek:
+            data (PowerData): Az ANT+ teljesítmény adat objektuma.
+        """
+        self.controller.process_power_data(data.instantaneous_power)
+
+    def _on_antplus_hr(self, data):
+        """ANT+ HeartRateData kezelése: a szívfrekvenciát adja át a controllernek.
+
+        Paraméterek:
+            data (HeartRateData): Az ANT+ HR adat objektuma.
+        """
+        self.controller.process_heart_rate_data(data.heart_rate)
 
     def _register_antplus_device(self, device):
         """ANT+ eszköz regisztrálása – callback-ek beállítása.
@@ -2086,6 +2670,12 @@ class DataSourceManager:
         HeartRate monitor csak akkor regisztrálódik, ha hr_source == 'antplus'
         ÉS heart_rate_zones engedélyezett.
         """
+        _load_antplus()
+        # Csomagonként egyetlen dict keresés választ kezelőt (isinstance lánc helyett)
+        self._antplus_handlers = {
+            PowerData: self._on_antplus_power,
+            HeartRateData: self._on_antplus_hr,
+        }
         self.antplus_node = Node()
         self.antplus_node.set_network_key(0x00, ANTPLUS_NETWORK_KEY)
 
@@ -2245,29 +2835,38 @@ class DataSourceManager:
         """Adatforrás monitor háttérszál – státusz kiírása.
 
         30 másodpercenként kiírja az adatforrás státuszt a konzolra.
+        Az ellenőrzések monoton határidőhöz igazodnak (nem csúsznak el), a
+        várakozást a stop() a _stop_event-en keresztül azonnal megszakítja.
         """
         dropout_timeout = self.settings['dropout_timeout']
-        last_source_print = 0
+        # A forrás beállítások futás közben nem változnak: egyszer olvasva
+        power_source = self.ds_settings.get('power_source', 'antplus')
+        hr_source = self.ds_settings.get('hr_source', 'antplus')
+        uses_antplus = power_source == 'antplus' or hr_source == 'antplus'
+        uses_zwift_udp = power_source == 'zwift_udp' or hr_source == 'zwift_udp'
+        last_source_print = None
+        next_check = time.monotonic() + self.MONITOR_CHECK_INTERVAL
 
         while self.running.is_set():
-            time.sleep(5)
-
+            if self._stop_event.wait(max(0.0, next_check - time.monotonic())):
+                break
             if not self.running.is_set():
                 break
 
-            current_time = time.time()
-
-            antplus_has_data = (
-                self.antplus_last_data > 0 and
-                (current_time - self.antplus_last_data) < dropout_timeout
-            )
+            current_time = time.monotonic()
+            next_check += self.MONITOR_CHECK_INTERVAL
+            if next_check <= current_time:
+                # Hosszú kimaradás (pl. alvó állapot) után nem pótoljuk a kihagyott ciklusokat
+                next_check = current_time + self.MONITOR_CHECK_INTERVAL
 
-            if current_time - last_source_print >= 30:
+            if last_source_print is None or current_time - last_source_print >= self.MONITOR_PRINT_INTERVAL:
                 parts = []
-                power_source = self.ds_settings.get('power_source', 'antplus')
-                hr_source = self.ds_settings.get('hr_source', 'antplus')
-
-                if power_source == 'antplus' or hr_source == 'antplus':
+                if uses_antplus:
+                    antplus_last_data = self.antplus_last_data
+                    antplus_has_data = (
+                        antplus_last_data > 0 and
+                        (current_time - antplus_last_data) < dropout_timeout
+                    )
                     parts.append(f"ANT+: {'✓' if antplus_has_data else '✗'}")
                 if power_source == 'ble':
                     ble_power_ok = self.ble_power_receiver is not None and self.ble_power_receiver.is_connected
@@ -2275,10 +2874,11 @@ class DataSourceManager:
                 if hr_source == 'ble':
                     ble_hr_ok = self.ble_hr_receiver is not None and self.ble_hr_receiver.is_connected
                     parts.append(f"BLE HR: {'✓' if ble_hr_ok else '✗'}")
-                if power_source == 'zwift_udp' or hr_source == 'zwift_udp':
-                    zwift_udp_ok = (self.zwift_udp_receiver is not None and
-                                    self.zwift_udp_receiver.has_data and
-                                    (current_time - self.zwift_udp_receiver.last_data) < dropout_timeout)
+                if uses_zwift_udp:
+                    zwift = self.zwift_udp_receiver
+                    zwift_udp_ok = (zwift is not None and
+                                    zwift.has_data and
+                                    (current_time - zwift.last_data) < dropout_timeout)
                     parts.append(f"Zwift UDP: {'✓' if zwift_udp_ok else '✗'}")
 
                 print(f"📡 Adatforrás státusz | {' | '.join(parts)}")
@@ -2294,6 +2894,7 @@ class DataSourceManager:
             4. ANT+ szál (ha legalább az egyik forrás 'antplus')
             5. Adatforrás monitor szál
         """
+        self._stop_event.clear()
         self.running.set()
 
         power_source = self.ds_settings.get('power_source', 'antplus')
@@ -2330,6 +2931,7 @@ class DataSourceManager:
     def stop(self):
         """Leállítja az összes adatforrást."""
         self.running.clear()
+        self._stop_event.set()
 
         if self.ble_power_receiver:
             try:
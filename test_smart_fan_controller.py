@@ -1,7 +1,7 @@
 import json
 import os
 import time
-import copy
+import socket
 import tempfile
 import threading
 import unittest
@@ -36,10 +36,13 @@ import smart_fan_controller
 from smart_fan_controller import (
     PowerZoneController,
     BLEController,
+    BLEConfig,
     BLEPowerReceiver,
     BLEHeartRateReceiver,
     ZwiftUDPReceiver,
+    RollingBuffer,
     DEFAULT_SETTINGS,
+    default_settings,
 )
 
 
@@ -70,7 +73,7 @@ class TestPowerZoneControllerInit(unittest.TestCase):
 
     def test_valid_settings_loaded(self):
         """Test loading valid settings from file."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ftp'] = 200
         settings['cooldown_seconds'] = 60
         self._settings_file = self._create_settings_file(settings)
@@ -80,7 +83,7 @@ class TestPowerZoneControllerInit(unittest.TestCase):
 
     def test_invalid_ftp_uses_default(self):
         """Test that invalid FTP value falls back to default."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ftp'] = 9999  # out of 100-500 range
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -97,7 +100,7 @@ class TestPowerZoneControllerInit(unittest.TestCase):
 
     def test_zone_thresholds_z1_gte_z2(self):
         """Test that z1 >= z2 threshold reverts to defaults."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['zone_thresholds'] = {'z1_max_percent': 90, 'z2_max_percent': 60}
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -108,7 +111,7 @@ class TestPowerZoneControllerInit(unittest.TestCase):
 
     def test_min_watt_gte_max_watt_uses_default(self):
         """Test that min_watt >= max_watt reverts both to defaults."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['min_watt'] = 500
         settings['max_watt'] = 100
         self._settings_file = self._create_settings_file(settings)
@@ -121,7 +124,7 @@ class TestZoneCalculation(unittest.TestCase):
     """Test zone boundary calculation."""
 
     def _make_controller(self, ftp=180, z1_pct=60, z2_pct=89, max_watt=1000):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ftp'] = ftp
         settings['zone_thresholds']['z1_max_percent'] = z1_pct
         settings['zone_thresholds']['z2_max_percent'] = z2_pct
@@ -164,7 +167,7 @@ class TestGetZoneForPower(unittest.TestCase):
     """Test power-to-zone mapping."""
 
     def setUp(self):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         f = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
         json.dump(settings, f, indent=2)
         f.close()
@@ -194,6 +197,20 @@ class TestGetZoneForPower(unittest.TestCase):
         """Test exact boundary values."""
         self.assertEqual(self.controller.get_zone_for_power(1), 1)
 
+    def test_zones_are_read_only(self):
+        """zones cannot be changed, so the cached upper bounds never drift from it."""
+        with self.assertRaises(TypeError):
+            self.controller.zones[1] = (1, 50)
+        with self.assertRaises(AttributeError):
+            self.controller.zones = {}
+
+    def test_matches_zone_ranges_for_every_watt(self):
+        """Every integer watt maps to the zone whose (min, max) range contains it."""
+        zones = self.controller.zones
+        for power in range(0, self.controller.max_watt + 1):
+            expected = next(z for z, (lo, hi) in zones.items() if lo <= power <= hi)
+            self.assertEqual(self.controller.get_zone_for_power(power), expected, power)
+
     def test_very_high_power(self):
         """Power above max_watt still returns zone 3."""
         self.assertEqual(self.controller.get_zone_for_power(2000), 3)
@@ -203,7 +220,7 @@ class TestIsValidPower(unittest.TestCase):
     """Test power validation."""
 
     def setUp(self):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         f = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
         json.dump(settings, f, indent=2)
         f.close()
@@ -243,7 +260,7 @@ class TestCooldownLogic(unittest.TestCase):
     """Test cooldown behavior during zone transitions."""
 
     def setUp(self):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['cooldown_seconds'] = 10
         settings['minimum_samples'] = 1
         settings['buffer_seconds'] = 1
@@ -330,21 +347,58 @@ class TestCooldownLogic(unittest.TestCase):
         self.controller.can_halve = True
         self.controller.can_double = False
         self.controller.zero_power_immediate = False
-        t0 = time.time()
+        t0 = time.monotonic()
         self.controller.cooldown_start_time = t0 - 10  # 10s remaining
         self.controller.should_change_zone(0)
         self.assertEqual(self.controller.pending_zone, 0)
         self.assertFalse(self.controller.can_halve)
         self.assertTrue(self.controller.can_double)
-        elapsed = time.time() - self.controller.cooldown_start_time
+        elapsed = time.monotonic() - self.controller.cooldown_start_time
         remaining = self.controller.cooldown_seconds - elapsed
         self.assertAlmostEqual(remaining, 5, delta=0.5)
         
+class TestCooldownDeadline(unittest.TestCase):
+    """Cooldown state is a single deadline timestamp."""
+
+    def setUp(self):
+        self.controller = PowerZoneController(settings_file=None)
+        self.controller.current_zone = 3
+
+    def test_drop_sets_deadline(self):
+        t0 = time.monotonic()
+        self.assertFalse(self.controller.should_change_zone(2))
+        self.assertAlmostEqual(self.controller.cooldown_deadline,
+                               t0 + self.controller.cooldown_seconds, delta=0.5)
+        self.assertTrue(self.controller.cooldown_active)
+
+    def test_cancel_clears_deadline(self):
+        self.controller.should_change_zone(2)
+        self.controller.check_cooldown_and_apply(3)
+        self.assertEqual(self.controller.cooldown_deadline, 0.0)
+        self.assertFalse(self.controller.cooldown_active)
+
+    def test_sample_reads_clock_once(self):
+        """process_power_data passes its timestamp down to the cooldown logic."""
+        self.controller.ble.send_command_sync = lambda level: None
+        self.controller.minimum_samples = 1
+        self.controller.should_change_zone(2)
+        with patch('smart_fan_controller.time.monotonic', wraps=time.monotonic) as clock, \
+                patch('builtins.print'):
+            self.controller.process_power_data(120)
+        self.assertEqual(clock.call_count, 1)
+
+    def test_start_time_maps_to_deadline(self):
+        self.controller.cooldown_start_time = 1000.0
+        self.assertEqual(self.controller.cooldown_deadline,
+                         1000.0 + self.controller.cooldown_seconds)
+        self.assertEqual(self.controller.cooldown_start_time, 1000.0)
+
+
 class TestProcessPowerData(unittest.TestCase):
     """Test the main power data processing pipeline."""
 
     def setUp(self):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['cooldown_seconds'] = 10
         settings['minimum_samples'] = 1
         settings['buffer_seconds'] = 1
@@ -361,6 +415,14 @@ class TestProcessPowerData(unittest.TestCase):
         if os.path.exists(self._tmp):
             os.unlink(self._tmp)
 
+    def test_average_line_throttled(self):
+        """The average power line is printed at most once per PRINT_THROTTLE_SECONDS."""
+        with patch('builtins.print') as mock_print:
+            self.controller.process_power_data(150)
+            self.controller.process_power_data(150)
+        avg_lines = [c for c in mock_print.call_args_list if 'Átlag teljesítmény' in str(c)]
+        self.assertEqual(len(avg_lines), 1)
+
     def test_initial_zone_set(self):
         """First power data should set the initial zone."""
         self.controller.process_power_data(200)  # zone 3
@@ -414,11 +476,21 @@ class TestProcessPowerData(unittest.TestCase):
         self.assertEqual(self.controller.current_zone, 3)
         self.assertIn(3, self.sent_commands)
 
+    def test_steady_state_skips_should_change_zone(self):
+        """Same zone without cooldown does not consult should_change_zone."""
+        self.controller.process_power_data(200)  # zone 3
+        self.sent_commands.clear()
+        with patch.object(self.controller, 'should_change_zone') as mock_should:
+            self.controller.process_power_data(200)
+        mock_should.assert_not_called()
+        self.assertEqual(self.controller.current_zone, 3)
+        self.assertEqual(self.sent_commands, [])
+
     def test_updates_last_data_time(self):
         """Processing power data should update last_data_time."""
-        before = time.time()
+        before = time.monotonic()
         self.controller.process_power_data(100)
-        after = time.time()
+        after = time.monotonic()
         self.assertGreaterEqual(self.controller.last_data_time, before)
         self.assertLessEqual(self.controller.last_data_time, after)
 
@@ -427,7 +499,7 @@ class TestCheckCooldownAndApply(unittest.TestCase):
     """Test cooldown timer expiration logic."""
 
     def setUp(self):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['cooldown_seconds'] = 5
         settings['minimum_samples'] = 1
         settings['buffer_seconds'] = 1
@@ -446,7 +518,7 @@ class TestCheckCooldownAndApply(unittest.TestCase):
 
     def test_cooldown_expired_changes_zone(self):
         """After cooldown expires, zone should change to new value."""
-        self.controller.cooldown_start_time = time.time() - 10  # expired
+        self.controller.cooldown_start_time = time.monotonic() - 10  # expired
         result = self.controller.check_cooldown_and_apply(1)
         self.assertEqual(result, 1)
         self.assertFalse(self.controller.cooldown_active)
@@ -454,14 +526,14 @@ class TestCheckCooldownAndApply(unittest.TestCase):
 
     def test_cooldown_expired_same_zone_no_send(self):
         """After cooldown expires, if zone hasn't changed, return None."""
-        self.controller.cooldown_start_time = time.time() - 10
+        self.controller.cooldown_start_time = time.monotonic() - 10
         result = self.controller.check_cooldown_and_apply(3)  # same as current
         self.assertIsNone(result)
         self.assertFalse(self.controller.cooldown_active)
 
     def test_cooldown_not_expired(self):
         """During active cooldown, no zone change."""
-        self.controller.cooldown_start_time = time.time()  # just started
+        self.controller.cooldown_start_time = time.monotonic()  # just started
         result = self.controller.check_cooldown_and_apply(1)
         self.assertIsNone(result)
         self.assertTrue(self.controller.cooldown_active)
@@ -471,7 +543,7 @@ class TestAdaptiveCooldown(unittest.TestCase):
     """Test adaptive cooldown halving and doubling logic."""
 
     def setUp(self):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['cooldown_seconds'] = 20
         settings['minimum_samples'] = 1
         settings['buffer_seconds'] = 1
@@ -486,7 +558,7 @@ class TestAdaptiveCooldown(unittest.TestCase):
         self.controller.can_halve = True
         self.controller.can_double = False
         # Start cooldown with 10s remaining (10s elapsed of 20s total)
-        self.controller.cooldown_start_time = time.time() - 10
+        self.controller.cooldown_start_time = time.monotonic() - 10
 
     def tearDown(self):
         if os.path.exists(self._tmp):
@@ -495,22 +567,22 @@ class TestAdaptiveCooldown(unittest.TestCase):
     def test_halving_trigger_pending_zone_to_zero(self):
         """Test 1: pending_zone drops to 0 → remaining time is halved."""
         # 10s elapsed, 10s remaining → after halving: 5s remaining
-        t0 = time.time()
+        t0 = time.monotonic()
         self.controller.cooldown_start_time = t0 - 10
         self.controller.check_cooldown_and_apply(0)
         self.assertEqual(self.controller.pending_zone, 0)
         # New remaining ≈ 5s: cooldown_start_time should be ~(t0 - 15)
-        new_elapsed = time.time() - self.controller.cooldown_start_time
+        new_elapsed = time.monotonic() - self.controller.cooldown_start_time
         new_remaining = self.controller.cooldown_seconds - new_elapsed
         self.assertAlmostEqual(new_remaining, 5, delta=0.5)
 
     def test_halving_trigger_large_zone_drop(self):
         """Test 2: current_zone - pending_zone >= 2 → remaining time is halved."""
         # current_zone=3, new pending=1 → drop of 2 → halving
-        t0 = time.time()
+        t0 = time.monotonic()
         self.controller.cooldown_start_time = t0 - 10
         self.controller.check_cooldown_and_apply(1)
-        new_elapsed = time.time() - self.controller.cooldown_start_time
+        new_elapsed = time.monotonic() - self.controller.cooldown_start_time
         new_remaining = self.controller.cooldown_seconds - new_elapsed
         self.assertAlmostEqual(new_remaining, 5, delta=0.5)
 
@@ -520,17 +592,17 @@ class TestAdaptiveCooldown(unittest.TestCase):
         self.controller.pending_zone = 1
         self.controller.can_halve = False
         self.controller.can_double = True
-        t0 = time.time()
+        t0 = time.monotonic()
         # 10s elapsed, 10s remaining → after doubling: min(20, 20)=20s remaining
         self.controller.cooldown_start_time = t0 - 10
         self.controller.check_cooldown_and_apply(2)
-        new_elapsed = time.time() - self.controller.cooldown_start_time
+        new_elapsed = time.monotonic() - self.controller.cooldown_start_time
         new_remaining = self.controller.cooldown_seconds - new_elapsed
         self.assertAlmostEqual(new_remaining, 20, delta=0.5)
 
     def test_no_second_halving_after_halving(self):
         """Test 4: After halving, can_halve=False → second halving does not occur."""
-        t0 = time.time()
+        t0 = time.monotonic()
         self.controller.cooldown_start_time = t0 - 10
         # First halving (drop to zone 0): ~10s remaining → ~5s remaining
         self.controller.check_cooldown_and_apply(0)
@@ -549,7 +621,7 @@ class TestAdaptiveCooldown(unittest.TestCase):
         self.controller.pending_zone = 1
         self.controller.can_halve = False
         self.controller.can_double = True
-        t0 = time.time()
+        t0 = time.monotonic()
         self.controller.cooldown_start_time = t0 - 10
         # First doubling (pending zone 1 → 2)
         self.controller.check_cooldown_and_apply(2)
@@ -574,7 +646,7 @@ class TestAdaptiveCooldown(unittest.TestCase):
 
     def test_halving_enables_doubling(self):
         """Test 6: After halving, can_double=True."""
-        t0 = time.time()
+        t0 = time.monotonic()
         self.controller.cooldown_start_time = t0 - 10
         self.controller.check_cooldown_and_apply(0)
         self.assertTrue(self.controller.can_double)
@@ -584,7 +656,7 @@ class TestAdaptiveCooldown(unittest.TestCase):
         self.controller.pending_zone = 1
         self.controller.can_halve = False
         self.controller.can_double = True
-        t0 = time.time()
+        t0 = time.monotonic()
         self.controller.cooldown_start_time = t0 - 10
         self.controller.check_cooldown_and_apply(2)
         self.assertTrue(self.controller.can_halve)
@@ -595,10 +667,10 @@ class TestAdaptiveCooldown(unittest.TestCase):
         self.controller.pending_zone = 1
         self.controller.can_halve = False
         self.controller.can_double = True
-        t0 = time.time()
+        t0 = time.monotonic()
         self.controller.cooldown_start_time = t0 - 2
         self.controller.check_cooldown_and_apply(2)
-        new_elapsed = time.time() - self.controller.cooldown_start_time
+        new_elapsed = time.monotonic() - self.controller.cooldown_start_time
         new_remaining = self.controller.cooldown_seconds - new_elapsed
         self.assertAlmostEqual(new_remaining, 20, delta=0.5)
 
@@ -621,7 +693,7 @@ class TestAdaptiveCooldown(unittest.TestCase):
         self.controller.pending_zone = 1
         self.controller.can_halve = True
         self.controller.can_double = True  # force both enabled to test mutual exclusion
-        t0 = time.time()
+        t0 = time.monotonic()
         self.controller.cooldown_start_time = t0 - 10
         # new_zone=0: old_pending=1, new_zone=0 < old_pending → NOT an increase
         # → goes to elif branch → halving only
@@ -630,7 +702,7 @@ class TestAdaptiveCooldown(unittest.TestCase):
         self.assertFalse(self.controller.can_halve)
         self.assertTrue(self.controller.can_double)
         # Remaining should be halved (not doubled)
-        new_elapsed = time.time() - self.controller.cooldown_start_time
+        new_elapsed = time.monotonic() - self.controller.cooldown_start_time
         new_remaining = self.controller.cooldown_seconds - new_elapsed
         self.assertAlmostEqual(new_remaining, 5, delta=0.5)
 
@@ -638,7 +710,7 @@ class TestAdaptiveCooldown(unittest.TestCase):
         """Test 11: Small drop (current-pending=1, pending!=0) → no halving."""
         # current_zone=3, new pending=2: drop=1 < 2, pending!=0 → no halving
         self.controller.pending_zone = 3  # previous pending, to allow change
-        t0 = time.time()
+        t0 = time.monotonic()
         self.controller.cooldown_start_time = t0 - 10
         start_time = self.controller.cooldown_start_time
         self.controller.check_cooldown_and_apply(2)
@@ -647,7 +719,7 @@ class TestAdaptiveCooldown(unittest.TestCase):
 
     def test_cooldown_expires_correctly_after_halving(self):
         """Test 12: Cooldown expires at correct time after halving."""
-        t0 = time.time()
+        t0 = time.monotonic()
         # 10s elapsed, 10s remaining → after halving: 5s remaining
         self.controller.cooldown_start_time = t0 - 10
         self.controller.check_cooldown_and_apply(0)
@@ -677,7 +749,7 @@ class TestAdaptiveCooldown(unittest.TestCase):
         self.assertFalse(self.controller.can_halve)
         self.assertTrue(self.controller.can_double)
         # Remaining should be ~10s (half of 20s)
-        elapsed = time.time() - self.controller.cooldown_start_time
+        elapsed = time.monotonic() - self.controller.cooldown_start_time
         remaining = self.controller.cooldown_seconds - elapsed
         self.assertAlmostEqual(remaining, 10, delta=0.5)
 
@@ -692,7 +764,7 @@ class TestAdaptiveCooldown(unittest.TestCase):
         self.assertFalse(self.controller.can_halve)
         self.assertTrue(self.controller.can_double)
         # Remaining should be ~10s (half of 20s)
-        elapsed = time.time() - self.controller.cooldown_start_time
+        elapsed = time.monotonic() - self.controller.cooldown_start_time
         remaining = self.controller.cooldown_seconds - elapsed
         self.assertAlmostEqual(remaining, 10, delta=0.5)
 
@@ -706,7 +778,7 @@ class TestAdaptiveCooldown(unittest.TestCase):
         self.assertTrue(self.controller.can_halve)
         self.assertFalse(self.controller.can_double)
         # Remaining should be ~20s (full cooldown)
-        elapsed = time.time() - self.controller.cooldown_start_time
+        elapsed = time.monotonic() - self.controller.cooldown_start_time
         remaining = self.controller.cooldown_seconds - elapsed
         self.assertAlmostEqual(remaining, 20, delta=0.5)
 
@@ -715,7 +787,7 @@ class TestDropout(unittest.TestCase):
     """Test data source dropout detection."""
 
     def setUp(self):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['dropout_timeout'] = 2
         settings['minimum_samples'] = 1
         settings['buffer_seconds'] = 1
@@ -739,7 +811,7 @@ class TestDropout(unittest.TestCase):
         self.sent_commands.clear()
 
         # Simulate timeout
-        self.controller.last_data_time = time.time() - 5
+        self.controller.last_data_time = time.monotonic() - 5
         self.controller.check_dropout()
         self.assertEqual(self.controller.current_zone, 0)
         self.assertIn(0, self.sent_commands)
@@ -756,7 +828,7 @@ class TestDropout(unittest.TestCase):
     def test_dropout_at_zone_0_no_duplicate(self):
         """Dropout when already at zone 0 should not send duplicate."""
         self.controller.current_zone = 0
-        self.controller.last_data_time = time.time() - 5
+        self.controller.last_data_time = time.monotonic() - 5
         self.controller.check_dropout()
         self.assertEqual(len(self.sent_commands), 0)
 
@@ -776,7 +848,7 @@ class TestSettingsValidationBLE(unittest.TestCase):
 
     def test_invalid_scan_timeout_uses_default(self):
         """Invalid scan_timeout should fall back to default."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ble']['scan_timeout'] = 100
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -785,7 +857,7 @@ class TestSettingsValidationBLE(unittest.TestCase):
 
     def test_invalid_device_name_empty(self):
         """Empty device_name should fall back to default."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ble']['device_name'] = ''
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -794,7 +866,7 @@ class TestSettingsValidationBLE(unittest.TestCase):
 
     def test_minimum_samples_exceeds_buffer(self):
         """minimum_samples larger than buffer should be capped."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['buffer_seconds'] = 1  # buffer_size = 4
         settings['minimum_samples'] = 100
         self._settings_file = self._create_settings_file(settings)
@@ -807,7 +879,7 @@ class TestHeartRateData(unittest.TestCase):
     """Test heart rate data handling in PowerZoneController."""
 
     def setUp(self):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['minimum_samples'] = 1
         settings['buffer_seconds'] = 1
         f = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
@@ -859,6 +931,24 @@ class TestHeartRateData(unittest.TestCase):
         self.controller.process_heart_rate_data("abc")
         self.assertEqual(self.controller.current_heart_rate, 100)
 
+    def test_invalid_heart_rate_non_finite(self):
+        """NaN and infinite heart rates should be ignored without raising."""
+        self.controller.process_heart_rate_data(100)
+        self.controller.process_heart_rate_data(float('nan'))
+        self.controller.process_heart_rate_data(float('inf'))
+        self.assertEqual(self.controller.current_heart_rate, 100)
+
+    def test_invalid_heart_rate_numeric_string(self):
+        """A numeric string is not a heart rate sample."""
+        self.controller.process_heart_rate_data(100)
+        self.controller.process_heart_rate_data("120")
+        self.assertEqual(self.controller.current_heart_rate, 100)
+
+    def test_float_heart_rate_truncated(self):
+        """A finite float heart rate is accepted and truncated to int."""
+        self.controller.process_heart_rate_data(120.7)
+        self.assertEqual(self.controller.current_heart_rate, 120)
+
     def test_heart_rate_boundary_1(self):
         """HR of 1 should be valid."""
         self.controller.process_heart_rate_data(1)
@@ -875,7 +965,7 @@ class TestIsValidPowerExtended(unittest.TestCase):
     """Test extended power validation: bool, NaN, Inf."""
 
     def setUp(self):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         f = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
         json.dump(settings, f, indent=2)
         f.close()
@@ -914,12 +1004,19 @@ class TestIsValidPowerExtended(unittest.TestCase):
         """A normal positive watt value should be valid."""
         self.assertTrue(self.controller.is_valid_power(200))
 
+    def test_numeric_subclass_takes_slow_path(self):
+        """float/int subclasses are still validated by value."""
+        class Watts(float):
+            pass
+        self.assertTrue(self.controller.is_valid_power(Watts(200)))
+        self.assertFalse(self.controller.is_valid_power(Watts('nan')))
+
 
 class TestInvalidPowerDoesNotUpdateLastDataTime(unittest.TestCase):
     """Test that invalid power data does not update last_data_time."""
 
     def setUp(self):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['minimum_samples'] = 1
         settings['buffer_seconds'] = 1
         f = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
@@ -946,6 +1043,18 @@ class TestInvalidPowerDoesNotUpdateLastDataTime(unittest.TestCase):
         self.controller.process_power_data(float('nan'))
         self.assertEqual(self.controller.last_data_time, old_time)
 
+    def test_invalid_power_warning_throttled(self):
+        """A burst of invalid samples prints one warning, then reports the skipped count."""
+        with patch('builtins.print') as mock_print:
+            for _ in range(5):
+                self.controller.process_power_data(-1)
+            self.assertEqual(mock_print.call_count, 1)
+            self.controller.last_invalid_power_print_time -= self.controller.PRINT_THROTTLE_SECONDS
+            self.controller.process_power_data(-1)
+        self.assertEqual(mock_print.call_count, 2)
+        self.assertIn('5 minta', str(mock_print.call_args))
+        self.assertEqual(self.controller.invalid_power_count, 0)
+
     def test_valid_power_updates_last_data_time(self):
         """Valid power SHOULD update last_data_time."""
         old_time = self.controller.last_data_time
@@ -974,7 +1083,7 @@ class TestBLEPINSettings(unittest.TestCase):
 
     def test_valid_pin_code(self):
         """Valid pin_code in 0-999999 range should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ble']['pin_code'] = 123456
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -982,7 +1091,7 @@ class TestBLEPINSettings(unittest.TestCase):
 
     def test_pin_code_zero(self):
         """pin_code of 0 should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ble']['pin_code'] = 0
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -990,7 +1099,7 @@ class TestBLEPINSettings(unittest.TestCase):
 
     def test_pin_code_max(self):
         """pin_code of 999999 should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ble']['pin_code'] = 999999
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -998,7 +1107,7 @@ class TestBLEPINSettings(unittest.TestCase):
 
     def test_pin_code_null(self):
         """pin_code of null (None) should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ble']['pin_code'] = None
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -1006,7 +1115,7 @@ class TestBLEPINSettings(unittest.TestCase):
 
     def test_invalid_pin_code_too_large(self):
         """pin_code above 999999 should fall back to default."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ble']['pin_code'] = 1000000
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -1014,7 +1123,7 @@ class TestBLEPINSettings(unittest.TestCase):
 
     def test_invalid_pin_code_negative(self):
         """Negative pin_code should fall back to default."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ble']['pin_code'] = -1
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -1022,7 +1131,7 @@ class TestBLEPINSettings(unittest.TestCase):
 
     def test_invalid_pin_code_bool(self):
         """Boolean pin_code should be rejected."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ble']['pin_code'] = True
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -1030,21 +1139,21 @@ class TestBLEPINSettings(unittest.TestCase):
 
     def test_ble_controller_stores_pin_code(self):
         """BLEController should store string pin_code from settings."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ble']['pin_code'] = "123456"
         ble = BLEController(settings)
-        self.assertEqual(ble.pin_code, "123456")
+        self.assertEqual(ble.cfg.pin_code, "123456")
 
     def test_ble_controller_none_pin_code(self):
         """BLEController should store None pin_code."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ble']['pin_code'] = None
         ble = BLEController(settings)
-        self.assertIsNone(ble.pin_code)
+        self.assertIsNone(ble.cfg.pin_code)
 
     def test_pin_code_string(self):
         """String pin_code should be accepted and stored as string."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ble']['pin_code'] = "123456"
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -1052,7 +1161,7 @@ class TestBLEPINSettings(unittest.TestCase):
 
     def test_pin_code_string_leading_zero(self):
         """String pin_code with leading zeros should be preserved."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ble']['pin_code'] = "007"
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -1060,7 +1169,7 @@ class TestBLEPINSettings(unittest.TestCase):
 
     def test_pin_code_int_converted_to_string(self):
         """Integer pin_code should be converted to string."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ble']['pin_code'] = 123456
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -1069,7 +1178,7 @@ class TestBLEPINSettings(unittest.TestCase):
 
     def test_pin_code_int_zero_converted_to_string(self):
         """Integer pin_code 0 should be converted to string "0"."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ble']['pin_code'] = 0
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -1077,7 +1186,7 @@ class TestBLEPINSettings(unittest.TestCase):
 
     def test_invalid_pin_code_string_non_digit(self):
         """Non-digit string pin_code should be rejected."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ble']['pin_code'] = "abc123"
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -1085,7 +1194,7 @@ class TestBLEPINSettings(unittest.TestCase):
 
     def test_invalid_pin_code_empty_string(self):
         """Empty string pin_code should be rejected."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ble']['pin_code'] = ""
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -1093,16 +1202,16 @@ class TestBLEPINSettings(unittest.TestCase):
 
     def test_ble_controller_stores_string_pin_code(self):
         """BLEController should store string pin_code from settings."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ble']['pin_code'] = "007"
         ble = BLEController(settings)
-        self.assertEqual(ble.pin_code, "007")
+        self.assertEqual(ble.cfg.pin_code, "007")
 
     def test_connect_async_no_auth_when_pin_code_none(self):
         """When pin_code is None, write_gatt_char should NOT be called during connect."""
         import asyncio
 
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ble']['pin_code'] = None
         ble = BLEController(settings)
         ble.device_address = "AA:BB:CC:DD:EE:FF"
@@ -1134,7 +1243,7 @@ class TestBLEPINSettings(unittest.TestCase):
         """When pin_code is set, AUTH:<pin> should be written to GATT char during connect."""
         import asyncio
 
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ble']['pin_code'] = 123456
         ble = BLEController(settings)
         ble.device_address = "AA:BB:CC:DD:EE:FF"
@@ -1186,14 +1295,14 @@ class TestBLEPINSettings(unittest.TestCase):
         self.assertTrue(ble.is_connected)
         self.assertEqual(len(written_calls), 1)
         uuid_used, data_sent = written_calls[0]
-        self.assertEqual(uuid_used, ble.characteristic_uuid)
+        self.assertEqual(uuid_used, ble.cfg.characteristic_uuid)
         self.assertEqual(data_sent, b"AUTH:123456")
 
     def test_connect_async_continues_on_auth_error(self):
         """If write_gatt_char raises during AUTH, connection should be aborted (is_connected=False, returns False)."""
         import asyncio
 
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ble']['pin_code'] = 123456
         ble = BLEController(settings)
         ble.device_address = "AA:BB:CC:DD:EE:FF"
@@ -1241,7 +1350,7 @@ class TestBLEAuthResponseHandling(unittest.TestCase):
     """Test BLE AUTH response handling (AUTH_OK, AUTH_FAIL, AUTH_LOCKED, timeout)."""
 
     def _make_ble(self, pin_code=123456):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ble']['pin_code'] = pin_code
         ble = BLEController(settings)
         ble.device_address = "AA:BB:CC:DD:EE:FF"
@@ -1340,7 +1449,7 @@ class TestBLEAuthResponseHandling(unittest.TestCase):
     def test_auth_timeout_continues_connected(self):
         """When no AUTH response arrives within timeout, connection continues (backward compat)."""
         import asyncio
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['ble']['pin_code'] = 123456
         settings['ble']['command_timeout'] = 1  # short timeout for test speed
         ble = BLEController(settings)
@@ -1366,8 +1475,7 @@ class TestBLEAuthResponseHandling(unittest.TestCase):
         """_send_command_async should return False immediately when auth_failed is True."""
         import asyncio
         ble = self._make_ble()
-        with ble._state_lock:
-            ble.auth_failed = True
+        ble.auth_failed = True
 
         async def run():
             return await ble._send_command_async(1)
@@ -1382,11 +1490,10 @@ class TestBLEAuthResponseHandling(unittest.TestCase):
 
     def test_on_disconnect_resets_auth_failed(self):
         """_on_disconnect should reset auth_failed to False."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         ble = BLEController(settings)
-        with ble._state_lock:
-            ble.auth_failed = True
-            ble.is_connected = True
+        ble.auth_failed = True
+        ble.is_connected = True
 
         ble._on_disconnect(None)
 
@@ -1395,7 +1502,7 @@ class TestBLEAuthResponseHandling(unittest.TestCase):
 
     def test_auth_failed_flag_initialized_false(self):
         """auth_failed should be False on initialization."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         ble = BLEController(settings)
         self.assertFalse(ble.auth_failed)
 
@@ -1423,7 +1530,7 @@ class TestHRZoneSettings(unittest.TestCase):
 
     def test_valid_hr_zone_settings(self):
         """Valid HR zone settings should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['heart_rate_zones'] = {
             'enabled': True,
             'max_hr': 185,
@@ -1439,7 +1546,7 @@ class TestHRZoneSettings(unittest.TestCase):
 
     def test_invalid_max_hr_too_low(self):
         """max_hr below 100 should fall back to default."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['heart_rate_zones']['max_hr'] = 50
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -1448,7 +1555,7 @@ class TestHRZoneSettings(unittest.TestCase):
 
     def test_invalid_max_hr_too_high(self):
         """max_hr above 220 should fall back to default."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['heart_rate_zones']['max_hr'] = 250
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -1457,7 +1564,7 @@ class TestHRZoneSettings(unittest.TestCase):
 
     def test_invalid_resting_hr(self):
         """resting_hr outside 30-100 should fall back to default."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['heart_rate_zones']['resting_hr'] = 20
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -1466,7 +1573,7 @@ class TestHRZoneSettings(unittest.TestCase):
 
     def test_invalid_zone_mode(self):
         """Invalid zone_mode should fall back to default."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['heart_rate_zones']['zone_mode'] = 'invalid'
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -1476,7 +1583,7 @@ class TestHRZoneSettings(unittest.TestCase):
     def test_valid_zone_modes(self):
         """All valid zone modes should be accepted."""
         for mode in ('hr_only', 'higher_wins', 'power_only'):
-            settings = copy.deepcopy(DEFAULT_SETTINGS)
+            settings = default_settings()
             settings['heart_rate_zones']['zone_mode'] = mode
             tmp_file = self._create_settings_file(settings)
             controller = PowerZoneController(tmp_file)
@@ -1485,7 +1592,7 @@ class TestHRZoneSettings(unittest.TestCase):
 
     def test_z1_gte_z2_reverts_to_defaults(self):
         """z1_max_percent >= z2_max_percent should revert to defaults."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['heart_rate_zones']['z1_max_percent'] = 80
         settings['heart_rate_zones']['z2_max_percent'] = 70
         self._settings_file = self._create_settings_file(settings)
@@ -1497,7 +1604,7 @@ class TestHRZoneSettings(unittest.TestCase):
 
     def test_invalid_enabled_bool(self):
         """Non-bool enabled should fall back to default."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['heart_rate_zones']['enabled'] = 'yes'
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -1509,7 +1616,7 @@ class TestGetHRZone(unittest.TestCase):
     """Test HR zone calculation."""
 
     def setUp(self):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['heart_rate_zones'] = {
             'enabled': True,
             'max_hr': 185,
@@ -1570,12 +1677,26 @@ class TestGetHRZone(unittest.TestCase):
         self.assertEqual(zones['z1_max'], 129)  # int(185 * 70 / 100) = int(129.5) = 129
         self.assertEqual(zones['z2_max'], 148)  # int(185 * 80 / 100) = int(148.0) = 148
 
+    def test_hr_zone_settings_are_read_only(self):
+        """hr_zone_settings cannot be changed, so the cached cut points never drift from it."""
+        with self.assertRaises(TypeError):
+            self.controller.hr_zone_settings['resting_hr'] = 80
+        with self.assertRaises(AttributeError):
+            self.controller.hr_zone_settings = {}
+        self.assertEqual(self.controller.hr_zone_settings['resting_hr'], 60)
+        self.assertEqual(self.controller.get_hr_zone(60), 1)
+
+    def test_hr_zone_settings_detached_from_settings_dict(self):
+        """Later edits to controller.settings do not leak into hr_zone_settings."""
+        self.controller.settings['heart_rate_zones']['resting_hr'] = 80
+        self.assertEqual(self.controller.hr_zone_settings['resting_hr'], 60)
+
 
 class TestHRZoneControl(unittest.TestCase):
     """Test HR zone-based fan control."""
 
     def _make_controller(self, zone_mode='power_only', hr_enabled=True):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['minimum_samples'] = 1
         settings['buffer_seconds'] = 1
         settings['heart_rate_zones'] = {
@@ -1661,12 +1782,22 @@ class TestHRZoneControl(unittest.TestCase):
         # All values > z2_max (148), so should be in zone 3
         self.assertEqual(controller.current_hr_zone, 3)
 
+    def test_zone_mode_cannot_be_switched_through_hr_zone_settings(self):
+        """The cached zone mode and enabled flag cannot silently diverge from hr_zone_settings."""
+        controller = self._make_controller(zone_mode='power_only', hr_enabled=False)
+        with self.assertRaises(TypeError):
+            controller.hr_zone_settings['enabled'] = True
+        with self.assertRaises(TypeError):
+            controller.hr_zone_settings['zone_mode'] = 'hr_only'
+        controller.process_heart_rate_data(175)
+        self.assertEqual(len(self.sent_commands), 0)
+
 
 class TestHROnlyUpdatesLastDataTime(unittest.TestCase):
     """BUG #26: process_heart_rate_data should update last_data_time in hr_only mode."""
 
     def _make_controller(self, zone_mode='hr_only'):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['minimum_samples'] = 1
         settings['buffer_seconds'] = 1
         settings['heart_rate_zones'] = {
@@ -1693,7 +1824,7 @@ class TestHROnlyUpdatesLastDataTime(unittest.TestCase):
     def test_hr_only_updates_last_data_time(self):
         """In hr_only mode, process_heart_rate_data must update last_data_time."""
         controller = self._make_controller(zone_mode='hr_only')
-        before = time.time()
+        before = time.monotonic()
         controller.process_heart_rate_data(150)
         self.assertGreaterEqual(controller.last_data_time, before)
 
@@ -1708,7 +1839,7 @@ class TestCheckDropoutLocking(unittest.TestCase):
     """Test that check_dropout reads last_data_time inside state_lock."""
 
     def setUp(self):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['dropout_timeout'] = 2
         settings['minimum_samples'] = 1
         settings['buffer_seconds'] = 1
@@ -1730,7 +1861,7 @@ class TestProcessHeartRateDataThreadSafety(unittest.TestCase):
     """BUG #29: process_heart_rate_data must write current_heart_rate under state_lock."""
 
     def _make_controller(self):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['minimum_samples'] = 1
         settings['buffer_seconds'] = 1
         settings['heart_rate_zones']['enabled'] = False
@@ -1753,7 +1884,7 @@ class TestProcessHeartRateDataThreadSafety(unittest.TestCase):
     def test_check_dropout_reads_last_data_time_under_lock(self):
         """check_dropout should read last_data_time under state_lock."""
         self.controller.process_power_data(200)
-        self.controller.last_data_time = time.time() - 5
+        self.controller.last_data_time = time.monotonic() - 5
 
         lock_acquired_during_read = []
         real_lock = self.controller.state_lock
@@ -1776,17 +1907,47 @@ class TestProcessHeartRateDataThreadSafety(unittest.TestCase):
         self.assertEqual(self.controller.current_zone, 3)
         self.sent_commands.clear()
 
-        self.controller.last_data_time = time.time() - 5
+        self.controller.last_data_time = time.monotonic() - 5
         self.controller.check_dropout()
         self.assertEqual(self.controller.current_zone, 0)
         self.assertIn(0, self.sent_commands)
 
 
+    def test_console_output_written_after_lock_release(self):
+        """process_*_data must not print while holding state_lock."""
+        lock = self.controller.state_lock
+        held = []
+        with patch('builtins.print', side_effect=lambda *a, **k: held.append(lock.locked())):
+            self.controller.process_power_data(200)
+            self.controller.process_heart_rate_data(120)
+        self.assertTrue(held)
+        self.assertFalse(any(held))
+
+    def test_invalid_power_rejected_without_lock(self):
+        """Invalid power samples are dropped before state_lock is taken."""
+        acquired = []
+        real_lock = self.controller.state_lock
+
+        class TrackingLock:
+            def __enter__(self_inner):
+                acquired.append(True)
+                return real_lock.__enter__()
+            def __exit__(self_inner, *args):
+                return real_lock.__exit__(*args)
+
+        self.controller.state_lock = TrackingLock()
+        self.controller.process_power_data(-5)
+        self.controller.process_power_data(float('nan'))
+        self.assertEqual(acquired, [])
+        self.controller.process_power_data(200)
+        self.assertEqual(acquired, [True])
+
+
 class TestCooldownElif(unittest.TestCase):
     """Test that cooldown active and should_change_zone don't run simultaneously (elif)."""
 
     def setUp(self):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['cooldown_seconds'] = 30
         settings['minimum_samples'] = 1
         settings['buffer_seconds'] = 1
@@ -1850,7 +2011,7 @@ class TestSaveDefaultSettingsShowsPath(unittest.TestCase):
     """BUG #32: save_default_settings must print the absolute path."""
 
     def _make_controller(self):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         f = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
         json.dump(settings, f, indent=2)
         f.close()
@@ -1885,7 +2046,7 @@ class TestBLEDisconnectTimeout(unittest.TestCase):
     """Test that _disconnect_async uses asyncio.wait_for with timeout."""
 
     def setUp(self):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         self.ble = BLEController(settings)
 
     def test_disconnect_timeout_on_hang(self):
@@ -1945,7 +2106,7 @@ class TestAntplusLoopReconnect(unittest.TestCase):
         """When antplus_node.start() returns normally, loop should retry."""
         from smart_fan_controller import DataSourceManager
 
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         controller = PowerZoneController(settings_file=None)
         controller.settings = settings
 
@@ -2008,7 +2169,7 @@ class TestAntplusLoopRetryReset(unittest.TestCase):
                 call_count[0] += 1
                 if call_count[0] == 1:
                     # Simulate successful data received during first run
-                    dsm.antplus_last_data = time.time()
+                    dsm.antplus_last_data = time.monotonic()
                 elif call_count[0] == 2:
                     # Stop the loop on second call
                     dsm.running.clear()
@@ -2113,7 +2274,7 @@ class TestHROnlyModePowerPrint(unittest.TestCase):
     """Test that in hr_only mode, process_power_data prints throttled and sends no BLE."""
 
     def _make_controller(self):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['minimum_samples'] = 1
         settings['buffer_seconds'] = 1
         settings['heart_rate_zones'] = {
@@ -2176,7 +2337,7 @@ class TestPowerOnlyModePowerPrint(unittest.TestCase):
     """Test that in power_only mode, process_power_data prints incoming data throttled."""
 
     def _make_controller(self, zone_mode='power_only'):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['minimum_samples'] = 1
         settings['buffer_seconds'] = 1
         settings['heart_rate_zones'] = {
@@ -2281,7 +2442,7 @@ class TestPowerOnlyModeHRPrint(unittest.TestCase):
     """Test that in power_only mode, process_heart_rate_data prints throttled and sends no BLE."""
 
     def _make_controller(self):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['minimum_samples'] = 1
         settings['buffer_seconds'] = 1
         settings['heart_rate_zones'] = {
@@ -2343,7 +2504,7 @@ class TestHigherWinsMissingData(unittest.TestCase):
     """Test higher_wins mode when one of the data sources is missing."""
 
     def _make_controller(self):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['minimum_samples'] = 1
         settings['buffer_seconds'] = 1
         settings['heart_rate_zones'] = {
@@ -2413,6 +2574,77 @@ class TestHigherWinsMissingData(unittest.TestCase):
         self.assertTrue(any('Higher Wins' in s for s in printed_args))
 
 
+class TestAntplusDataDispatch(unittest.TestCase):
+    """_on_antplus_data() dispatches ANT+ pages by exact data type."""
+
+    def setUp(self):
+        from smart_fan_controller import DataSourceManager
+        settings = default_settings()
+        settings['heart_rate_zones']['enabled'] = True
+        self.controller = MagicMock()
+        self.dsm = DataSourceManager(settings, self.controller)
+        with patch('smart_fan_controller.Node'), \
+             patch('smart_fan_controller.PowerMeter'), \
+             patch('smart_fan_controller.HeartRate'):
+            self.dsm._init_antplus_node()
+
+    def test_power_data_forwarded(self):
+        """PowerData goes to process_power_data and refreshes antplus_last_data."""
+        data = mock_power_meter_module.PowerData()
+        data.instantaneous_power = 180
+        self.dsm._on_antplus_data(16, 'power', data)
+        self.controller.process_power_data.assert_called_once_with(180)
+        self.assertGreater(self.dsm.antplus_last_data, 0)
+
+    def test_heart_rate_data_forwarded(self):
+        """HeartRateData goes to process_heart_rate_data."""
+        data = mock_heart_rate_module.HeartRateData()
+        data.heart_rate = 130
+        self.dsm._on_antplus_data(0, 'hr', data)
+        self.controller.process_heart_rate_data.assert_called_once_with(130)
+
+    def test_unknown_data_ignored(self):
+        """Other page types are ignored and do not count as fresh data."""
+        self.dsm._on_antplus_data(80, 'other', object())
+        self.controller.process_power_data.assert_not_called()
+        self.controller.process_heart_rate_data.assert_not_called()
+        self.assertEqual(self.dsm.antplus_last_data, 0)
+
+
+class TestMonitorLoopStop(unittest.TestCase):
+    """_monitor_loop() waits on the stop event instead of sleeping."""
+
+    def test_stop_wakes_monitor_immediately(self):
+        """stop() ends the monitor thread without waiting for the check interval."""
+        from smart_fan_controller import DataSourceManager
+        settings = default_settings()
+        dsm = DataSourceManager(settings, MagicMock())
+        dsm.running.set()
+        dsm.monitor_thread = threading.Thread(target=dsm._monitor_loop, daemon=True)
+        dsm.monitor_thread.start()
+        start = time.monotonic()
+        dsm.stop()
+        self.assertFalse(dsm.monitor_thread.is_alive())
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_first_status_printed_after_one_interval(self):
+        """The first status line follows the first check, then every MONITOR_PRINT_INTERVAL."""
+        from smart_fan_controller import DataSourceManager
+        settings = default_settings()
+        dsm = DataSourceManager(settings, MagicMock())
+        dsm.MONITOR_CHECK_INTERVAL = 0.01
+        dsm.MONITOR_PRINT_INTERVAL = 60.0
+        dsm.running.set()
+        with patch('builtins.print') as mock_print:
+            thread = threading.Thread(target=dsm._monitor_loop, daemon=True)
+            thread.start()
+            time.sleep(0.1)
+            dsm.stop()
+            thread.join(timeout=1.0)
+        status_lines = [c for c in mock_print.call_args_list if 'Adatforrás státusz' in str(c)]
+        self.assertEqual(len(status_lines), 1)
+
+
 class TestStartAntplusRetry(unittest.TestCase):
     """_start_antplus() must retry _init_antplus_node() up to 3 times on failure."""
 
@@ -2520,8 +2752,9 @@ class TestOnDisconnectResetsLastSentCommand(unittest.TestCase):
     """_on_disconnect() must reset last_sent_command to None."""
 
     def _make_ble(self):
+        import asyncio
         ble = BLEController.__new__(BLEController)
-        ble._state_lock = threading.Lock()
+        ble._connected_event = asyncio.Event()
         ble.is_connected = True
         ble.last_sent_command = 3
         return ble
@@ -2546,6 +2779,644 @@ class TestOnDisconnectResetsLastSentCommand(unittest.TestCase):
         self.assertIsNone(ble.client)
 
 
+class TestBLECommandSlot(unittest.TestCase):
+    """send_command_sync must hand off the latest level via a single slot."""
+
+    def _make_ble(self):
+        ble = BLEController(default_settings())
+        ble.running.set()
+        return ble
+
+    def test_latest_level_wins(self):
+        """Consecutive commands overwrite the pending slot; only the latest remains."""
+        ble = self._make_ble()
+        ble.send_command_sync(1)
+        ble.send_command_sync(3)
+        self.assertEqual(ble._pending_level, 3)
+
+    def test_invalid_level_not_stored(self):
+        """Invalid levels must not touch the slot or wake the BLE thread."""
+        ble = self._make_ble()
+        ble.send_command_sync(7)
+        self.assertIsNone(ble._pending_level)
+
+    def test_bool_and_float_levels_rejected(self):
+        """bool and float values are rejected even if they equal a valid level."""
+        ble = self._make_ble()
+        for bad in (True, False, 1.0, -1, 4, None, "2"):
+            ble.send_command_sync(bad)
+        self.assertIsNone(ble._pending_level)
+
+    def test_repeated_level_skipped_at_producer(self):
+        """Re-sending the last requested level must not wake the BLE worker."""
+        ble = self._make_ble()
+        ble.send_command_sync(2)
+        with patch.object(ble, '_wake_worker') as wake:
+            ble.send_command_sync(2)
+            wake.assert_not_called()
+            ble.send_command_sync(1)
+            wake.assert_called_once()
+
+    def test_wake_on_loop_thread_sets_event_directly(self):
+        """On the loop's own thread the event is set without call_soon_threadsafe."""
+        ble = self._make_ble()
+        ble.loop = MagicMock()
+        ble.loop.is_closed.return_value = False
+        ble._loop_thread_id = threading.get_ident()
+        ble._wake_worker()
+        self.assertTrue(ble._cmd_event.is_set())
+        ble.loop.call_soon_threadsafe.assert_not_called()
+
+    def test_wake_from_other_thread_uses_call_soon_threadsafe(self):
+        """From any other thread the wakeup goes through call_soon_threadsafe."""
+        ble = self._make_ble()
+        ble.loop = MagicMock()
+        ble.loop.is_closed.return_value = False
+        ble._loop_thread_id = None
+        ble._wake_worker()
+        ble.loop.call_soon_threadsafe.assert_called_once_with(ble._cmd_event.set)
+
+    def test_disconnect_clears_last_requested_level(self):
+        """After a disconnect the same level must be accepted again."""
+        ble = self._make_ble()
+        ble.send_command_sync(2)
+        ble._on_disconnect(None)
+        with patch.object(ble, '_wake_worker') as wake:
+            ble.send_command_sync(2)
+            wake.assert_called_once()
+
+    def test_not_running_drops_command(self):
+        """Commands are dropped when the BLE thread is not running."""
+        ble = BLEController(default_settings())
+        ble.send_command_sync(2)
+        self.assertIsNone(ble._pending_level)
+
+    def test_worker_sends_latest_level_and_exits_on_stop(self):
+        """_command_worker sends only the latest pending level and exits once running is cleared."""
+        import asyncio
+        ble = self._make_ble()
+        sent = []
+
+        async def fake_send(level):
+            sent.append(level)
+            ble.running.clear()
+            ble._cmd_event.set()
+            return True
+
+        ble._send_command_async = fake_send
+        ble._pending_level = 1
+        ble._pending_level = 2
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(asyncio.wait_for(ble._command_worker(), timeout=2))
+        finally:
+            loop.close()
+
+        self.assertEqual(sent, [2])
+
+
+class TestBLEConnectedEvent(unittest.TestCase):
+    """The connection state comes from _connected_event, not from the backend."""
+
+    def test_connection_state_follows_event(self):
+        ble = BLEController(default_settings())
+        mock_client = MagicMock()
+        mock_client.is_connected = True
+        ble.client = mock_client
+        self.assertFalse(ble._is_connected())
+        ble._connected_event.set()
+        self.assertTrue(ble._is_connected())
+
+    def test_disconnect_callback_clears_event(self):
+        ble = BLEController(default_settings())
+        ble.client = MagicMock()
+        ble._write_gatt = ble.client.write_gatt_char
+        ble._connected_event.set()
+        ble._on_disconnect(None)
+        self.assertFalse(ble._connected_event.is_set())
+        self.assertFalse(ble._is_connected())
+        self.assertIsNone(ble._write_gatt)
+
+
+class TestBLEBackoffSleep(unittest.TestCase):
+    """The reconnect backoff must end early when a new command arrives."""
+
+    def test_new_command_interrupts_backoff(self):
+        import asyncio
+        ble = BLEController(default_settings())
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.05, ble._cmd_event.set)
+            start = time.monotonic()
+            await ble._backoff_sleep(5)
+            return time.monotonic() - start
+
+        loop = asyncio.new_event_loop()
+        try:
+            elapsed = loop.run_until_complete(run())
+        finally:
+            loop.close()
+        self.assertLess(elapsed, 1.0)
+        self.assertTrue(ble._cmd_event.is_set())
+
+    def test_backoff_times_out_without_command(self):
+        import asyncio
+        ble = BLEController(default_settings())
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(ble._backoff_sleep(0.01))
+        finally:
+            loop.close()
+        self.assertFalse(ble._cmd_event.is_set())
+
+    def test_reconnect_delay_grows_exponentially_with_cap(self):
+        """Delays double per attempt from reconnect_interval up to RECONNECT_BACKOFF_MAX."""
+        ble = BLEController(default_settings())
+        interval = ble.cfg.reconnect_interval
+        with patch('smart_fan_controller.random.uniform', return_value=0.0):
+            delays = [ble._reconnect_delay(n) for n in (1, 2, 3, 50)]
+        self.assertEqual(delays[:3], [interval, interval * 2, interval * 4])
+        self.assertEqual(delays[3], ble.RECONNECT_BACKOFF_MAX)
+
+    def test_reconnect_delay_respects_interval_above_cap(self):
+        """A reconnect_interval above RECONNECT_BACKOFF_MAX is used as the cap instead."""
+        settings = default_settings()
+        settings['ble']['reconnect_interval'] = 60
+        ble = BLEController(settings)
+        with patch('smart_fan_controller.random.uniform', return_value=0.0):
+            delays = [ble._reconnect_delay(n) for n in (1, 2, 5)]
+        self.assertEqual(delays, [60, 60, 60])
+
+    def test_reconnect_delay_jitter_bounded(self):
+        """The random jitter adds at most half a reconnect_interval."""
+        ble = BLEController(default_settings())
+        interval = ble.cfg.reconnect_interval
+        for _ in range(20):
+            delay = ble._reconnect_delay(1)
+            self.assertGreaterEqual(delay, interval)
+            self.assertLessEqual(delay, interval * 1.5)
+
+
+class TestBLERetryResetMonotonic(unittest.TestCase):
+    """The retry reset window must be measured on the monotonic clock."""
+
+    def test_retry_window_uses_monotonic_clock(self):
+        import asyncio
+        ble = BLEController(default_settings())
+        ble.retry_count = ble.cfg.max_retries
+        ble.retry_reset_time = time.monotonic() - ble.RETRY_RESET_SECONDS - 1
+
+        async def no_connect():
+            return False
+
+        async def no_sleep(delay):
+            pass
+
+        ble._scan_and_connect_async = no_connect
+        ble._backoff_sleep = no_sleep
+        loop = asyncio.new_event_loop()
+        try:
+            # A wall-clock jump must not affect the elapsed time
+            with patch('smart_fan_controller.time.time', return_value=0.0):
+                result = loop.run_until_complete(ble._send_command_async(1))
+        finally:
+            loop.close()
+        self.assertFalse(result)
+        self.assertIsNone(ble.retry_reset_time)
+        self.assertEqual(ble.retry_count, 1)
+
+
+class TestSettingsView(unittest.TestCase):
+    """PowerZoneController exposes validated settings as a frozen SettingsView."""
+
+    def test_view_mirrors_settings_dict(self):
+        controller = PowerZoneController(settings_file=None)
+        cfg = controller.cfg
+        self.assertEqual(cfg.ftp, controller.settings['ftp'])
+        self.assertEqual(cfg.heart_rate_zones.max_hr, controller.settings['heart_rate_zones']['max_hr'])
+        self.assertEqual(cfg.data_source.power_source, controller.settings['data_source']['power_source'])
+        self.assertIs(controller.ble.cfg, cfg.ble)
+
+    def test_controller_state_lives_in_slots(self):
+        """All attributes set by __init__ are declared in __slots__."""
+        controller = PowerZoneController(settings_file=None)
+        self.assertEqual(vars(controller), {})
+
+    def test_ble_controller_created_on_first_access(self):
+        with patch('smart_fan_controller.BLEController') as mock_ble:
+            controller = PowerZoneController(settings_file=None)
+            mock_ble.assert_not_called()
+            self.assertIs(controller.ble, controller.ble)
+            mock_ble.assert_called_once_with(controller.cfg.ble)
+
+    def test_view_is_frozen(self):
+        cfg = smart_fan_controller.SettingsView.from_dict(default_settings())
+        with self.assertRaises(Exception):
+            cfg.ftp = 300
+        with self.assertRaises(Exception):
+            cfg.heart_rate_zones.enabled = True
+
+
+class TestDropoutCheckerStop(unittest.TestCase):
+    """stop_dropout_checker() must not wait out the dropout deadline."""
+
+    def test_stop_is_prompt(self):
+        controller = PowerZoneController(settings_file=None)
+        controller.check_dropout = MagicMock()
+        controller.start_dropout_checker()
+        start = time.monotonic()
+        controller.stop_dropout_checker()
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertFalse(controller.dropout_thread.is_alive())
+
+
+class TestDropoutDeadline(unittest.TestCase):
+    """The dropout thread sleeps until the data deadline instead of polling."""
+
+    def _make_controller(self, timeout):
+        settings = default_settings()
+        settings['dropout_timeout'] = timeout
+        f = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
+        json.dump(settings, f, indent=2)
+        f.close()
+        self.addCleanup(os.unlink, f.name)
+        controller = PowerZoneController(f.name)
+        controller.check_dropout = MagicMock()
+        return controller
+
+    def test_no_check_while_data_keeps_arriving(self):
+        controller = self._make_controller(1)
+        controller.start_dropout_checker()
+        try:
+            end = time.monotonic() + 1.5
+            while time.monotonic() < end:
+                controller.last_data_time = time.monotonic()
+                time.sleep(0.05)
+            controller.check_dropout.assert_not_called()
+        finally:
+            controller.stop_dropout_checker()
+
+    def test_check_runs_once_deadline_passes(self):
+        controller = self._make_controller(1)
+        controller.last_data_time = time.monotonic() - 0.7
+        controller.start_dropout_checker()
+        try:
+            time.sleep(0.6)
+            controller.check_dropout.assert_called_once()
+        finally:
+            controller.stop_dropout_checker()
+
+class TestRollingBuffer(unittest.TestCase):
+    """RollingBuffer keeps a running total over a fixed window."""
+
+    def test_running_total_after_wraparound(self):
+        buf = RollingBuffer(3)
+        for value in (100, 200, 300, 400, 500):
+            buf.append(value)
+        self.assertEqual(len(buf), 3)
+        self.assertEqual(list(buf), [300, 400, 500])
+        self.assertEqual(buf.total, 1200)
+        self.assertEqual(buf.mean(), 400)
+
+    def test_partial_fill_mean(self):
+        buf = RollingBuffer(8)
+        buf.append(10)
+        buf.append(20)
+        self.assertEqual(list(buf), [10, 20])
+        self.assertEqual(buf.mean(), 15)
+
+    def test_clear_resets_total(self):
+        buf = RollingBuffer(2)
+        buf.append(5)
+        buf.append(7)
+        buf.clear()
+        self.assertEqual(len(buf), 0)
+        self.assertEqual(buf.mean(), 0.0)
+        buf.append(9)
+        self.assertEqual(buf.total, 9)
+
+
+class TestSettingsSchema(unittest.TestCase):
+    """Table-driven settings validation via SETTINGS_SCHEMA."""
+
+    def test_number_rule_converts_and_checks_range(self):
+        rule = smart_fan_controller.SETTINGS_SCHEMA['ftp']
+        self.assertEqual(smart_fan_controller._check_setting(250.7, rule), (True, 250))
+        self.assertFalse(smart_fan_controller._check_setting(99, rule)[0])
+        self.assertFalse(smart_fan_controller._check_setting(True, rule)[0])
+
+    def test_non_finite_float_rejected(self):
+        rule = smart_fan_controller.SETTINGS_SCHEMA['ftp']
+        self.assertFalse(smart_fan_controller._check_setting(float('nan'), rule)[0])
+        self.assertFalse(smart_fan_controller._check_setting(float('inf'), rule)[0])
+
+    def test_pin_rule(self):
+        rule = smart_fan_controller.SETTINGS_SECTION_SCHEMAS['ble']['pin_code']
+        self.assertEqual(smart_fan_controller._check_setting(42, rule), (True, "42"))
+        self.assertEqual(smart_fan_controller._check_setting(None, rule), (True, None))
+        self.assertFalse(smart_fan_controller._check_setting("12a", rule)[0])
+
+    def test_bool_rejected_for_ble_numeric_field(self):
+        settings = default_settings()
+        settings['ble']['scan_timeout'] = True
+        f = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
+        json.dump(settings, f)
+        f.close()
+        try:
+            with patch('builtins.print'):
+                controller = PowerZoneController(f.name)
+        finally:
+            os.unlink(f.name)
+        self.assertEqual(controller.settings['ble']['scan_timeout'],
+                         DEFAULT_SETTINGS['ble']['scan_timeout'])
+
+    def test_invalid_value_logged_as_warning(self):
+        rule = smart_fan_controller.SETTINGS_SCHEMA['ftp']
+        with self.assertLogs('smart_fan_controller', level='WARNING') as cm:
+            smart_fan_controller._warn_invalid_setting('ftp', 50, rule)
+        self.assertIn("'ftp'", cm.output[0])
+        self.assertIn('50', cm.output[0])
+
+    def test_schema_covers_every_default_key(self):
+        for key, value in DEFAULT_SETTINGS.items():
+            if key in smart_fan_controller.SETTINGS_SECTION_SCHEMAS:
+                self.assertEqual(set(value), set(smart_fan_controller.SETTINGS_SECTION_SCHEMAS[key]))
+            else:
+                self.assertIn(key, smart_fan_controller.SETTINGS_SCHEMA)
+
+
+class TestSettingsFileLoading(unittest.TestCase):
+    """load_and_validate_settings reads the file on every call."""
+
+    def setUp(self):
+        f = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
+        settings = default_settings()
+        settings['ftp'] = 210
+        json.dump(settings, f)
+        f.close()
+        self.path = f.name
+        self.controller = PowerZoneController.__new__(PowerZoneController)
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def test_non_ascii_file_is_parsed_from_bytes(self):
+        settings = default_settings()
+        settings['ble']['device_name'] = "Ventilátor-ÉÁŐ"
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(settings, f, ensure_ascii=False)
+        loaded = self.controller.load_and_validate_settings(self.path)
+        self.assertEqual(loaded['ble']['device_name'], "Ventilátor-ÉÁŐ")
+
+    def test_modified_file_is_reloaded(self):
+        self.controller.load_and_validate_settings(self.path)
+        settings = default_settings()
+        settings['ftp'] = 250
+        with open(self.path, 'w') as f:
+            json.dump(settings, f, indent=4)
+        self.assertEqual(self.controller.load_and_validate_settings(self.path)['ftp'], 250)
+
+
+class TestLazyOptionalImports(unittest.TestCase):
+    """openant/bleak names are bound on first use, without clobbering patches."""
+
+    def test_load_bleak_binds_missing_names(self):
+        sentinel = MagicMock()
+        with patch.object(smart_fan_controller, 'BleakClient', None), \
+             patch.object(smart_fan_controller, 'BleakScanner', sentinel):
+            smart_fan_controller._load_bleak()
+            self.assertIs(smart_fan_controller.BleakClient, sys.modules['bleak'].BleakClient)
+            self.assertIs(smart_fan_controller.BleakScanner, sentinel)
+
+    def test_load_antplus_binds_missing_names(self):
+        with patch.object(smart_fan_controller, 'PowerData', None), \
+             patch.object(smart_fan_controller, 'Node', None):
+            smart_fan_controller._load_antplus()
+            self.assertIs(smart_fan_controller.PowerData, mock_power_meter_module.PowerData)
+            self.assertIs(smart_fan_controller.Node, mock_node_module.Node)
+
+
+class TestBLEConfig(unittest.TestCase):
+    """BLEConfig is built once from the settings dict and is read-only."""
+
+    def test_from_dict_reads_ble_section(self):
+        settings = default_settings()
+        settings['ble']['pin_code'] = "1234"
+        cfg = BLEConfig.from_dict(settings)
+        self.assertEqual(cfg.device_name, settings['ble']['device_name'])
+        self.assertEqual(cfg.command_timeout, settings['ble']['command_timeout'])
+        self.assertEqual(cfg.pin_code, "1234")
+
+    def test_config_is_frozen(self):
+        cfg = BLEConfig.from_dict(default_settings())
+        with self.assertRaises(Exception):
+            cfg.device_name = "Other"
+
+    def test_controller_accepts_prebuilt_config(self):
+        cfg = BLEConfig.from_dict(default_settings())
+        ble = BLEController(cfg)
+        self.assertIs(ble.cfg, cfg)
+
+
+class TestBLESendImmediatePayload(unittest.TestCase):
+    """_send_immediate must write the pre-encoded LEVEL:<n> payload."""
+
+    def test_payloads_precomputed(self):
+        ble = BLEController(default_settings())
+        self.assertEqual(ble._cmd_bytes, (b"LEVEL:0", b"LEVEL:1", b"LEVEL:2", b"LEVEL:3"))
+
+    def test_send_immediate_writes_cached_bytes(self):
+        import asyncio
+        ble = BLEController(default_settings())
+        written = []
+
+        async def capturing_write(uuid, data):
+            written.append((uuid, data))
+
+        mock_client = MagicMock()
+        mock_client.is_connected = True
+        mock_client.write_gatt_char = capturing_write
+        ble.client = mock_client
+        ble._write_gatt = mock_client.write_gatt_char
+        ble._connected_event.set()
+
+        loop = asyncio.new_event_loop()
+        try:
+            result = loop.run_until_complete(ble._send_immediate(2))
+        finally:
+            loop.close()
+
+        self.assertTrue(result)
+        self.assertEqual(written, [(ble.cfg.characteristic_uuid, b"LEVEL:2")])
+        self.assertIs(written[0][1], ble._cmd_bytes[2])
+        self.assertEqual(ble.last_sent_command, 2)
+
+    def test_send_immediate_times_out(self):
+        """A write that never completes fails after command_timeout."""
+        import asyncio
+        import dataclasses
+        ble = BLEController(default_settings())
+        ble.cfg = dataclasses.replace(ble.cfg, command_timeout=0.05)
+
+        async def hanging_write(uuid, data):
+            await asyncio.sleep(10)
+
+        ble.client = MagicMock()
+        ble._write_gatt = hanging_write
+        ble._connected_event.set()
+
+        loop = asyncio.new_event_loop()
+        try:
+            start = time.monotonic()
+            result = loop.run_until_complete(ble._send_immediate(1))
+            elapsed = time.monotonic() - start
+        finally:
+            loop.close()
+
+        self.assertFalse(result)
+        self.assertFalse(ble.is_connected)
+        self.assertIsNone(ble.last_sent_command)
+        self.assertLess(elapsed, 1.0)
+
+    def test_resolve_characteristic_caches_object(self):
+        """The characteristic object is resolved once; the UUID is the fallback."""
+        ble = BLEController(default_settings())
+        char = object()
+        client = MagicMock()
+        client.services.get_characteristic.return_value = char
+        self.assertIs(ble._resolve_characteristic(client), char)
+        client.services.get_characteristic.assert_called_once_with(ble.cfg.characteristic_uuid)
+
+        client.services.get_characteristic.return_value = None
+        self.assertEqual(ble._resolve_characteristic(client), ble.cfg.characteristic_uuid)
+
+        client.services.get_characteristic.side_effect = RuntimeError("no services")
+        self.assertEqual(ble._resolve_characteristic(client), ble.cfg.characteristic_uuid)
+
+    def test_bind_write_without_response_when_supported(self):
+        """Commands use write-without-response only if the characteristic allows it."""
+        import asyncio
+        calls = []
+
+        async def write_gatt_char(char, data, response=None):
+            calls.append(response)
+
+        client = MagicMock()
+        client.write_gatt_char = write_gatt_char
+        fast = MagicMock(properties=['write', 'write-without-response'])
+        acked = MagicMock(properties=['write'])
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(BLEController._bind_write(client, fast)(fast, b"LEVEL:1"))
+            loop.run_until_complete(BLEController._bind_write(client, acked)(acked, b"LEVEL:1"))
+            loop.run_until_complete(BLEController._bind_write(client, "uuid")("uuid", b"LEVEL:1"))
+        finally:
+            loop.close()
+        self.assertEqual(calls, [False, None, None])
+
+    def test_connected_send_checks_connection_once(self):
+        """_send_command_async must check the connection only once when connected."""
+        import asyncio
+        ble = BLEController(default_settings())
+        written = []
+
+        async def capturing_write(uuid, data):
+            written.append(data)
+
+        mock_client = MagicMock()
+        mock_client.is_connected = True
+        mock_client.write_gatt_char = capturing_write
+        ble.client = mock_client
+        ble._write_gatt = capturing_write
+        checks = []
+
+        def counting_is_connected():
+            checks.append(1)
+            return True
+
+        ble._is_connected = counting_is_connected
+        loop = asyncio.new_event_loop()
+        try:
+            result = loop.run_until_complete(ble._send_command_async(1))
+        finally:
+            loop.close()
+
+        self.assertTrue(result)
+        self.assertEqual(written, [b"LEVEL:1"])
+        self.assertEqual(len(checks), 1)
+
+
+class TestDefaultSettingsCopy(unittest.TestCase):
+    """default_settings() must return an independent deep copy of DEFAULT_SETTINGS."""
+
+    def test_equal_to_defaults(self):
+        self.assertEqual(default_settings(), DEFAULT_SETTINGS)
+
+    def test_nested_dicts_are_independent(self):
+        settings = default_settings()
+        settings['ble']['device_name'] = 'Changed'
+        settings['heart_rate_zones']['max_hr'] = 200
+        self.assertEqual(DEFAULT_SETTINGS['ble']['device_name'], 'FanController')
+        self.assertEqual(DEFAULT_SETTINGS['heart_rate_zones']['max_hr'], 185)
+        self.assertIsNot(default_settings()['ble'], default_settings()['ble'])
+
+    def test_defaults_are_read_only(self):
+        with self.assertRaises(TypeError):
+            DEFAULT_SETTINGS['ftp'] = 300
+        with self.assertRaises(TypeError):
+            DEFAULT_SETTINGS['ble']['device_name'] = 'Changed'
+
+
+class TestBLEScanAndConnect(unittest.TestCase):
+    """_scan_and_connect_async must use find_device_by_name (early exit) instead of a full discover."""
+
+    def _run(self, coro):
+        import asyncio
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+
+    def test_device_found_connects(self):
+        ble = BLEController(default_settings())
+        device = MagicMock()
+        device.name = ble.cfg.device_name
+        device.address = "AA:BB:CC:DD:EE:FF"
+
+        async def find(name, timeout):
+            return device
+
+        async def connect():
+            return True
+
+        ble._connect_async = connect
+        with patch('smart_fan_controller.BleakScanner') as scanner:
+            scanner.find_device_by_name = MagicMock(side_effect=find)
+            result = self._run(ble._scan_and_connect_async())
+
+        self.assertTrue(result)
+        self.assertEqual(ble.device_address, "AA:BB:CC:DD:EE:FF")
+        scanner.find_device_by_name.assert_called_once_with(ble.cfg.device_name, timeout=ble.cfg.scan_timeout)
+        scanner.discover.assert_not_called()
+
+    def test_device_not_found_returns_false(self):
+        ble = BLEController(default_settings())
+
+        async def find(name, timeout):
+            return None
+
+        with patch('smart_fan_controller.BleakScanner') as scanner:
+            scanner.find_device_by_name = MagicMock(side_effect=find)
+            result = self._run(ble._scan_and_connect_async())
+
+        self.assertFalse(result)
+        self.assertIsNone(ble.device_address)
+
+
 class TestAntplusLoopSleepBeforeReinit(unittest.TestCase):
     """_antplus_loop must sleep 1s between _stop_antplus_node and _init_antplus_node."""
 
@@ -2595,7 +3466,7 @@ class TestHROnlyPrintFormat(unittest.TestCase):
     """hr_only mode must print '❤ Átlag HR' format; higher_wins keeps '❤ HR' format."""
 
     def _make_controller(self, zone_mode):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['minimum_samples'] = 1
         settings['buffer_seconds'] = 1
         settings['heart_rate_zones'] = {
@@ -2657,7 +3528,7 @@ class TestStaleDataInHigherWins(unittest.TestCase):
     """Test that stale HR/Power data is not used when the data source has dropped out."""
 
     def _make_controller(self):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['minimum_samples'] = 1
         settings['buffer_seconds'] = 1
         settings['dropout_timeout'] = 5
@@ -2688,7 +3559,7 @@ class TestStaleDataInHigherWins(unittest.TestCase):
         controller = self._make_controller()
         # Receive HR data, then simulate HR dropout by setting last_hr_data_time to old
         controller.process_heart_rate_data(150)
-        controller.last_hr_data_time = time.time() - 100  # way past dropout_timeout
+        controller.last_hr_data_time = time.monotonic() - 100  # way past dropout_timeout
         controller.last_power_print_time = 0  # force throttle to allow print
         with patch('builtins.print') as mock_print:
             controller.process_power_data(200)
@@ -2713,7 +3584,7 @@ class TestStaleDataInHigherWins(unittest.TestCase):
         controller = self._make_controller()
         # Manually set a stale hr_zone (simulating a previous HR reading that is now outdated)
         controller.current_hr_zone = 3
-        controller.last_hr_data_time = time.time() - 100  # way past dropout_timeout
+        controller.last_hr_data_time = time.monotonic() - 100  # way past dropout_timeout
         # current_zone is None → first zone decision goes directly without cooldown
         controller.process_power_data(50)  # power zone 1; stale HR zone 3 must not boost it
         self.assertIn(1, self.sent_commands)
@@ -2724,7 +3595,7 @@ class TestStaleDataInHigherWins(unittest.TestCase):
         controller = self._make_controller()
         # Receive power data, then simulate power dropout
         controller.process_power_data(200)
-        controller.last_data_time = time.time() - 100  # way past dropout_timeout
+        controller.last_data_time = time.monotonic() - 100  # way past dropout_timeout
         with patch('builtins.print') as mock_print:
             controller.process_heart_rate_data(175)
         printed_args = [str(c) for c in mock_print.call_args_list]
@@ -2738,7 +3609,7 @@ class TestStaleDataInHigherWins(unittest.TestCase):
         # Manually set stale power data (simulating a previous power reading that is now outdated)
         controller.current_power_zone = 3
         controller.current_avg_power = 200
-        controller.last_data_time = time.time() - 100  # way past dropout_timeout
+        controller.last_data_time = time.monotonic() - 100  # way past dropout_timeout
         # current_zone is None → first zone decision goes directly without cooldown
         controller.process_heart_rate_data(120)  # hr zone 1; stale power zone 3 must not boost it
         self.assertIn(1, self.sent_commands)
@@ -2748,7 +3619,7 @@ class TestStaleDataInHigherWins(unittest.TestCase):
         """process_heart_rate_data must update last_hr_data_time."""
         controller = self._make_controller()
         self.assertIsNone(controller.last_hr_data_time)
-        before = time.time()
+        before = time.monotonic()
         controller.process_heart_rate_data(150)
         self.assertIsNotNone(controller.last_hr_data_time)
         self.assertGreaterEqual(controller.last_hr_data_time, before)
@@ -2801,7 +3672,7 @@ class TestDataSourceValidation(unittest.TestCase):
 
     def test_power_source_antplus(self):
         """power_source 'antplus' should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['power_source'] = 'antplus'
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -2809,7 +3680,7 @@ class TestDataSourceValidation(unittest.TestCase):
 
     def test_power_source_ble(self):
         """power_source 'ble' should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['power_source'] = 'ble'
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -2817,7 +3688,7 @@ class TestDataSourceValidation(unittest.TestCase):
 
     def test_power_source_invalid_falls_back(self):
         """Invalid power_source should fall back to default."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['power_source'] = 'invalid'
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -2826,7 +3697,7 @@ class TestDataSourceValidation(unittest.TestCase):
 
     def test_hr_source_antplus(self):
         """hr_source 'antplus' should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['hr_source'] = 'antplus'
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -2834,7 +3705,7 @@ class TestDataSourceValidation(unittest.TestCase):
 
     def test_hr_source_ble(self):
         """hr_source 'ble' should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['hr_source'] = 'ble'
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -2842,7 +3713,7 @@ class TestDataSourceValidation(unittest.TestCase):
 
     def test_hr_source_invalid_falls_back(self):
         """Invalid hr_source should fall back to default."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['hr_source'] = 'wifi'
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -2851,7 +3722,7 @@ class TestDataSourceValidation(unittest.TestCase):
 
     def test_ble_power_device_name_string(self):
         """ble_power_device_name as a string should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['ble_power_device_name'] = 'MyPowerMeter'
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -2859,7 +3730,7 @@ class TestDataSourceValidation(unittest.TestCase):
 
     def test_ble_power_device_name_null(self):
         """ble_power_device_name null should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['ble_power_device_name'] = None
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -2867,7 +3738,7 @@ class TestDataSourceValidation(unittest.TestCase):
 
     def test_ble_hr_device_name_string(self):
         """ble_hr_device_name as a string should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['ble_hr_device_name'] = 'MyHRWatch'
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -2875,7 +3746,7 @@ class TestDataSourceValidation(unittest.TestCase):
 
     def test_ble_power_scan_timeout_valid(self):
         """Valid ble_power_scan_timeout should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['ble_power_scan_timeout'] = 20
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -2883,7 +3754,7 @@ class TestDataSourceValidation(unittest.TestCase):
 
     def test_ble_power_scan_timeout_invalid_falls_back(self):
         """ble_power_scan_timeout out of range should fall back to default."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['ble_power_scan_timeout'] = 100
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -2892,7 +3763,7 @@ class TestDataSourceValidation(unittest.TestCase):
 
     def test_ble_hr_max_retries_valid(self):
         """Valid ble_hr_max_retries should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['ble_hr_max_retries'] = 50
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -2900,7 +3771,7 @@ class TestDataSourceValidation(unittest.TestCase):
 
     def test_ble_hr_max_retries_invalid_falls_back(self):
         """ble_hr_max_retries out of range (>100) should fall back to default."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['ble_hr_max_retries'] = 200
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -2909,18 +3780,18 @@ class TestDataSourceValidation(unittest.TestCase):
 
     def test_primary_key_unknown(self):
         """'primary' key in data_source should trigger unknown key warning."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['primary'] = 'antplus'
         self._settings_file = self._create_settings_file(settings)
-        with patch('builtins.print') as mock_print:
+        with patch.object(smart_fan_controller.logger, 'warning') as mock_warn:
             controller = PowerZoneController(self._settings_file)
-        printed = ' '.join(str(c) for c in mock_print.call_args_list)
+        printed = ' '.join(str(c) for c in mock_warn.call_args_list)
         self.assertIn('primary', printed)
         self.assertIn('Ismeretlen', printed)
 
     def test_data_source_not_dict_uses_default(self):
         """data_source as non-dict should warn and keep defaults."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source'] = "antplus"
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -2931,7 +3802,7 @@ class TestBLEPowerReceiver(unittest.TestCase):
     """Test BLEPowerReceiver initialization and data parsing."""
 
     def _make_settings(self, power_device_name='TestPower'):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['power_source'] = 'ble'
         settings['data_source']['ble_power_device_name'] = power_device_name
         settings['data_source']['ble_power_scan_timeout'] = 5
@@ -2977,6 +3848,79 @@ class TestBLEPowerReceiver(unittest.TestCase):
         )
         self.assertEqual(received_powers[0], 200)
 
+    def test_disconnect_callback_ends_wait(self):
+        """A bleak disconnect wakes _scan_and_subscribe without polling."""
+        import asyncio
+        settings = self._make_settings()
+        receiver = BLEPowerReceiver(settings, MagicMock())
+        receiver.running.set()
+        device = MagicMock()
+        device.name = 'TestPower'
+        device.address = 'AA:BB'
+
+        class FakeClient:
+            is_connected = True
+
+            def __init__(self, address, disconnected_callback=None):
+                self._cb = disconnected_callback
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def start_notify(self, uuid, handler):
+                asyncio.get_running_loop().call_later(0.01, self._cb, self)
+
+            async def stop_notify(self, uuid):
+                pass
+
+        async def run():
+            receiver._stop_event = asyncio.Event()
+            await asyncio.wait_for(receiver._scan_and_subscribe(), timeout=1.0)
+
+        async def find_device_by_name(name, timeout):
+            return device if name == 'TestPower' else None
+
+        scanner = MagicMock()
+        scanner.find_device_by_name = find_device_by_name
+        loop = asyncio.new_event_loop()
+        try:
+            with patch('smart_fan_controller.BleakScanner', scanner), \
+                 patch('smart_fan_controller.BleakClient', FakeClient):
+                loop.run_until_complete(run())
+        finally:
+            loop.close()
+        self.assertFalse(receiver.is_connected)
+
+    def test_device_not_found_raises(self):
+        """A scan that finds no matching device raises for the retry loop."""
+        import asyncio
+        receiver = BLEPowerReceiver(self._make_settings(), MagicMock())
+
+        async def find_device_by_name(name, timeout):
+            return None
+
+        scanner = MagicMock()
+        scanner.find_device_by_name = find_device_by_name
+        loop = asyncio.new_event_loop()
+        try:
+            with patch('smart_fan_controller.BleakScanner', scanner):
+                with self.assertRaises(Exception):
+                    loop.run_until_complete(receiver._scan_and_subscribe())
+        finally:
+            loop.close()
+        scanner.discover.assert_not_called()
+
+    def test_notification_structs_match_int_from_bytes(self):
+        """The precompiled notification structs decode like int.from_bytes."""
+        data = bytearray([0x30, 0x00, 0x18, 0xFC, 0x01])
+        self.assertEqual(smart_fan_controller._CPM_POWER.unpack_from(data, 2)[0],
+                         int.from_bytes(data[2:4], byteorder='little', signed=True))
+        self.assertEqual(smart_fan_controller._HRM_UINT16.unpack_from(data, 1)[0],
+                         int.from_bytes(data[1:3], byteorder='little'))
+
     def test_stop_not_running(self):
         """Calling stop on a non-running receiver should be safe."""
         settings = self._make_settings()
@@ -2994,7 +3938,7 @@ class TestBLEHeartRateReceiver(unittest.TestCase):
     """Test BLEHeartRateReceiver initialization and data parsing."""
 
     def _make_settings(self, hr_device_name='TestHR'):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['hr_source'] = 'ble'
         settings['data_source']['ble_hr_device_name'] = hr_device_name
         settings['data_source']['ble_hr_scan_timeout'] = 5
@@ -3081,7 +4025,7 @@ class TestDataSourceManagerConditionalInit(unittest.TestCase):
 
     def _make_dsm(self, power_source='antplus', hr_source='antplus', hr_enabled=False):
         from smart_fan_controller import DataSourceManager
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['power_source'] = power_source
         settings['data_source']['hr_source'] = hr_source
         settings['heart_rate_zones']['enabled'] = hr_enabled
@@ -3185,7 +4129,7 @@ class TestPowerZoneControllerHRSourcePrint(unittest.TestCase):
 
     def test_prints_power_source_and_hr_source(self):
         """Controller init should print both power_source and hr_source."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['power_source'] = 'ble'
         settings['data_source']['hr_source'] = 'antplus'
         f = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
@@ -3227,7 +4171,7 @@ class TestZwiftUDPValidation(unittest.TestCase):
 
     def test_power_source_zwift_udp(self):
         """power_source 'zwift_udp' should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['power_source'] = 'zwift_udp'
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -3235,7 +4179,7 @@ class TestZwiftUDPValidation(unittest.TestCase):
 
     def test_hr_source_zwift_udp(self):
         """hr_source 'zwift_udp' should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['hr_source'] = 'zwift_udp'
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -3243,7 +4187,7 @@ class TestZwiftUDPValidation(unittest.TestCase):
 
     def test_zwift_udp_port_valid(self):
         """Valid zwift_udp_port (e.g. 9999) should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['zwift_udp_port'] = 9999
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -3251,7 +4195,7 @@ class TestZwiftUDPValidation(unittest.TestCase):
 
     def test_zwift_udp_port_invalid_falls_back(self):
         """Invalid zwift_udp_port should fall back to default."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['zwift_udp_port'] = 80  # below 1024
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -3260,7 +4204,7 @@ class TestZwiftUDPValidation(unittest.TestCase):
 
     def test_zwift_udp_host_valid(self):
         """Valid zwift_udp_host should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['zwift_udp_host'] = '0.0.0.0'
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -3268,7 +4212,7 @@ class TestZwiftUDPValidation(unittest.TestCase):
 
     def test_zwift_udp_host_empty_falls_back(self):
         """Empty zwift_udp_host should fall back to default."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['zwift_udp_host'] = ''
         self._settings_file = self._create_settings_file(settings)
         controller = PowerZoneController(self._settings_file)
@@ -3280,7 +4224,7 @@ class TestZwiftUDPReceiver(unittest.TestCase):
     """Test ZwiftUDPReceiver packet processing and initialization."""
 
     def _make_settings(self, power_source='zwift_udp', hr_source='zwift_udp', hr_enabled=True):
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['power_source'] = power_source
         settings['data_source']['hr_source'] = hr_source
         settings['heart_rate_zones']['enabled'] = hr_enabled
@@ -3304,6 +4248,73 @@ class TestZwiftUDPReceiver(unittest.TestCase):
         receiver._process_packet(raw)
         controller.process_power_data.assert_called_once_with(245)
 
+    def test_latest_packet_drains_queued_datagrams(self):
+        """Queued datagrams are drained and only the newest one is returned."""
+        settings = self._make_settings()
+        controller = self._make_controller(settings)
+        receiver = ZwiftUDPReceiver(settings, controller)
+        rx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            rx.bind(('127.0.0.1', 0))
+            for power in (100, 200, 300):
+                tx.sendto(json.dumps({"power": power}).encode('utf-8'), rx.getsockname())
+            time.sleep(0.05)
+            rx.settimeout(1.0)
+            first, _ = rx.recvfrom(ZwiftUDPReceiver.RECV_BUFFER)
+            latest = receiver._latest_packet(rx, first)
+            self.assertEqual(json.loads(latest)['power'], 300)
+            self.assertEqual(rx.gettimeout(), ZwiftUDPReceiver.SOCKET_TIMEOUT)
+        finally:
+            rx.close()
+            tx.close()
+
+    def test_latest_packet_drain_is_bounded(self):
+        """The drain stops after MAX_DRAIN datagrams even if the queue never empties."""
+        settings = self._make_settings()
+        controller = self._make_controller(settings)
+        receiver = ZwiftUDPReceiver(settings, controller)
+        sock = MagicMock()
+        sock.recvfrom.side_effect = [(str(i).encode(), None) for i in range(ZwiftUDPReceiver.MAX_DRAIN + 10)]
+        latest = receiver._latest_packet(sock, b'first')
+        self.assertEqual(sock.recvfrom.call_count, ZwiftUDPReceiver.MAX_DRAIN)
+        self.assertEqual(latest, str(ZwiftUDPReceiver.MAX_DRAIN - 1).encode())
+        sock.settimeout.assert_called_once_with(ZwiftUDPReceiver.SOCKET_TIMEOUT)
+
+    def test_latest_packet_socket_error_keeps_last_packet(self):
+        """A non-EAGAIN socket error during the drain is logged and the last good packet is still processed."""
+        settings = self._make_settings()
+        controller = self._make_controller(settings)
+        receiver = ZwiftUDPReceiver(settings, controller)
+        sock = MagicMock()
+
+        def recvfrom(_size):
+            if sock.recvfrom.call_count == 1:
+                return b'{"power": 200}', None
+            if sock.recvfrom.call_count == 2:
+                raise ConnectionResetError("reset")
+            receiver.running.clear()
+            raise socket.timeout()
+
+        sock.recvfrom.side_effect = recvfrom
+        receiver.running.set()
+        with patch('smart_fan_controller.socket.socket', return_value=sock), \
+                patch.object(ZwiftUDPReceiver, '_process_packet') as process:
+            with self.assertLogs('smart_fan_controller', level='WARNING') as cm:
+                receiver._receive_loop()
+        self.assertTrue(any("fogadási hiba" in line and "reset" in line for line in cm.output))
+        process.assert_called_once_with(b'{"power": 200}')
+        sock.settimeout.assert_called_with(ZwiftUDPReceiver.SOCKET_TIMEOUT)
+
+    def test_zwift_udp_nan_power_ignored(self):
+        """NaN power (accepted by the JSON parser) must not reach int()."""
+        settings = self._make_settings()
+        controller = self._make_controller(settings)
+        controller.process_power_data = MagicMock()
+        receiver = ZwiftUDPReceiver(settings, controller)
+        receiver._process_packet(b'{"power": NaN}')
+        controller.process_power_data.assert_not_called()
+
     def test_zwift_udp_valid_hr_processed(self):
         """Valid HR JSON should call process_heart_rate_data."""
         settings = self._make_settings()
@@ -3344,6 +4355,28 @@ class TestZwiftUDPReceiver(unittest.TestCase):
         receiver._process_packet(raw)  # should not raise
         controller.process_power_data.assert_not_called()
 
+    def test_zwift_udp_invalid_utf8_skipped(self):
+        """Non-UTF-8 bytes are rejected by the parser without raising."""
+        settings = self._make_settings()
+        controller = self._make_controller(settings)
+        controller.process_power_data = MagicMock()
+        receiver = ZwiftUDPReceiver(settings, controller)
+        receiver._process_packet(b'{"power": 150, "x": "\xff\xfe"}')
+        controller.process_power_data.assert_not_called()
+
+    def test_zwift_udp_out_of_range_logged_lazily(self):
+        """Rejected values are logged at DEBUG with %-style arguments."""
+        settings = self._make_settings()
+        controller = self._make_controller(settings)
+        controller.process_power_data = MagicMock()
+        receiver = ZwiftUDPReceiver(settings, controller)
+        with self.assertLogs('smart_fan_controller', level='DEBUG') as cm:
+            receiver._process_packet(b'{"power": 5000}')
+        record = cm.records[0]
+        self.assertEqual(record.args, (5000,))
+        self.assertIn('5000', record.getMessage())
+        controller.process_power_data.assert_not_called()
+
     def test_zwift_udp_power_bool_skipped(self):
         """power: true (bool) should not call process_power_data."""
         settings = self._make_settings()
@@ -3482,7 +4515,7 @@ class TestDataSourceManagerZwiftUDP(unittest.TestCase):
 
     def _make_dsm(self, power_source='antplus', hr_source='antplus', hr_enabled=False):
         from smart_fan_controller import DataSourceManager
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['power_source'] = power_source
         settings['data_source']['hr_source'] = hr_source
         settings['heart_rate_zones']['enabled'] = hr_enabled
@@ -3600,14 +4633,14 @@ class TestZwiftUDPSpecificSettings(unittest.TestCase):
 
     def test_zwift_udp_buffer_seconds_valid(self):
         """Valid zwift_udp_buffer_seconds should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['zwift_udp_buffer_seconds'] = 30
         controller = PowerZoneController(self._create_settings_file(settings))
         self.assertEqual(controller.settings['data_source']['zwift_udp_buffer_seconds'], 30)
 
     def test_zwift_udp_buffer_seconds_too_low_falls_back(self):
         """zwift_udp_buffer_seconds = 0 should fall back to default."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['zwift_udp_buffer_seconds'] = 0
         controller = PowerZoneController(self._create_settings_file(settings))
         self.assertEqual(controller.settings['data_source']['zwift_udp_buffer_seconds'],
@@ -3615,7 +4648,7 @@ class TestZwiftUDPSpecificSettings(unittest.TestCase):
 
     def test_zwift_udp_buffer_seconds_too_high_falls_back(self):
         """zwift_udp_buffer_seconds = 61 should fall back to default."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['zwift_udp_buffer_seconds'] = 61
         controller = PowerZoneController(self._create_settings_file(settings))
         self.assertEqual(controller.settings['data_source']['zwift_udp_buffer_seconds'],
@@ -3623,14 +4656,14 @@ class TestZwiftUDPSpecificSettings(unittest.TestCase):
 
     def test_zwift_udp_buffer_seconds_boundary_low(self):
         """zwift_udp_buffer_seconds = 1 (min) should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['zwift_udp_buffer_seconds'] = 1
         controller = PowerZoneController(self._create_settings_file(settings))
         self.assertEqual(controller.settings['data_source']['zwift_udp_buffer_seconds'], 1)
 
     def test_zwift_udp_buffer_seconds_boundary_high(self):
         """zwift_udp_buffer_seconds = 60 (max) should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['zwift_udp_buffer_seconds'] = 60
         controller = PowerZoneController(self._create_settings_file(settings))
         self.assertEqual(controller.settings['data_source']['zwift_udp_buffer_seconds'], 60)
@@ -3639,14 +4672,14 @@ class TestZwiftUDPSpecificSettings(unittest.TestCase):
 
     def test_zwift_udp_minimum_samples_valid(self):
         """Valid zwift_udp_minimum_samples should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['zwift_udp_minimum_samples'] = 5
         controller = PowerZoneController(self._create_settings_file(settings))
         self.assertEqual(controller.settings['data_source']['zwift_udp_minimum_samples'], 5)
 
     def test_zwift_udp_minimum_samples_too_low_falls_back(self):
         """zwift_udp_minimum_samples = 0 should fall back to default."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['zwift_udp_minimum_samples'] = 0
         controller = PowerZoneController(self._create_settings_file(settings))
         self.assertEqual(controller.settings['data_source']['zwift_udp_minimum_samples'],
@@ -3654,7 +4687,7 @@ class TestZwiftUDPSpecificSettings(unittest.TestCase):
 
     def test_zwift_udp_minimum_samples_too_high_falls_back(self):
         """zwift_udp_minimum_samples = 21 should fall back to default."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['zwift_udp_minimum_samples'] = 21
         controller = PowerZoneController(self._create_settings_file(settings))
         self.assertEqual(controller.settings['data_source']['zwift_udp_minimum_samples'],
@@ -3662,14 +4695,14 @@ class TestZwiftUDPSpecificSettings(unittest.TestCase):
 
     def test_zwift_udp_minimum_samples_boundary_low(self):
         """zwift_udp_minimum_samples = 1 (min) should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['zwift_udp_minimum_samples'] = 1
         controller = PowerZoneController(self._create_settings_file(settings))
         self.assertEqual(controller.settings['data_source']['zwift_udp_minimum_samples'], 1)
 
     def test_zwift_udp_minimum_samples_boundary_high(self):
         """zwift_udp_minimum_samples = 20 (max) should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['zwift_udp_minimum_samples'] = 20
         # Ensure buffer is large enough to avoid cross-validation clamp
         settings['data_source']['zwift_udp_buffer_seconds'] = 60
@@ -3680,14 +4713,14 @@ class TestZwiftUDPSpecificSettings(unittest.TestCase):
 
     def test_zwift_udp_dropout_timeout_valid(self):
         """Valid zwift_udp_dropout_timeout should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['zwift_udp_dropout_timeout'] = 30
         controller = PowerZoneController(self._create_settings_file(settings))
         self.assertEqual(controller.settings['data_source']['zwift_udp_dropout_timeout'], 30)
 
     def test_zwift_udp_dropout_timeout_too_low_falls_back(self):
         """zwift_udp_dropout_timeout = 0 should fall back to default."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['zwift_udp_dropout_timeout'] = 0
         controller = PowerZoneController(self._create_settings_file(settings))
         self.assertEqual(controller.settings['data_source']['zwift_udp_dropout_timeout'],
@@ -3695,7 +4728,7 @@ class TestZwiftUDPSpecificSettings(unittest.TestCase):
 
     def test_zwift_udp_dropout_timeout_too_high_falls_back(self):
         """zwift_udp_dropout_timeout = 121 should fall back to default."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['zwift_udp_dropout_timeout'] = 121
         controller = PowerZoneController(self._create_settings_file(settings))
         self.assertEqual(controller.settings['data_source']['zwift_udp_dropout_timeout'],
@@ -3703,14 +4736,14 @@ class TestZwiftUDPSpecificSettings(unittest.TestCase):
 
     def test_zwift_udp_dropout_timeout_boundary_low(self):
         """zwift_udp_dropout_timeout = 1 (min) should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['zwift_udp_dropout_timeout'] = 1
         controller = PowerZoneController(self._create_settings_file(settings))
         self.assertEqual(controller.settings['data_source']['zwift_udp_dropout_timeout'], 1)
 
     def test_zwift_udp_dropout_timeout_boundary_high(self):
         """zwift_udp_dropout_timeout = 120 (max) should be accepted."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['zwift_udp_dropout_timeout'] = 120
         controller = PowerZoneController(self._create_settings_file(settings))
         self.assertEqual(controller.settings['data_source']['zwift_udp_dropout_timeout'], 120)
@@ -3719,7 +4752,7 @@ class TestZwiftUDPSpecificSettings(unittest.TestCase):
 
     def test_zwift_udp_power_source_overrides_buffer_seconds(self):
         """When power_source='zwift_udp', controller.buffer_seconds uses zwift_udp_buffer_seconds."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['power_source'] = 'zwift_udp'
         settings['data_source']['zwift_udp_buffer_seconds'] = 20
         controller = PowerZoneController(self._create_settings_file(settings))
@@ -3727,7 +4760,7 @@ class TestZwiftUDPSpecificSettings(unittest.TestCase):
 
     def test_zwift_udp_power_source_overrides_minimum_samples(self):
         """When power_source='zwift_udp', controller.minimum_samples uses zwift_udp_minimum_samples."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['power_source'] = 'zwift_udp'
         settings['data_source']['zwift_udp_minimum_samples'] = 3
         controller = PowerZoneController(self._create_settings_file(settings))
@@ -3735,7 +4768,7 @@ class TestZwiftUDPSpecificSettings(unittest.TestCase):
 
     def test_zwift_udp_power_source_overrides_dropout_timeout(self):
         """When power_source='zwift_udp', controller.dropout_timeout uses zwift_udp_dropout_timeout."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['power_source'] = 'zwift_udp'
         settings['data_source']['zwift_udp_dropout_timeout'] = 20
         controller = PowerZoneController(self._create_settings_file(settings))
@@ -3743,7 +4776,7 @@ class TestZwiftUDPSpecificSettings(unittest.TestCase):
 
     def test_zwift_udp_hr_source_overrides_settings(self):
         """When hr_source='zwift_udp', controller uses zwift_udp_* values."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['hr_source'] = 'zwift_udp'
         settings['data_source']['zwift_udp_buffer_seconds'] = 15
         settings['data_source']['zwift_udp_minimum_samples'] = 3
@@ -3757,7 +4790,7 @@ class TestZwiftUDPSpecificSettings(unittest.TestCase):
 
     def test_antplus_does_not_override_buffer_seconds(self):
         """When power_source='antplus', controller.buffer_seconds uses global buffer_seconds."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['power_source'] = 'antplus'
         settings['data_source']['hr_source'] = 'antplus'
         settings['buffer_seconds'] = 5
@@ -3766,7 +4799,7 @@ class TestZwiftUDPSpecificSettings(unittest.TestCase):
 
     def test_antplus_does_not_override_minimum_samples(self):
         """When power_source='antplus', controller.minimum_samples uses global minimum_samples."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['power_source'] = 'antplus'
         settings['data_source']['hr_source'] = 'antplus'
         settings['minimum_samples'] = 6
@@ -3775,7 +4808,7 @@ class TestZwiftUDPSpecificSettings(unittest.TestCase):
 
     def test_antplus_does_not_override_dropout_timeout(self):
         """When power_source='antplus', controller.dropout_timeout uses global dropout_timeout."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['power_source'] = 'antplus'
         settings['data_source']['hr_source'] = 'antplus'
         settings['dropout_timeout'] = 7
@@ -3786,15 +4819,14 @@ class TestZwiftUDPSpecificSettings(unittest.TestCase):
 
     def test_cross_validation_minimum_samples_clamped_to_buffer(self):
         """zwift_udp_minimum_samples larger than buffer capacity should be clamped."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         # buffer_seconds=1 → buffer_size = 1 * BUFFER_RATE_HZ = 4
         settings['data_source']['zwift_udp_buffer_seconds'] = 1
         settings['data_source']['zwift_udp_minimum_samples'] = 10  # > 4
-        with patch('builtins.print') as mock_print:
+        with patch.object(smart_fan_controller.logger, 'warning') as mock_warn:
             controller = PowerZoneController(self._create_settings_file(settings))
-        printed = ' '.join(str(c) for c in mock_print.call_args_list)
+        printed = ' '.join(str(c) for c in mock_warn.call_args_list)
         self.assertIn('zwift_udp_minimum_samples', printed)
-        self.assertIn('FIGYELMEZTETÉS', printed)
         from smart_fan_controller import PowerZoneController as PZC
         buf_size = 1 * PZC.BUFFER_RATE_HZ
         self.assertEqual(controller.settings['data_source']['zwift_udp_minimum_samples'], buf_size)
@@ -3803,7 +4835,7 @@ class TestZwiftUDPSpecificSettings(unittest.TestCase):
 
     def test_buffer_deque_maxlen_uses_zwift_udp_buffer_seconds(self):
         """In Zwift UDP mode, power_buffer maxlen should be zwift_udp_buffer_seconds * BUFFER_RATE_HZ."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['power_source'] = 'zwift_udp'
         settings['data_source']['zwift_udp_buffer_seconds'] = 10
         controller = PowerZoneController(self._create_settings_file(settings))
@@ -3813,7 +4845,7 @@ class TestZwiftUDPSpecificSettings(unittest.TestCase):
 
     def test_buffer_deque_maxlen_uses_global_buffer_seconds_for_antplus(self):
         """In antplus mode, power_buffer maxlen should be buffer_seconds * BUFFER_RATE_HZ."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['power_source'] = 'antplus'
         settings['data_source']['hr_source'] = 'antplus'
         settings['buffer_seconds'] = 5
@@ -3825,47 +4857,47 @@ class TestZwiftUDPSpecificSettings(unittest.TestCase):
     # --- Unknown field: new keys should NOT trigger "Ismeretlen mező" warning ---
 
     def _get_unknown_fields_text(self, printed):
-        """Return text after 'Ismeretlen' in output, or empty string if absent."""
+        """Return text after 'Ismeretlen' in logged warnings, or empty string if absent."""
         if 'Ismeretlen' in printed:
             return printed.split('Ismeretlen')[1]
         return ''
 
     def test_zwift_udp_buffer_seconds_not_unknown(self):
         """zwift_udp_buffer_seconds should NOT trigger unknown key warning."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['zwift_udp_buffer_seconds'] = 10
-        with patch('builtins.print') as mock_print:
+        with patch.object(smart_fan_controller.logger, 'warning') as mock_warn:
             PowerZoneController(self._create_settings_file(settings))
-        printed = ' '.join(str(c) for c in mock_print.call_args_list)
+        printed = ' '.join(str(c) for c in mock_warn.call_args_list)
         self.assertNotIn('zwift_udp_buffer_seconds', self._get_unknown_fields_text(printed))
 
     def test_zwift_udp_minimum_samples_not_unknown(self):
         """zwift_udp_minimum_samples should NOT trigger unknown key warning."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['zwift_udp_minimum_samples'] = 2
-        with patch('builtins.print') as mock_print:
+        with patch.object(smart_fan_controller.logger, 'warning') as mock_warn:
             PowerZoneController(self._create_settings_file(settings))
-        printed = ' '.join(str(c) for c in mock_print.call_args_list)
+        printed = ' '.join(str(c) for c in mock_warn.call_args_list)
         self.assertNotIn('zwift_udp_minimum_samples', self._get_unknown_fields_text(printed))
 
     def test_zwift_udp_dropout_timeout_not_unknown(self):
         """zwift_udp_dropout_timeout should NOT trigger unknown key warning."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['zwift_udp_dropout_timeout'] = 15
-        with patch('builtins.print') as mock_print:
+        with patch.object(smart_fan_controller.logger, 'warning') as mock_warn:
             PowerZoneController(self._create_settings_file(settings))
-        printed = ' '.join(str(c) for c in mock_print.call_args_list)
+        printed = ' '.join(str(c) for c in mock_warn.call_args_list)
         self.assertNotIn('zwift_udp_dropout_timeout', self._get_unknown_fields_text(printed))
 
     def test_new_zwift_udp_keys_no_unknown_warning(self):
         """All three new zwift_udp_* keys together should not produce any unknown key warning."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['zwift_udp_buffer_seconds'] = 10
         settings['data_source']['zwift_udp_minimum_samples'] = 2
         settings['data_source']['zwift_udp_dropout_timeout'] = 15
-        with patch('builtins.print') as mock_print:
+        with patch.object(smart_fan_controller.logger, 'warning') as mock_warn:
             PowerZoneController(self._create_settings_file(settings))
-        printed = ' '.join(str(c) for c in mock_print.call_args_list)
+        printed = ' '.join(str(c) for c in mock_warn.call_args_list)
         unknown_text = self._get_unknown_fields_text(printed)
         self.assertNotIn('zwift_udp_buffer_seconds', unknown_text)
         self.assertNotIn('zwift_udp_minimum_samples', unknown_text)
@@ -3875,7 +4907,7 @@ class TestZwiftUDPSpecificSettings(unittest.TestCase):
 
     def test_zwift_udp_mode_init_print(self):
         """When Zwift UDP mode is active, init should print the Zwift UDP mode line."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['power_source'] = 'zwift_udp'
         settings['data_source']['zwift_udp_buffer_seconds'] = 10
         settings['data_source']['zwift_udp_minimum_samples'] = 2
@@ -3888,9 +4920,21 @@ class TestZwiftUDPSpecificSettings(unittest.TestCase):
         self.assertIn('min_samples=2', printed)
         self.assertIn('dropout=15s', printed)
 
+    def test_init_summary_is_a_single_print(self):
+        """The startup summary must be emitted with one print call."""
+        settings = default_settings()
+        settings['ble']['pin_code'] = "1234"
+        with patch('builtins.print') as mock_print:
+            PowerZoneController(self._create_settings_file(settings))
+        summaries = [c for c in mock_print.call_args_list if 'FTP:' in str(c)]
+        self.assertEqual(len(summaries), 1)
+        text = summaries[0].args[0]
+        self.assertIn('BLE PIN: ****', text)
+        self.assertIn('HR forrás:', text)
+
     def test_antplus_no_zwift_udp_mode_print(self):
         """When antplus mode, there should be no Zwift UDP mode init print."""
-        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings = default_settings()
         settings['data_source']['power_source'] = 'antplus'
         settings['data_source']['hr_source'] = 'antplus'
         with patch('builtins.print') as mock_print:
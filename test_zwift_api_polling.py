@@ -0,0 +1,89 @@
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Mock external dependencies before importing the module
+sys.modules['requests'] = MagicMock()
+
+# Now import the module under test
+from zwift_api_polling import ProtobufDecoder
+
+
+def _encode_varint(value):
+    """Reference protobuf varint encoder used to build test input."""
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _decode_varint_general(data, pos=0):
+    """Reference multi-byte varint decoder (the loop without the fast path)."""
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+class TestReadVarint(unittest.TestCase):
+    """ProtobufDecoder._read_varint: single-byte fast path matches the general path."""
+
+    VALUES = [0, 1, 0x3F, 0x7E, 0x7F, 0x80, 0x81, 0xFF, 300, 0x3FFF, 0x4000,
+              2 ** 21, 2 ** 32 - 1, 2 ** 63, 2 ** 64 - 1]
+
+    def test_single_byte_values(self):
+        """Values below 0x80 are decoded from exactly one byte."""
+        for value in (0, 1, 0x40, 0x7F):
+            decoder = ProtobufDecoder(bytes([value]))
+            self.assertEqual(decoder._read_varint(), value)
+            self.assertEqual(decoder._pos, 1)
+
+    def test_boundary_0x7f_0x80(self):
+        """0x7F is the last one-byte value; 0x80 needs a continuation byte."""
+        self.assertEqual(_encode_varint(0x7F), b'\x7f')
+        self.assertEqual(_encode_varint(0x80), b'\x80\x01')
+        decoder = ProtobufDecoder(b'\x7f\x80\x01')
+        self.assertEqual(decoder._read_varint(), 0x7F)
+        self.assertEqual(decoder._pos, 1)
+        self.assertEqual(decoder._read_varint(), 0x80)
+        self.assertEqual(decoder._pos, 3)
+
+    def test_multi_byte_values(self):
+        """Multi-byte varints decode to the encoded value and consume every byte."""
+        for value in (300, 0x3FFF, 0x4000, 2 ** 32 - 1, 2 ** 64 - 1):
+            encoded = _encode_varint(value)
+            self.assertGreater(len(encoded), 1)
+            decoder = ProtobufDecoder(encoded)
+            self.assertEqual(decoder._read_varint(), value)
+            self.assertEqual(decoder._pos, len(encoded))
+
+    def test_matches_general_path(self):
+        """A stream of mixed varints decodes exactly like the general loop."""
+        data = b''.join(_encode_varint(v) for v in self.VALUES)
+        decoder = ProtobufDecoder(data)
+        pos = 0
+        for value in self.VALUES:
+            expected, pos = _decode_varint_general(data, pos)
+            self.assertEqual(expected, value)
+            self.assertEqual(decoder._read_varint(), expected)
+            self.assertEqual(decoder._pos, pos)
+
+    def test_truncated_varint_raises(self):
+        """A continuation byte at the end of the data is reported as truncated."""
+        for data in (b'', b'\x80', b'\xff\xff'):
+            with self.assertRaises(ValueError):
+                ProtobufDecoder(data)._read_varint()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -70,15 +70,26 @@ class ProtobufDecoder:
         self._pos = 0
 
     def _read_varint(self):
+        data = self._data
+        pos = self._pos
+        end = len(data)
+        # Fast path: tags and small values fit in a single byte
+        if pos < end:
+            byte = data[pos]
+            if byte < 0x80:
+                self._pos = pos + 1
+                return byte
         result = 0
         shift = 0
-        while self._pos < len(self._data):
-            byte = self._data[self._pos]
-            self._pos += 1
+        while pos < end:
+            byte = data[pos]
+            pos += 1
             result |= (byte & 0x7F) << shift
-            if not (byte & 0x80):
+            if byte < 0x80:
+                self._pos = pos
                 return result
             shift += 7
+        self._pos = pos
         raise ValueError("Truncated varint")
 
     def _read_bytes(self, n: int) -> bytes: